@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""Compare add_task() in a loop with add_tasks() against a local stand-in server
+
+Usage: python benchmarks/bench_bulk_writes.py [--tasks N] [--latency MS] [--workers N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dav_client import DavClient
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Accepts every PUT after a fixed delay that stands in for server RTT"""
+    protocol_version = 'HTTP/1.1'
+    latency = 0.02
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        time.sleep(self.latency)
+        self.send_response(201)
+        self.send_header('Content-Length', '0')
+        self.send_header('ETag', f'"{self.path}"')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=20, help="per-request server delay in ms")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    StandInHandler.latency = args.latency / 1000
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{server.server_address[1]}"
+    tasks = [{'title': f'Imported {i}', 'description': 'From the weekly import'} for i in range(args.tasks)]
+
+    try:
+        client = DavClient(server_url, 'user', 'password', '/cal/')
+        start = time.perf_counter()
+        assert all(client.add_task(task['title'], task['description']) for task in tasks)
+        serial = time.perf_counter() - start
+
+        client = DavClient(server_url, 'user', 'password', '/cal/', max_workers=args.workers)
+        start = time.perf_counter()
+        results = client.add_tasks(tasks)
+        bulk = time.perf_counter() - start
+        assert all(result['ok'] for result in results)
+    finally:
+        server.shutdown()
+
+    print(f"{args.tasks} PUTs at {args.latency:.0f} ms latency")
+    print(f"  {'add_task loop:':<24}{serial:.3f}s")
+    print(f"  {f'add_tasks, {args.workers} workers:':<24}{bulk:.3f}s, "
+          f"{client.connection_stats()['connections']} connections")
+    print(f"  {'speedup:':<24}{serial / bulk:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Time `linux-dav-todo-cli list` from a warm cache, against a bare interpreter start
+
+Usage: python benchmarks/bench_cli_list.py [--tasks N] [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC)
+
+from utils.cache import TaskCache
+
+
+def warm_cache(home, data_home, count):
+    config_dir = os.path.join(home, '.config', 'dav-todo')
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, 'settings.ini'), 'w') as settings:
+        settings.write('[settings]\ndav_server_url = "https://dav.example.com"\nusername = "me"\n'
+                       'todo_list_path = "/tasks/"\nuse_keyring = true\n')
+
+    cache = TaskCache('me@https://dav.example.com/tasks/', os.path.join(data_home, 'dav-todo', 'tasks.db'))
+    tasks = [
+        {'uid': f'{i:08x}-task', 'title': f'Task {i}', 'status': 'completed' if i % 3 == 0 else 'needs-action',
+         'href': f'/tasks/{i:08x}-task.ics', 'etag': f'"{i}"'}
+        for i in range(count)
+    ]
+    cache.apply_changes({'added': tasks, 'changed': [], 'removed': [], 'sync_token': 't1', 'full': True})
+    cache.close()
+
+
+def median_run(command, env, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home, tempfile.TemporaryDirectory() as data_home:
+        os.makedirs(os.path.join(data_home, 'dav-todo'))
+        warm_cache(home, data_home, args.tasks)
+        env = {**os.environ, 'HOME': home, 'XDG_DATA_HOME': data_home}
+        cli = [sys.executable, os.path.join(SRC, 'cli.py'), 'list']
+
+        baseline = median_run([sys.executable, '-c', 'pass'], env, args.runs)
+        total = median_run(cli, env, args.runs)
+        imports = subprocess.run(cli[:1] + ['-X', 'importtime'] + cli[1:], env=env, check=True,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+
+    heavy = sorted({line.rsplit('|', 1)[1].strip() for line in imports.splitlines()
+                    if line.rsplit('|', 1)[-1].strip() in ('gi', 'requests', 'keyring', 'urllib3')})
+    print(f"cli list, {args.tasks} cached tasks, median of {args.runs} runs")
+    print(f"  {'interpreter start:':<24}{baseline * 1000:.0f} ms")
+    print(f"  {'cli list:':<24}{total * 1000:.0f} ms")
+    print(f"  {'cli overhead:':<24}{(total - baseline) * 1000:.0f} ms")
+    print(f"  {'heavy imports:':<24}{', '.join(heavy) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
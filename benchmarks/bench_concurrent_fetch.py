@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compare serial and pooled per-href GETs against a local stand-in server
+
+Usage: python benchmarks/bench_concurrent_fetch.py [--tasks N] [--latency MS] [--workers N]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dav_client import DavClient
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves one VTODO per GET after a fixed delay that stands in for server RTT"""
+    protocol_version = 'HTTP/1.1'
+    latency = 0.02
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        uid = self.path.rsplit('/', 1)[-1].split('.')[0]
+        body = (
+            "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VTODO\r\n"
+            f"UID:{uid}\r\nSUMMARY:Task {uid}\r\nSTATUS:NEEDS-ACTION\r\n"
+            "END:VTODO\r\nEND:VCALENDAR\r\n"
+        ).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/calendar; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', f'"{uid}"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def time_fetch(server_url, hrefs, workers):
+    client = DavClient(server_url, 'user', 'password', '/cal/', max_workers=workers)
+    client.multiget_supported = False
+
+    start = time.perf_counter()
+    tasks = client._fetch_tasks_by_href(hrefs)
+    elapsed = time.perf_counter() - start
+
+    assert [task['href'] for task in tasks] == hrefs, "results out of order"
+    return elapsed, client.connection_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=20, help="per-request server delay in ms")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    StandInHandler.latency = args.latency / 1000
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{server.server_address[1]}"
+    hrefs = [f"/cal/{i}.ics" for i in range(args.tasks)]
+
+    try:
+        serial, serial_stats = time_fetch(server_url, hrefs, 1)
+        pooled, pooled_stats = time_fetch(server_url, hrefs, args.workers)
+    finally:
+        server.shutdown()
+
+    print(f"{args.tasks} GETs at {args.latency:.0f} ms latency")
+    print(f"  {'serial:':<14}{serial:.3f}s, {serial_stats['connections']} connections, "
+          f"{serial_stats['reuse_rate']:.0%} reused")
+    print(f"  {f'{args.workers} workers:':<14}{pooled:.3f}s, {pooled_stats['connections']} connections, "
+          f"{pooled_stats['reuse_rate']:.0%} reused")
+    print(f"  {'speedup:':<14}{serial / pooled:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
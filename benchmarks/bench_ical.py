@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Per-task cost of the RFC 5545 VTODO parser vs the original line-split parser
+
+The old parser only extracted UID, SUMMARY, DESCRIPTION and STATUS, so the
+like-for-like comparison asks parse_vtodo for those same properties. What
+DavClient parses (utils.query.TASK_PROPERTIES) and a full parse of every
+known property are reported next to it.
+
+The target is that DavClient reads a task from a REPORT response at least as
+fast as the original code did, so the command fails otherwise. Each round
+times the original right before the new code, and the median of the ratios
+is reported: on a busy machine both sides of a round see the same load.
+
+Usage: python benchmarks/bench_ical.py [--tasks N] [--rounds N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import timeit
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape as xml_escape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dav_client import DavClient
+from utils.ical import parse_vtodo
+from utils.query import TASK_PROPERTIES
+
+# A typical task as produced by common CalDAV clients
+SAMPLE = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Example Corp.//CalDAV Client//EN\r\n"
+    "BEGIN:VTODO\r\n"
+    "UID:{uid}\r\n"
+    "DTSTAMP:20250101T120000Z\r\n"
+    "CREATED:20250101T120000Z\r\n"
+    "LAST-MODIFIED:20250102T080000Z\r\n"
+    "SUMMARY:Task number {uid}\r\n"
+    "DESCRIPTION:Remember to do the thing\r\n"
+    "STATUS:NEEDS-ACTION\r\n"
+    "DUE;VALUE=DATE:20250301\r\n"
+    "PRIORITY:5\r\n"
+    "SEQUENCE:2\r\n"
+    "END:VTODO\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+def naive_parse_ical(ical_data):
+    """The parser DavClient shipped before the RFC 5545 rewrite"""
+    lines = ical_data.splitlines()
+    todo = {}
+    in_vtodo = False
+
+    for line in lines:
+        if line == 'BEGIN:VTODO':
+            in_vtodo = True
+            continue
+        elif line == 'END:VTODO':
+            in_vtodo = False
+            continue
+
+        if in_vtodo and ':' in line:
+            key, value = line.split(':', 1)
+            if key == 'SUMMARY':
+                todo['title'] = value
+            elif key == 'DESCRIPTION':
+                todo['description'] = value
+            elif key == 'STATUS':
+                todo['status'] = value.lower()
+            elif key == 'UID':
+                todo['uid'] = value
+
+    return todo
+
+
+# What naive_parse_ical() extracts
+NAIVE_PROPERTIES = ('UID', 'SUMMARY', 'DESCRIPTION', 'STATUS')
+
+
+def original_response_task(response_elem):
+    """What the original DavClient._parse_tasks() did for each <d:response>"""
+    ns = {'d': 'DAV:', 'c': 'urn:ietf:params:xml:ns:caldav'}
+    href_elem = response_elem.find('./d:href', ns)
+    if href_elem is None:
+        return None
+    calendar_data = response_elem.find('.//c:calendar-data', ns)
+    if calendar_data is not None and calendar_data.text and 'VTODO' in calendar_data.text:
+        todo_data = naive_parse_ical(calendar_data.text)
+        if todo_data:
+            todo_data['href'] = href_elem.text
+            return todo_data
+    return None
+
+
+def report_responses(bodies):
+    """The <d:response> elements of a calendar-query REPORT returning bodies"""
+    responses = ''.join(
+        f'<d:response><d:href>/cal/{uid}.ics</d:href><d:propstat><d:prop>'
+        f'<d:getetag>"{uid}-1"</d:getetag><c:calendar-data>{xml_escape(body)}</c:calendar-data>'
+        f'</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>'
+        for uid, body in enumerate(bodies)
+    )
+    root = ET.fromstring(f'<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">'
+                         f'{responses}</d:multistatus>')
+    return list(root)
+
+
+def compare(original, candidates, items, rounds):
+    """Per-item time of original and the median ratio of each candidate to it"""
+    def run(function):
+        return timeit.timeit(lambda: [function(item) for item in items], number=1) / len(items) * 1e6
+
+    best = {name: float('inf') for name in ('original', *candidates)}
+    ratios = {name: [] for name in candidates}
+    for _ in range(rounds):
+        for name, function in candidates.items():
+            before = run(original)
+            elapsed = run(function)
+            best['original'] = min(best['original'], before)
+            best[name] = min(best[name], elapsed)
+            ratios[name].append(elapsed / before)
+    return best, {name: statistics.median(values) for name, values in ratios.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=100)
+    args = parser.parse_args()
+
+    bodies = [SAMPLE.format(uid=i) for i in range(args.tasks)]
+    assert parse_vtodo(bodies[0], NAIVE_PROPERTIES) == naive_parse_ical(bodies[0])
+
+    best, ratio = compare(naive_parse_ical, {
+        'rfc5545': lambda body: parse_vtodo(body, NAIVE_PROPERTIES),
+        'davclient': lambda body: parse_vtodo(body, TASK_PROPERTIES),
+        'full': parse_vtodo,
+    }, bodies, args.rounds)
+    print(f"Parsing {args.tasks} tasks, median of {args.rounds} rounds, per task")
+    print(f"  {'naive:':<12}{best['original']:.2f} us")
+    print(f"  {'rfc5545:':<12}{best['rfc5545']:.2f} us ({ratio['rfc5545']:.2f}x, same properties)")
+    print(f"  {'davclient:':<12}{best['davclient']:.2f} us ({ratio['davclient']:.2f}x, "
+          f"{len(TASK_PROPERTIES)} properties)")
+    print(f"  {'full:':<12}{best['full']:.2f} us ({ratio['full']:.2f}x, "
+          f"all {len(parse_vtodo(bodies[0]))} properties)")
+
+    client = DavClient('https://dav.example.com', 'user', 'secret', '/cal/')
+    responses = report_responses(bodies)
+    assert client._parse_response_task(responses[0])['title'] == original_response_task(responses[0])['title']
+
+    best, ratio = compare(original_response_task, {'davclient': client._parse_response_task},
+                          responses, args.rounds)
+    print("Reading tasks from a REPORT response, per task")
+    print(f"  {'original:':<12}{best['original']:.2f} us")
+    print(f"  {'davclient:':<12}{best['davclient']:.2f} us ({ratio['davclient']:.2f}x)")
+
+    if ratio['davclient'] > 1:
+        print(f"DavClient reads a task {ratio['davclient']:.2f}x as slowly as the original parser")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
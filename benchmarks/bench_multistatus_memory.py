@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Peak memory of whole-body vs streamed multistatus parsing
+
+Usage: python benchmarks/bench_multistatus_memory.py [--tasks N ...]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from dav_client import DavClient, STREAM_CHUNK_SIZE
+
+RESPONSE = (
+    '<d:response><d:href>/cal/{uid}.ics</d:href><d:propstat><d:prop>'
+    '<d:getetag>"{uid}"</d:getetag><c:calendar-data>BEGIN:VCALENDAR\r\nVERSION:2.0\r\n'
+    'BEGIN:VTODO\r\nUID:{uid}\r\nSUMMARY:Task {uid}\r\nDESCRIPTION:{description}\r\n'
+    'STATUS:NEEDS-ACTION\r\nEND:VTODO\r\nEND:VCALENDAR\r\n</c:calendar-data>'
+    '</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>'
+)
+
+
+class ChunkedBody:
+    """Stands in for a streamed requests.Response by generating the body on the fly"""
+    def __init__(self, count):
+        self.count = count
+
+    def _pieces(self):
+        yield '<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">'
+        for uid in range(self.count):
+            yield RESPONSE.format(uid=uid, description='x' * 200)
+        yield '</d:multistatus>'
+
+    @property
+    def text(self):
+        return ''.join(self._pieces())
+
+    def iter_content(self, chunk_size=STREAM_CHUNK_SIZE):
+        buffer = b''
+        for piece in self._pieces():
+            buffer += piece.encode('utf-8')
+            if len(buffer) >= chunk_size:
+                yield buffer
+                buffer = b''
+        yield buffer
+
+    def close(self):
+        pass
+
+
+def count_tasks(client, tasks):
+    # Drop the bodies kept for conditional updates so only parsing is measured
+    count = 0
+    for _ in tasks:
+        client.ical_cache.clear()
+        count += 1
+    return count
+
+
+def peak_memory(parse):
+    tracemalloc.start()
+    count = parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, nargs='+', default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    client = DavClient('http://localhost', 'user', 'password', '/cal/')
+
+    print(f"{'tasks':>8}  {'whole body':>12}  {'streamed':>12}")
+    for count in args.tasks:
+        body = ChunkedBody(count)
+
+        whole, whole_peak = peak_memory(lambda: count_tasks(client, client._parse_tasks(body.text)))
+        streamed, streamed_peak = peak_memory(lambda: count_tasks(client, client._iter_response_tasks(body)))
+
+        assert whole == streamed == count
+        print(f"{count:>8}  {whole_peak / 2**20:>10.1f}MB  {streamed_peak / 2**20:>10.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
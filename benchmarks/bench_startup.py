@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Measure GUI cold start: module import time and time to the first present()
+
+Each run is a fresh interpreter with its own HOME, so nothing is shared with
+an installed copy. 'login' starts without stored credentials; 'main' starts
+with a stored login and a warm cache of --tasks tasks, against a server that
+never answers. Needs GTK 4 and a display.
+
+Usage: python benchmarks/bench_startup.py [--window login|main] [--runs N] [--budget MS]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC)
+
+# Modules worth knowing about if they are loaded before the first window shows
+WATCHED = ('requests', 'keyring', 'sqlite3', 'gi.repository.GdkPixbuf', 'dav_client', 'ui.main_window')
+
+# Started in a fresh interpreter; prints one JSON line when the first window is presented
+DRIVER = """
+import time
+start = time.perf_counter()
+import json, sys
+sys.path.insert(0, {src!r})
+sys.argv = ['linux-dav-todo']
+import main
+main.setup_gi_environment()
+from gi.repository import Gio, GLib, Gtk
+from ui.application import TodoApplication
+
+present = Gtk.Window.present
+def timed_present(window):
+    present(window)
+    elapsed = time.perf_counter() - start
+    loaded = [name for name in {watched!r} if name in sys.modules]
+    print(json.dumps({{'present': elapsed, 'window': type(window).__name__, 'loaded': loaded}}), flush=True)
+    GLib.idle_add(window.get_application().quit)
+Gtk.Window.present = timed_present
+
+app = TodoApplication()
+app.set_flags(app.get_flags() | Gio.ApplicationFlags.NON_UNIQUE)
+app.run([])
+"""
+
+
+def stored_login(home, data_home, count):
+    """Store a plain-file login and a warm cache of count tasks"""
+    from utils.cache import TaskCache
+
+    config_dir = os.path.join(home, '.config', 'dav-todo')
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, 'settings.ini'), 'w') as settings:
+        settings.write('[settings]\ndav_server_url = "http://127.0.0.1:9"\nusername = "me"\n'
+                       'password = "secret"\ntodo_list_path = "/tasks/"\nuse_keyring = false\n')
+
+    os.makedirs(os.path.join(data_home, 'dav-todo'))
+    cache = TaskCache('me@http://127.0.0.1:9/tasks/', os.path.join(data_home, 'dav-todo', 'tasks.db'))
+    tasks = [
+        {'uid': f'{i:08x}-task', 'title': f'Task {i}', 'status': 'needs-action',
+         'href': f'/tasks/{i:08x}-task.ics', 'etag': f'"{i}"', 'partial': True}
+        for i in range(count)
+    ]
+    cache.apply_changes({'added': tasks, 'changed': [], 'removed': [], 'sync_token': 't1', 'full': True})
+    cache.close()
+
+
+def import_times(env):
+    """Cumulative import time in ms of each top-level import of the GUI modules"""
+    code = (f"import sys; sys.path.insert(0, {SRC!r}); import main; main.setup_gi_environment(); "
+            "import ui.application, ui.login_window, ui.main_window")
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=env['HOME'], env=env, check=True,
+                            stderr=subprocess.PIPE, text=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not name.startswith('  '):
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def first_present(env):
+    output = subprocess.run([sys.executable, '-c', DRIVER.format(src=SRC, watched=WATCHED)], cwd=env['HOME'],
+                            env=env, check=True, stdout=subprocess.PIPE, text=True, timeout=60).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--window', choices=('login', 'main'), default='main')
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, help="fail if the median time to present() exceeds this many ms")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home, tempfile.TemporaryDirectory() as data_home:
+        if args.window == 'main':
+            stored_login(home, data_home, args.tasks)
+        env = {**os.environ, 'HOME': home, 'XDG_DATA_HOME': data_home}
+
+        imports = import_times(env)
+        runs = [first_present(env) for _ in range(args.runs)]
+
+    present = statistics.median(run['present'] for run in runs) * 1000
+    print(f"{runs[0]['window']} cold start, median of {args.runs} runs")
+    print(f"  {'first present():':<24}{present:.0f} ms")
+    print(f"  {'loaded by then:':<24}{', '.join(runs[0]['loaded']) or 'none of ' + ', '.join(WATCHED)}")
+    print("  slowest imports:")
+    for name, ms in sorted(imports.items(), key=lambda item: item[1], reverse=True)[:8]:
+        print(f"    {name:<22}{ms:.1f} ms")
+
+    if args.budget is not None and present > args.budget:
+        print(f"first present() took {present:.0f} ms, over the {args.budget:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""Time to construct task rows with the shared stylesheet vs per-widget CssProviders
+
+Needs a display (run it inside a desktop session, or under a headless
+compositor such as `weston --backend=headless-backend.so`).
+
+Usage: python benchmarks/bench_task_rows.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import gi
+
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gtk, Gdk
+
+from todo import Todo
+from ui.task_widget import TaskWidget
+
+STATUSES = ("NEEDS-ACTION", "COMPLETED", "IN-PROCESS", "CANCELLED")
+
+
+def add_legacy_providers(widget):
+    """Parse and attach the per-widget providers rows used before the shared stylesheet"""
+    for target, css in (
+        (widget.title_label, "label { color: #2c3e50; font-weight: bold; }"),
+        (widget.status_label, "label { color: #e83e8c; font-weight: bold; }"),
+        (widget.desc_label, "label { color: rgba(44, 62, 80, 0.7); }"),
+        (widget.delete_btn, "button { color: #d9534f; }"),
+    ):
+        provider = Gtk.CssProvider()
+        provider.load_from_data(css.encode())
+        target.get_style_context().add_provider(provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+
+
+def build_rows(todos, legacy):
+    box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+    start = time.perf_counter()
+    for todo in todos:
+        widget = TaskWidget(todo)
+        if legacy:
+            add_legacy_providers(widget)
+        box.append(widget)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    Gtk.init()
+    display = Gdk.Display.get_default()
+    if display is None:
+        sys.exit("No display available")
+
+    provider = Gtk.CssProvider()
+    provider.load_from_path(os.path.join(ROOT, 'assets', 'style.css'))
+    Gtk.StyleContext.add_provider_for_display(display, provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+
+    todos = [
+        Todo(uid=str(i), title=f"Task {i}", description=f"Details for task {i}", status=STATUSES[i % len(STATUSES)])
+        for i in range(args.rows)
+    ]
+
+    shared = min(build_rows(todos, legacy=False) for _ in range(args.repeat))
+    legacy = min(build_rows(todos, legacy=True) for _ in range(args.repeat))
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"  {'shared stylesheet:':<22}{shared * 1000:.0f} ms ({shared / args.rows * 1e6:.0f} us/row)")
+    print(f"  {'per-widget providers:':<22}{legacy * 1000:.0f} ms ({legacy / args.rows * 1e6:.0f} us/row)")
+
+
+if __name__ == '__main__':
+    main()
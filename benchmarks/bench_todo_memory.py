@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Per-task memory of the slotted Todo vs the previous __dict__ based one
+
+Usage: python benchmarks/bench_todo_memory.py [--tasks N]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from todo import Todo
+
+STATUSES = ('needs-action', 'completed', 'in-process', 'cancelled')
+
+
+class DictTodo:
+    """Todo as it was before __slots__: a __dict__ per task and a fresh upper-cased status"""
+    def __init__(self, uid=None, title="", description="", status="NEEDS-ACTION", href=None, etag=None):
+        self.uid = uid
+        self.title = title
+        self.description = description
+        self.status = status
+        self.href = href
+        self.etag = etag
+
+    @classmethod
+    def from_dav_task(cls, task_data):
+        return cls(
+            uid=task_data.get('uid'),
+            title=task_data.get('title', ''),
+            description=task_data.get('description', ''),
+            status=task_data.get('status', 'NEEDS-ACTION').upper(),
+            href=task_data.get('href'),
+            etag=task_data.get('etag')
+        )
+
+    @property
+    def is_completed(self):
+        return self.status.upper() == 'COMPLETED'
+
+
+def make_tasks(count):
+    # Parsed tasks carry lower-cased status strings, one object per task
+    return [{
+        'uid': f'task-{uid}',
+        'title': f'Task {uid}',
+        'description': '',
+        'status': STATUSES[uid % len(STATUSES)].lower(),
+        'href': f'/cal/task-{uid}.ics',
+        'etag': f'"{uid}"',
+    } for uid in range(count)]
+
+
+def measure(build, tasks):
+    """Bytes allocated by the objects build() keeps, and the time taken"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    todos = build(tasks)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return todos, size, elapsed
+
+
+def time_completed(todos):
+    start = time.perf_counter()
+    sum(1 for todo in todos if todo.is_completed)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=100000)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    rows = [
+        ('dict Todo', lambda tasks: [DictTodo.from_dav_task(task) for task in tasks]),
+        ('slotted Todo', lambda tasks: [Todo.from_dav_task(task) for task in tasks]),
+        ('from_dav_tasks', Todo.from_dav_tasks),
+    ]
+
+    print(f"{args.tasks} tasks (string fields shared with the task dicts are not counted)")
+    print(f"{'':>16}  {'bytes/task':>10}  {'build':>9}  {'is_completed':>12}")
+    for name, build in rows:
+        todos, size, elapsed = measure(build, tasks)
+        print(f"{name:>16}  {size / args.tasks:>10.0f}  {elapsed * 1000:>7.0f}ms  "
+              f"{time_completed(todos) * 1000:>10.1f}ms")
+        del todos
+
+
+if __name__ == '__main__':
+    main()
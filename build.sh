@@ -197,6 +197,11 @@ fi
 # Create build directories
 mkdir -p dist/assets
 
+# Bundle the logo and stylesheet so they are read from one mapped file
+echo "  • Compiling resource bundle..."
+glib-compile-resources --sourcedir=assets --target=assets/linux-dav-todo.gresource \
+    assets/linux-dav-todo.gresource.xml
+
 # Copy assets to build directory
 echo "  • Copying assets..."
 cp -r assets/* dist/assets/
@@ -275,6 +280,7 @@ if [ -f "dist/main.bin" ]; then
     echo ""
     echo "To run without installing:"
     echo "  ./dist/main.bin"
+    echo "  ./dist/main.bin --cli list    # the command-line interface"
 else
     echo "  ✗ Build failed."
     exit 1
@@ -66,20 +66,20 @@ get_install_paths() {
             echo "BIN_DIR=/usr/local/bin"
             echo "ICON_DIR=/usr/share/icons/hicolor/scalable/apps"
             echo "DESKTOP_DIR=/usr/share/applications"
-            echo "SYSTEMD_DIR=/etc/systemd/system"
+            echo "SYSTEMD_DIR=/etc/systemd/user"
             ;;
         "arch"|"manjaro"|"endeavouros"|"cachyos")
             echo "BIN_DIR=/usr/bin"
             echo "ICON_DIR=/usr/share/icons/hicolor/scalable/apps"
             echo "DESKTOP_DIR=/usr/share/applications"
-            echo "SYSTEMD_DIR=/usr/lib/systemd/system"
+            echo "SYSTEMD_DIR=/usr/lib/systemd/user"
             ;;
         *)
             # Default paths
             echo "BIN_DIR=/usr/local/bin"
             echo "ICON_DIR=/usr/local/share/icons/linux-dav-todo"
             echo "DESKTOP_DIR=/usr/local/share/applications"
-            echo "SYSTEMD_DIR=/etc/systemd/system"
+            echo "SYSTEMD_DIR=/etc/systemd/user"
             ;;
     esac
 }
@@ -127,7 +127,7 @@ handle_selinux() {
     if command -v semanage >/dev/null && command -v restorecon >/dev/null; then
         echo "SELinux detected, setting up contexts..."
         semanage fcontext -a -t bin_t "$BIN_DIR/linux-dav-todo" 2>/dev/null || true
-        restorecon -v "$BIN_DIR/linux-dav-todo" 2>/dev/null || true
+        restorecon -v "$BIN_DIR/linux-dav-todo" "$BIN_DIR/linux-dav-todo-cli" 2>/dev/null || true
         echo "  ✓ SELinux contexts applied"
     fi
 }
@@ -169,6 +169,11 @@ if [ ! -f "linux-dav-todo.service" ]; then
     exit 1
 fi
 
+if [ ! -f "linux-dav-todo-cli" ]; then
+    echo "Error: linux-dav-todo-cli not found"
+    exit 1
+fi
+
 # Install runtime dependencies first
 install_runtime_deps
 
@@ -198,6 +203,9 @@ if [ -f "dist/main.bin" ]; then
     cp dist/main.bin "$BIN_DIR/linux-dav-todo"
     chmod +x "$BIN_DIR/linux-dav-todo"
     echo "  ✓ Binary installed to $BIN_DIR/linux-dav-todo"
+    sed "s|/usr/bin/linux-dav-todo|$BIN_DIR/linux-dav-todo|" linux-dav-todo-cli > "$BIN_DIR/linux-dav-todo-cli"
+    chmod 755 "$BIN_DIR/linux-dav-todo-cli"
+    echo "  ✓ Command-line interface installed to $BIN_DIR/linux-dav-todo-cli"
 else
     echo "  ✗ Binary not found. Please build with Nuitka first."
     echo "    Run: ./build.sh"
@@ -223,12 +231,12 @@ cp linux-dav-todo.desktop "$DESKTOP_DIR/linux-dav-todo.desktop"
 chmod 644 "$DESKTOP_DIR/linux-dav-todo.desktop"
 echo "  ✓ Desktop entry installed to $DESKTOP_DIR/linux-dav-todo.desktop"
 
-# Install systemd service
-cp linux-dav-todo.service "$SYSTEMD_DIR/"
+# Install systemd user service
+sed "s|ExecStart=[^ ]*|ExecStart=$BIN_DIR/linux-dav-todo|" linux-dav-todo.service > "$SYSTEMD_DIR/linux-dav-todo.service"
 chmod 644 "$SYSTEMD_DIR/linux-dav-todo.service"
-echo "  ✓ Systemd service installed to $SYSTEMD_DIR/linux-dav-todo.service"
-echo "    To enable autostart for a user, run:"
-echo "    systemctl enable --user linux-dav-todo@\$USER"
+echo "  ✓ Systemd user service installed to $SYSTEMD_DIR/linux-dav-todo.service"
+echo "    To sync in the background, run as your own user (not root):"
+echo "    systemctl --user enable --now linux-dav-todo"
 
 # Update icon cache and desktop database based on distribution
 if command -v gtk-update-icon-cache >/dev/null; then
@@ -244,14 +252,10 @@ fi
 # Handle SELinux if present
 handle_selinux
 
-# Reload systemd
-systemctl daemon-reload
-echo "  ✓ Systemd configuration reloaded"
-
 echo ""
 echo "Installation complete! You can now:"
 echo "1. Launch Linux DAV Todo from your application menu"
-echo "2. Run 'linux-dav-todo' from the terminal"
-echo "3. Enable autostart with: systemctl enable --user linux-dav-todo@\$USER"
+echo "2. Run 'linux-dav-todo' from the terminal, or 'linux-dav-todo-cli' to manage tasks without the GUI"
+echo "3. Enable background sync with: systemctl --user enable --now linux-dav-todo"
 echo ""
 echo "Note: A backup of any existing installation was created (if applicable)"
\ No newline at end of file
@@ -10,8 +10,13 @@ def read_requirements():
 data_files = [
     ('share/applications', ['linux-dav-todo.desktop']),
     ('share/icons/hicolor/scalable/apps', ['assets/logo.png']),
+    ('share/linux-dav-todo/assets', ['assets/logo.png', 'assets/style.css']),
 ]
 
+# The resource bundle is built by build.sh; without it assets are read from their files
+if os.path.exists('assets/linux-dav-todo.gresource'):
+    data_files.append(('share/linux-dav-todo/assets', ['assets/linux-dav-todo.gresource']))
+
 setup(
     name='linux-dav-todo',
     version='0.1',
@@ -29,9 +34,13 @@ setup(
         'pytest>=6.0.0',
         'keyring>=24.0.0',
     ],
+    extras_require={
+        'async': ['aiohttp>=3.8.0'],
+    },
     entry_points={
         'console_scripts': [
             'linux-dav-todo=main:main',
+            'linux-dav-todo-cli=cli:main',
         ],
     },
     data_files=data_files,
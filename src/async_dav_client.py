@@ -0,0 +1,419 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import aiohttp
+import asyncio
+import base64
+import logging
+import os
+import sys
+import uuid
+import xml.etree.ElementTree as ET
+
+from urllib3.exceptions import MaxRetryError
+
+src_path = os.path.dirname(os.path.abspath(__file__))
+if (src_path not in sys.path):
+    sys.path.insert(0, src_path)
+
+from dav_client import (DavClientBase, AuthenticationError, ConflictError, FetchError, CALENDAR_QUERY,
+                        PROPFIND_RESOURCES, UNSUPPORTED_REPORT_STATUSES)
+from utils.transport import TransportConfig, RETRY_METHODS
+
+
+class AsyncResponse:
+    """Status, decoded body and headers of a completed aiohttp response"""
+    def __init__(self, status_code, text, headers):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+
+class AsyncDavClient(DavClientBase):
+    """asyncio counterpart of DavClient built on aiohttp
+
+    Offers the same authenticate/fetch_tasks/add_task/update_task/delete_task
+    surface as coroutines, so many collections can share one event loop.
+    Request bodies, parsing and the ETag and body caches come from
+    DavClientBase, and requests are retried by the TransportConfig policy,
+    so results, ConflictError and AuthenticationError match DavClient.
+    Use it as an async context manager or call close() when done.
+
+    It covers plain listing and single-task writes only: there are no
+    server-side filters, partial properties or incremental sync, responses
+    are read whole instead of streamed, request bodies are never gzipped,
+    and authenticate() always asks the server.
+    """
+
+    def __init__(self, server_url, username, password, todo_list_path, auth_path=None, multiget_chunk_size=100,
+                 max_connections=8, transport=None):
+        super().__init__(server_url, username, password, todo_list_path, auth_path, multiget_chunk_size)
+        self.logger = logging.getLogger(__name__)
+
+        # The session is bound to an event loop, so it is created on first use
+        self.max_connections = max(1, max_connections)
+        self.transport = transport or TransportConfig()
+        self.timeout = aiohttp.ClientTimeout(sock_connect=5, sock_read=15)
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying aiohttp session and its connections"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers={'Authorization': self._basic_auth_header()},
+                connector=aiohttp.TCPConnector(limit_per_host=self.max_connections,
+                                               force_close=not self.transport.keep_alive),
+                timeout=self.timeout
+            )
+        return self.session
+
+    def _basic_auth_header(self):
+        credentials = f"{self.username}:{self.password}".encode('utf-8')
+        return f"Basic {base64.b64encode(credentials).decode('ascii')}"
+
+    async def _make_request(self, method, url, **kwargs):
+        """Make a request, retried the way the transport's urllib3 Retry retries DavClient's
+
+        Failed connections are retried for every method. Read errors and the
+        retry statuses only for the methods in RETRY_METHODS, as a resent
+        write that already succeeded would come back as a false 412 or 404.
+        """
+        retry = self.transport.build_retry()
+        while True:
+            error = None
+            try:
+                self.logger.info(f"Request {method} to {url}")
+                async with self._get_session().request(method, url, **kwargs) as response:
+                    body = await response.read()
+                    self.logger.info(f"Response status: {response.status}")
+                    text = body.decode(response.charset or 'utf-8', errors='replace')
+                    result = AsyncResponse(response.status, text, response.headers)
+            except aiohttp.ClientConnectorError as e:
+                # Nothing was sent yet
+                error = e
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if method not in RETRY_METHODS:
+                    self.logger.error(f"Request failed: {e}")
+                    raise
+                error = e
+
+            if error is None and not retry.is_retry(method, result.status_code):
+                return result
+
+            try:
+                retry = retry.increment(method, url, error=error)
+            except MaxRetryError:
+                if error is None:
+                    return result
+                self.logger.error(f"Request failed: {error}")
+                raise error from None
+
+            delay = retry.get_backoff_time()
+            reason = error or f"status {result.status_code}"
+            self.logger.warning(f"Request {method} to {url} failed ({reason}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def authenticate(self):
+        """Test authentication with the CalDAV server"""
+        try:
+            auth_url = f"{self.server_url}{self.auth_path}"
+            self.logger.info(f"Authenticating at: {auth_url}")
+
+            response = await self._make_request(
+                'PROPFIND',
+                auth_url,
+                headers={**self.headers, 'Depth': '0'}
+            )
+
+            return response.status_code == 207  # Multi-Status response
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Authentication failed: {e}")
+            return False
+
+    async def fetch_tasks(self):
+        """Fetch all tasks from the CalDAV server
+
+        Returns None when the tasks could not all be fetched and raises
+        AuthenticationError when the server rejects the credentials.
+        """
+        url = f"{self.server_url}{self.todo_list_path}"
+        self.logger.info(f"Fetching tasks from: {url}")
+
+        try:
+            response = await self._make_request(
+                'REPORT',
+                url,
+                data=CALENDAR_QUERY,
+                headers={**self.headers, 'Depth': '1'}
+            )
+
+            self.logger.info(f"Fetch tasks response code: {response.status_code}")
+
+            if response.status_code == 207:
+                tasks = self._parse_tasks(response.text)
+                self.etags = {task['href']: task.get('etag') for task in tasks}
+                return tasks
+            elif response.status_code == 401:
+                raise AuthenticationError(f"Server rejected the credentials for {url}")
+            elif response.status_code in (400, 404):
+                self.logger.info("Falling back to PROPFIND method")
+                return await self._fetch_tasks_propfind()
+
+            self.logger.error(f"Failed to fetch tasks: {response.status_code}")
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error fetching tasks: {e}")
+            return None
+        except ET.ParseError as e:
+            self.logger.error(f"XML parse error: {e}")
+            return None
+
+    async def _fetch_tasks_propfind(self):
+        """Alternative method to fetch tasks using PROPFIND and calendar-multiget
+
+        Returns None on failure, including when any multiget chunk fails.
+        """
+        try:
+            response = await self._make_request(
+                'PROPFIND',
+                f"{self.server_url}{self.todo_list_path}",
+                data=PROPFIND_RESOURCES,
+                headers={**self.headers, 'Depth': '1'}
+            )
+
+            self.logger.info(f"PROPFIND response: {response.status_code}")
+
+            if response.status_code != 207:
+                self.logger.error(f"PROPFIND failed: {response.status_code}")
+                return None
+
+            hrefs = self._parse_ics_hrefs(response.text)
+            tasks = []
+            for start in range(0, len(hrefs), self.multiget_chunk_size):
+                chunk = hrefs[start:start + self.multiget_chunk_size]
+
+                chunk_tasks = None
+                if self.multiget_supported is not False:
+                    chunk_tasks = await self._fetch_tasks_multiget(chunk)
+                if chunk_tasks is None:
+                    # The connector's per-host limit bounds how many GETs run at once
+                    results = await asyncio.gather(*(self._fetch_individual_task(href) for href in chunk))
+                    chunk_tasks = [task for task in results if task]
+
+                tasks.extend(chunk_tasks)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error in PROPFIND: {e}")
+            return None
+        except ET.ParseError as e:
+            self.logger.error(f"XML parse error: {e}")
+            return None
+        except FetchError as e:
+            self.logger.error(f"Error fetching tasks by href: {e}")
+            return None
+
+        self.etags = {task['href']: task.get('etag') for task in tasks}
+        return tasks
+
+    async def _fetch_tasks_multiget(self, hrefs):
+        """Fetch several tasks with a single calendar-multiget REPORT
+
+        Returns None when the server does not support calendar-multiget and
+        raises FetchError when the chunk could not be fetched.
+        """
+        response = await self._make_request(
+            'REPORT',
+            f"{self.server_url}{self.todo_list_path}",
+            data=self._build_multiget(hrefs),
+            headers={**self.headers, 'Depth': '1'}
+        )
+
+        if response.status_code == 207:
+            self.multiget_supported = True
+            return self._parse_tasks(response.text)
+
+        if response.status_code in UNSUPPORTED_REPORT_STATUSES and not self.multiget_supported:
+            self.logger.info(f"calendar-multiget not supported ({response.status_code}), using individual GETs")
+            self.multiget_supported = False
+            return None
+
+        self.logger.error(f"calendar-multiget failed: {response.status_code}")
+        raise FetchError(f"Server answered {response.status_code} to calendar-multiget")
+
+    async def _fetch_individual_task(self, href):
+        """Fetch an individual task by its href"""
+        try:
+            response = await self._make_request('GET', self._full_url(href))
+            if response.status_code == 200:
+                return self._parse_individual_task(href, response.text, response.headers.get('ETag'))
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error fetching individual task: {e}")
+            return None
+
+    async def add_task(self, title, description='', status='NEEDS-ACTION', uid=None):
+        """Add a new task to the CalDAV server
+
+        A caller-chosen uid makes the task's href known up front. With one,
+        an existing resource at that href raises ConflictError.
+        """
+        result = await self._add_one({'title': title, 'description': description, 'status': status, 'uid': uid})
+        if result['conflict'] and uid is not None:
+            raise ConflictError(result['href'])
+        return result['ok']
+
+    async def _add_one(self, task):
+        uid = task.get('uid') or str(uuid.uuid4())
+        href = f"{self.todo_list_path}{uid}.ics"
+        ical_data = self._build_vtodo(
+            uid, task['title'], task.get('description') or '', task.get('status') or 'NEEDS-ACTION'
+        )
+
+        try:
+            response = await self._make_request(
+                'PUT',
+                f"{self.server_url}{href}",
+                data=ical_data,
+                headers={'Content-Type': 'text/calendar; charset=utf-8', 'If-None-Match': '*'}
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error adding task: {e}")
+            return self._task_result(href, error=str(e))
+
+        ok = response.status_code in (201, 204)  # Created or No Content
+        if ok:
+            self._remember_ical(href, response.headers.get('ETag'), ical_data)
+        return self._task_result(href, response, ok)
+
+    async def update_task(self, href, title=None, description=None, status=None, etag=None):
+        """Update an existing task on the CalDAV server
+
+        PUTs the body seen at the last fetch with If-Match and only re-reads
+        the task when the server answers 412 Precondition Failed. Passing the
+        etag the change was made against instead raises ConflictError when
+        the server copy no longer has it.
+        """
+        result = await self._update_one(
+            {'href': href, 'title': title, 'description': description, 'status': status, 'etag': etag}
+        )
+        if result['conflict'] and etag is not None:
+            raise ConflictError(href)
+        return result['ok']
+
+    async def _update_one(self, update):
+        href = update['href']
+        etag = update.get('etag')
+        changes = (update.get('title'), update.get('description'), update.get('status'))
+
+        try:
+            current = self.ical_cache.get(href)
+            if current is None or (etag is not None and current[0] != etag):
+                current = await self._get_task_resource(href)
+                if current is None:
+                    return self._task_result(href, error="could not read the task")
+                if etag is not None and current[0] != etag:
+                    return self._task_result(href, conflict=True)
+
+            update_response = await self._put_task_changes(href, current, *changes)
+            if update_response.status_code == 412 and etag is None:
+                self.logger.info(f"Task changed on the server, re-reading before update: {href}")
+                current = await self._get_task_resource(href)
+                if current is None:
+                    return self._task_result(href, error="could not read the task")
+                update_response = await self._put_task_changes(href, current, *changes)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error updating task: {e}")
+            return self._task_result(href, error=str(e))
+
+        return self._task_result(href, update_response, update_response.status_code in (200, 201, 204))
+
+    async def _get_task_resource(self, href):
+        """GET the current (ETag, iCalendar body) of a task"""
+        response = await self._make_request(
+            'GET',
+            f"{self.server_url}{href}",
+            headers=self.headers
+        )
+
+        if response.status_code != 200:
+            self.logger.error(f"Failed to read task {href}: {response.status_code}")
+            return None
+        return response.headers.get('ETag'), response.text
+
+    async def _put_task_changes(self, href, current, title, description, status):
+        """PUT the changed task, conditional on the ETag it was read with"""
+        etag, ical_data = current
+        ical_data = self._apply_task_changes(ical_data, title, description, status)
+
+        headers = {'Content-Type': 'text/calendar; charset=utf-8'}
+        if etag:
+            headers['If-Match'] = etag
+
+        response = await self._make_request(
+            'PUT',
+            f"{self.server_url}{href}",
+            data=ical_data,
+            headers=headers
+        )
+
+        self._record_put(href, response, ical_data)
+        return response
+
+    async def delete_task(self, href, etag=None):
+        """Delete a task from the CalDAV server
+
+        With an etag the delete is conditional, and ConflictError is raised
+        when the task changed on the server since that version.
+        """
+        result = await self._delete_one({'href': href, 'etag': etag})
+        if result['conflict'] and etag is not None:
+            raise ConflictError(href)
+        return result['ok']
+
+    async def _delete_one(self, item):
+        href = item['href']
+        etag = item.get('etag')
+        try:
+            url = f"{self.server_url}{href}"
+            self.logger.info(f"Deleting task at: {url}")
+
+            headers = self.headers
+            if etag is not None:
+                headers = {**self.headers, 'If-Match': etag}
+
+            response = await self._make_request(
+                'DELETE',
+                url,
+                headers=headers
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error deleting task: {e}")
+            return self._task_result(href, error=str(e))
+
+        return self._task_result(href, response, self._record_delete(href, response))
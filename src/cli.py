@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Command-line interface for scripts and terminals
+
+`list` and `export` answer from the task cache that the GUI and the sync
+daemon keep warm, so they load neither GTK nor requests. add, complete and
+delete are journaled in the outbox and then sent to the server; a write that
+cannot be sent yet stays queued for the next sync.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+src_path = os.path.dirname(os.path.abspath(__file__))
+if (src_path not in sys.path):
+    sys.path.insert(0, src_path)
+
+# Everything else is imported by the commands that need it
+
+
+class CliError(Exception):
+    """A problem to report to the user, who can do something about it"""
+
+
+def connect(task_cache):
+    """Build the CollectionSync of task_cache for the stored credentials"""
+    from utils.credentials import CredentialsManager
+    credentials = CredentialsManager.get_credentials()
+    if not credentials:
+        raise CliError("no stored credentials, log in with the GUI first")
+
+    from dav_client import DavClient
+    from outbox import Outbox
+    from sync import CollectionSync
+
+    dav_client = DavClient(
+        credentials['server_url'],
+        credentials['username'],
+        credentials['password'],
+        credentials['todo_list_path'],
+        credentials.get('auth_path')
+    )
+    return CollectionSync(dav_client, task_cache, Outbox(task_cache, dav_client))
+
+
+def format_task(task):
+    mark = 'x' if task.get('status') == 'completed' else ' '
+    line = f"{(task.get('uid') or '')[:8]:<8}  [{mark}] {task.get('title') or ''}"
+    due = task.get('due')
+    if due:
+        line += f"  (due {due[:4]}-{due[4:6]}-{due[6:8]})"
+    return line
+
+
+def find_task(task_cache, ident):
+    """Look a task up by its uid or a unique uid prefix"""
+    task = task_cache.get_task(ident)
+    if task is not None:
+        return task
+    matches = [task for task in task_cache.load_tasks() if (task.get('uid') or '').startswith(ident)]
+    if not matches:
+        raise CliError(f"no task matches {ident!r}")
+    if len(matches) > 1:
+        raise CliError(f"{ident!r} matches {len(matches)} tasks, give more of the uid")
+    return matches[0]
+
+
+class Cli:
+    """Runs one command against a TaskCache
+
+    The connection to the server is only made by commands that need it,
+    through the connect callable, which returns a CollectionSync.
+    """
+
+    def __init__(self, task_cache, connect=connect, out=sys.stdout, err=sys.stderr):
+        self.task_cache = task_cache
+        self._connect = connect
+        self._collection_sync = None
+        self.out = out
+        self.err = err
+
+    @property
+    def collection_sync(self):
+        if self._collection_sync is None:
+            self._collection_sync = self._connect(self.task_cache)
+        return self._collection_sync
+
+    def run(self, args):
+        return getattr(self, f'cmd_{args.command}')(args)
+
+    def cmd_list(self, args):
+        if args.sync or self.task_cache.load_state() is None:
+            self.refresh()
+
+        tasks = self.task_cache.load_tasks()
+        if not args.all:
+            tasks = [task for task in tasks if task.get('status') != 'completed']
+        tasks.sort(key=lambda task: (task.get('status') == 'completed', (task.get('title') or '').lower()))
+
+        if args.json:
+            import json
+            json.dump(tasks, self.out, indent=2)
+            self.out.write('\n')
+        else:
+            self.out.write(''.join(format_task(task) + '\n' for task in tasks))
+        return 0
+
+    def cmd_add(self, args):
+        task = self.collection_sync.outbox.add_task(args.title, args.description or '')
+        self.out.write(f"{task['uid']}\n")
+        return self.send()
+
+    def cmd_complete(self, args):
+        task = find_task(self.task_cache, args.uid)
+        status = 'NEEDS-ACTION' if args.reopen else 'COMPLETED'
+        self.collection_sync.outbox.update_task(task['href'], status=status)
+        return self.send()
+
+    def cmd_delete(self, args):
+        task = find_task(self.task_cache, args.uid)
+        self.collection_sync.outbox.delete_task(task['href'])
+        return self.send()
+
+    def cmd_export(self, args):
+        tasks = self.load_full_tasks(self.task_cache.load_tasks())
+
+        if args.format == 'json':
+            import json
+            data = json.dumps(tasks, indent=2) + '\n'
+        else:
+            from utils.ical import build_vcalendar
+            data = build_vcalendar(tasks)
+
+        if args.output in (None, '-'):
+            self.out.write(data)
+        else:
+            with open(args.output, 'w', encoding='utf-8', newline='') as output:
+                output.write(data)
+        return 0
+
+    def refresh(self):
+        result = self.collection_sync.refresh()
+        if result['state'] == 'auth_failed':
+            raise CliError("the server rejected the stored credentials")
+        if result['state'] in ('failed', 'pending'):
+            self.err.write("Server unreachable, showing cached tasks\n")
+        return result
+
+    def send(self):
+        """Replay the outbox, reporting what could not be sent"""
+        replay = self.collection_sync.replay_outbox()
+        for href in replay['conflicts']:
+            self.err.write(f"Dropped a change to {href}: it was changed on the server\n")
+        for href in replay['failed']:
+            self.err.write(f"Dropped a change to {href}: the server keeps rejecting it\n")
+        if replay['pending']:
+            self.err.write(f"Server unreachable, {replay['pending']} changes will be sent on the next sync\n")
+        return 1 if replay['conflicts'] or replay['failed'] else 0
+
+    def load_full_tasks(self, tasks):
+        """Fill in the properties the cache leaves out, see utils.query.TASK_PROPERTIES
+
+        They come from the stored body of the task when it is still current,
+        else a task the cache only holds in summary form is read from the
+        server.
+        """
+        from utils.ical import parse_vtodo
+        full_tasks = []
+        for task in tasks:
+            stored = self.task_cache.get_body(task['href'])
+            if stored is not None and stored[0] == task.get('etag'):
+                # Fields known locally, including unsent edits, win over the stored copy
+                task = {**parse_vtodo(stored[1]), **task}
+                task.pop('partial', None)
+            elif task.get('partial'):
+                full = self.collection_sync.load_full_task(task['href'])
+                if full is None:
+                    self.err.write(f"Could not load {task['href']}, exporting its summary only\n")
+                else:
+                    task = full
+            full_tasks.append(task)
+        return full_tasks
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='linux-dav-todo-cli', description=__doc__.splitlines()[0])
+    parser.add_argument('-v', '--verbose', action='store_true', help="log requests to stderr")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = commands.add_parser('list', help="show the cached tasks")
+    list_parser.add_argument('-a', '--all', action='store_true', help="include completed tasks")
+    list_parser.add_argument('-s', '--sync', action='store_true', help="sync with the server first")
+    list_parser.add_argument('--json', action='store_true', help="print the task dicts as JSON")
+
+    add_parser = commands.add_parser('add', help="add a task")
+    add_parser.add_argument('title')
+    add_parser.add_argument('-d', '--description')
+
+    complete_parser = commands.add_parser('complete', help="mark a task completed")
+    complete_parser.add_argument('uid', help="uid or unique uid prefix, as shown by list")
+    complete_parser.add_argument('--reopen', action='store_true', help="mark it as needing action again")
+
+    delete_parser = commands.add_parser('delete', help="delete a task")
+    delete_parser.add_argument('uid', help="uid or unique uid prefix, as shown by list")
+
+    export_parser = commands.add_parser('export', help="write every task as iCalendar or JSON")
+    export_parser.add_argument('-f', '--format', choices=('ics', 'json'), default='ics')
+    export_parser.add_argument('-o', '--output', help="file to write, standard output by default")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(levelname)s: %(message)s')
+
+    from utils.credentials import CredentialsManager
+    settings = CredentialsManager.get_settings()
+    if not settings:
+        print("linux-dav-todo-cli: error: not configured, log in with the GUI first", file=sys.stderr)
+        return 1
+
+    from utils.cache import TaskCache
+    cli = Cli(TaskCache(TaskCache.collection_key(settings['server_url'], settings['username'],
+                                                 settings['todo_list_path'])))
+    try:
+        return cli.run(args)
+    except CliError as e:
+        print(f"linux-dav-todo-cli: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        cli.task_cache.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
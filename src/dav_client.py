@@ -17,18 +17,68 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import requests
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 import logging
-import urllib.parse
 import os
+import sys
 import time
-from requests.exceptions import RequestException, ConnectionError, Timeout
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from xml.sax.saxutils import escape as xml_escape
+from requests.exceptions import RequestException
 
-class DavClient:
-    def __init__(self, server_url, username, password, todo_list_path, auth_path=None):
+src_path = os.path.dirname(os.path.abspath(__file__))
+if (src_path not in sys.path):
+    sys.path.insert(0, src_path)
+
+from utils.ical import parse_vtodo, replace_property, escape_text
+from utils.query import (TASK_PROPERTIES, build_calendar_query, calendar_data_prop, filter_properties, format_utc,
+                         task_matches)
+from utils.transport import TransportConfig, TransferStats, accepts_gzip, connection_stats, gzip_body
+
+# Size of the chunks read from streamed multistatus responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Methods whose request bodies may be sent gzip coded
+COMPRESSIBLE_METHODS = ('PROPFIND', 'REPORT', 'PUT')
+
+# Statuses returned by servers that do not implement a REPORT (sync-collection, multiget)
+UNSUPPORTED_REPORT_STATUSES = (400, 403, 404, 405, 415, 501)
+
+class AuthenticationError(Exception):
+    """The server rejected the credentials (401 Unauthorized)"""
+
+
+class FetchError(Exception):
+    """The server could not deliver the complete task list"""
+
+
+class ConflictError(Exception):
+    """A conditional write failed because the task changed on the server"""
+    def __init__(self, href):
+        super().__init__(f"Task changed on the server: {href}")
+        self.href = href
+
+
+CALENDAR_QUERY = build_calendar_query()
+
+PROPFIND_RESOURCES = """<?xml version="1.0" encoding="utf-8" ?>
+<d:propfind xmlns:d="DAV:">
+    <d:prop>
+        <d:resourcetype/>
+        <d:getcontenttype/>
+        <d:getetag/>
+    </d:prop>
+</d:propfind>"""
+
+class DavClientBase:
+    """Request bodies, response parsing and task state shared by DavClient and AsyncDavClient
+    
+    Nothing here does I/O, so both the blocking and the asyncio client build
+    on it and behave alike apart from how requests are sent.
+    """
+    def __init__(self, server_url, username, password, todo_list_path, auth_path=None, multiget_chunk_size=100):
         self.server_url = server_url.rstrip('/')  # Remove trailing slash
         self.username = username
         self.password = password
@@ -40,39 +90,324 @@ class DavClient:
             
         self.auth_path = auth_path if auth_path else self.todo_list_path
         
-        # Configure session with retry capability
-        self.session = requests.Session()
-        self.session.auth = (username, password)
         self.headers = {
             'Content-Type': 'application/xml; charset=utf-8'
         }
         self.logger = logging.getLogger(__name__)
         
+        # href -> ETag of every task in the collection, used for incremental sync
+        self.etags = {}
+        # href -> (ETag, iCalendar body) last seen, the base for conditional updates
+        self.ical_cache = {}
+        
+        # Number of hrefs per calendar-multiget REPORT; None until we know
+        # whether the server supports multiget at all
+        self.multiget_chunk_size = max(1, multiget_chunk_size)
+        self.multiget_supported = None
+
+    def _full_url(self, href):
+        """Turn an href from a multistatus response into an absolute URL"""
+        if href.startswith(self.server_url):
+            return href
+        elif href.startswith('/'):
+            return f"{self.server_url}{href}"
+        return f"{self.server_url}/{href}"
+    
+    def _parse_ics_hrefs(self, xml_response):
+        """List the .ics member hrefs of a PROPFIND multistatus"""
+        root = ET.fromstring(xml_response)
+        ns = {'d': 'DAV:'}
+        
+        hrefs = []
+        for response_elem in root.findall('.//d:response', ns):
+            href = response_elem.find('./d:href', ns)
+            if href is not None and href.text and href.text.endswith('.ics'):
+                # Only fetch .ics files
+                hrefs.append(href.text)
+        return hrefs
+    
+    def _build_multiget(self, hrefs, properties=None):
+        """Build a calendar-multiget REPORT body for the given hrefs"""
+        href_elems = "\n    ".join(f"<d:href>{xml_escape(href)}</d:href>" for href in hrefs)
+        return f"""<?xml version="1.0" encoding="utf-8" ?>
+<c:calendar-multiget xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+    <d:prop>
+        <d:getetag />
+        {calendar_data_prop(properties)}
+    </d:prop>
+    {href_elems}
+</c:calendar-multiget>"""
+    
+    def _build_vtodo(self, uid, title, description, status):
+        """Build the iCalendar body of a new task"""
+        now = datetime.now().strftime('%Y%m%dT%H%M%SZ')
+        
+        return f"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Linux-DAV-Todo//EN
+BEGIN:VTODO
+UID:{uid}
+DTSTAMP:{now}
+CREATED:{now}
+LAST-MODIFIED:{now}
+SUMMARY:{escape_text(title)}
+DESCRIPTION:{escape_text(description)}
+STATUS:{status}
+END:VTODO
+END:VCALENDAR
+"""
+    
+    def _parse_tasks(self, xml_response):
+        """Parse the XML response and extract todo items, raising ET.ParseError on a broken one"""
+        tasks = []
+        root = ET.fromstring(xml_response)
+        
+        # CalDAV namespaces
+        ns = {
+            'd': 'DAV:',
+            'c': 'urn:ietf:params:xml:ns:caldav',
+        }
+        
+        for response_elem in root.findall('.//d:response', ns):
+            href_elem = response_elem.find('./d:href', ns)
+            if href_elem is None:
+                continue
+                
+            todo_data = self._parse_response_task(response_elem)
+            if todo_data:
+                tasks.append(todo_data)
+        return tasks
+    
+    def _parse_response_task(self, response_elem, properties=None):
+        """Extract a todo from a single <d:response> element carrying calendar-data
+        
+        With properties, the body is partial (see calendar_data_prop): only
+        those properties are parsed, even from a server that sent them all,
+        it is not kept as the base for conditional updates and the task is
+        marked 'partial'.
+        
+        The elements are looked up by their namespaced tags: an ElementPath
+        with a prefix map is compiled on every call, which cost more per task
+        than parsing the iCalendar body.
+        """
+        href_elem = response_elem.find('{DAV:}href')
+        calendar_data = next(response_elem.iter('{urn:ietf:params:xml:ns:caldav}calendar-data'), None)
+        
+        if calendar_data is None or not calendar_data.text or 'VTODO' not in calendar_data.text:
+            return None
+        
+        # Parse iCalendar data to extract todo information
+        todo_data = self._parse_ical(calendar_data.text, properties)
+        if not todo_data:
+            return None
+        
+        todo_data['href'] = href_elem.text
+        etag_elem = next(response_elem.iter('{DAV:}getetag'), None)
+        if etag_elem is not None and etag_elem.text:
+            todo_data['etag'] = etag_elem.text
+        if properties:
+            todo_data['partial'] = True
+            cached = self.ical_cache.get(todo_data['href'])
+            if cached is not None and cached[0] != todo_data.get('etag'):
+                self.ical_cache.pop(todo_data['href'], None)
+        else:
+            self._remember_ical(todo_data['href'], todo_data.get('etag'), calendar_data.text)
+        return todo_data
+    
+    def _parse_individual_task(self, href, ical_data, etag=None):
+        """Build a task from the body of a GET on a single resource"""
+        if 'BEGIN:VTODO' not in ical_data:
+            return None
+        todo_data = self._parse_ical(ical_data)
+        if not todo_data:
+            return None
+        todo_data['href'] = href
+        if etag:
+            todo_data['etag'] = etag
+        self._remember_ical(href, etag, ical_data)
+        return todo_data
+    
+    def _parse_ical(self, ical_data, properties=None):
+        """Parse the VTODO of an iCalendar object into a task dict
+
+        Without properties only TASK_PROPERTIES are parsed: the complete body
+        is kept (see _remember_ical) for whatever needs the others.
+        """
+        return parse_vtodo(ical_data, properties or TASK_PROPERTIES)
+    
+    def _remember_ical(self, href, etag, ical_data):
+        """Keep the body and ETag of a resource so it can be updated without a GET"""
+        if etag:
+            self.ical_cache[href] = (etag, ical_data)
+        else:
+            self.ical_cache.pop(href, None)
+    
+    def _record_put(self, href, response, ical_data):
+        """Keep the body and new ETag of a task after a PUT of an update, or forget it on 412"""
+        if response.status_code in (200, 201, 204):
+            new_etag = response.headers.get('ETag')
+            self._remember_ical(href, new_etag, ical_data)
+            if new_etag:
+                self.etags[href] = new_etag
+            else:
+                self.etags.pop(href, None)
+        elif response.status_code == 412:
+            self.ical_cache.pop(href, None)
+    
+    def _record_delete(self, href, response):
+        """Forget a deleted task; returns whether the DELETE succeeded"""
+        # A task that is already gone, e.g. deleted by an earlier attempt, needs no deleting
+        success = response.status_code in (200, 204, 404, 410)
+        if success:
+            self.etags.pop(href, None)
+            self.ical_cache.pop(href, None)
+            self.logger.info(f"Task deleted successfully: {href} ({response.status_code})")
+        else:
+            self.logger.error(f"Failed to delete task: {response.status_code}")
+        return success
+    
+    def _task_result(self, href, response=None, ok=False, conflict=False, error=None):
+        """The per-item outcome of a write, as returned by the batch methods"""
+        status = response.status_code if response is not None else None
+        conflict = conflict or status == 412
+        if not ok and error is None:
+            error = "changed on the server" if conflict else f"server answered {status}"
+        return {
+            'href': href,
+            'ok': ok,
+            'status': status,
+            'etag': response.headers.get('ETag') if ok else None,
+            'conflict': conflict,
+            'error': None if ok else error,
+        }
+    
+    def _apply_task_changes(self, ical_data, title=None, description=None, status=None):
+        """Simple update of the iCalendar data of a task
+
+        An empty description removes it. Completing a task stamps COMPLETED
+        and any other status drops it, so a reopened task is not reported as
+        done by completed_since queries.
+        """
+        now = format_utc(datetime.now(timezone.utc))
+        if title:
+            ical_data = self._replace_ical_property(ical_data, 'SUMMARY', escape_text(title))
+        if description is not None:
+            ical_data = self._replace_ical_property(ical_data, 'DESCRIPTION', escape_text(description) or None)
+        if status:
+            status = status.upper()
+            ical_data = self._replace_ical_property(ical_data, 'STATUS', status)
+            ical_data = self._replace_ical_property(ical_data, 'COMPLETED', now if status == 'COMPLETED' else None)
+            
+        # Update the last modified timestamp
+        return self._replace_ical_property(ical_data, 'LAST-MODIFIED', now)
+    
+    def _replace_ical_property(self, ical_data, property_name, new_value):
+        """Replace a property in iCalendar data"""
+        return replace_property(ical_data, property_name, new_value)
+
+
+class DavClient(DavClientBase):
+    def __init__(self, server_url, username, password, todo_list_path, auth_path=None, multiget_chunk_size=100,
+                 max_workers=4, auth_ttl=300, transport=None):
+        super().__init__(server_url, username, password, todo_list_path, auth_path, multiget_chunk_size)
+        
+        # Number of parallel requests for bulk per-href operations
+        self.max_workers = max(1, max_workers)
+        
+        # Pooled keep-alive session with urllib3 retries; by default every
+        # worker keeps its own connection alive
+        self.transport = transport or TransportConfig()
+        self.session = self.transport.create_session((username, password), self.max_workers)
+        # Request bodies are gzipped only after the server advertises it:
+        # None until then, 'gzip' once it has, False after it rejected one
+        self.request_encoding = None
+        self.transfer = TransferStats()
+        
+        # Incremental sync state: last RFC 6578 sync token (ETags are kept by the base)
+        self.sync_token = None
+        # Collection getctag/sync-token seen by the last change check
+        self.collection_state = None
+        
+        # Seconds a confirmed login is trusted before authenticate() checks again
+        self.auth_ttl = auth_ttl
+        self.authenticated_at = None
+        
     def _make_request(self, method, url, **kwargs):
-        """Make a request with retry logic"""
-        max_retries = 3
-        retry_delay = 1  # seconds
+        """Make a request; the transport retries connection errors, and 502/503/504 on reads
+        
+        Large bodies are gzipped when the server accepts that, and the body
+        bytes are counted in self.transfer. A streamed response is counted by
+        whoever reads it, through _record_received().
+        """
+        data = kwargs.get('data')
+        size = len(data.encode('utf-8')) if isinstance(data, str) else len(data or b'')
+        compressed = False
+        if (size and self.request_encoding == 'gzip' and method in COMPRESSIBLE_METHODS
+                and size >= self.transport.compress_min_size):
+            kwargs['data'] = gzip_body(data)
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), 'Content-Encoding': 'gzip'}
+            compressed = True
+        
+        try:
+            self.logger.info(f"Request {method} to {url}")
+            response = self.session.request(method, url, **kwargs)
+        except RequestException as e:
+            self.logger.error(f"Request failed: {e}")
+            raise
+        
+        if size:
+            self.transfer.record_sent(size, len(kwargs['data']) if compressed else size)
+        
+        self.logger.info(f"Response status: {response.status_code}")
+        if compressed and response.status_code == 415:
+            # The server does not take gzipped bodies after all; resend as is
+            self.logger.info("Server rejected a gzip request body, sending uncompressed from now on")
+            response.close()
+            self.request_encoding = False
+            kwargs['data'] = data
+            kwargs['headers'] = {k: v for k, v in kwargs['headers'].items() if k != 'Content-Encoding'}
+            return self._make_request(method, url, **kwargs)
+        
+        if (self.request_encoding is None and self.transport.compress_requests
+                and accepts_gzip(response.headers.get('Accept-Encoding'))):
+            self.logger.info("Server accepts gzip request bodies")
+            self.request_encoding = 'gzip'
+        
+        if not kwargs.get('stream'):
+            self._record_received(response, len(response.content))
+        
+        if response.status_code == 401:
+            self.authenticated_at = None
+        elif response.ok and self.authenticated_at is not None:
+            # Any accepted request shows the credentials still work
+            self.authenticated_at = time.monotonic()
+        return response
+    
+    def _record_received(self, response, size):
+        """Count a read response body: its decoded size and the bytes read off the wire"""
+        try:
+            wire_size = int(response.raw.tell())
+        except (AttributeError, TypeError, ValueError):
+            wire_size = size
+        self.transfer.record_received(size, wire_size)
+    
+    def connection_stats(self):
+        """Requests sent, connections opened and the resulting connection reuse rate"""
+        return connection_stats(self.session)
+    
+    def transfer_stats(self):
+        """Body bytes sent and received, as payload and as bytes on the wire"""
+        return self.transfer.as_dict()
+    
+    def authenticate(self, force=False):
+        """Test authentication with the CalDAV server
+        
+        A successful result is remembered for auth_ttl seconds, so repeated
+        calls cost no request until then or until a request gets a 401.
+        """
+        if not force and self.is_authenticated():
+            return True
         
-        for attempt in range(max_retries):
-            try:
-                self.logger.info(f"Request {method} to {url} (attempt {attempt+1}/{max_retries})")
-                response = self.session.request(method, url, **kwargs)
-                self.logger.info(f"Response status: {response.status_code}")
-                return response
-            except (ConnectionError, Timeout) as e:
-                if attempt < max_retries - 1:
-                    self.logger.warning(f"Request failed: {e}. Retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    self.logger.error(f"Request failed after {max_retries} attempts: {e}")
-                    raise
-            except RequestException as e:
-                self.logger.error(f"Request error: {e}")
-                raise
-        
-    def authenticate(self):
-        """Test authentication with the CalDAV server"""
         try:
             auth_url = f"{self.server_url}{self.auth_path}"
             self.logger.info(f"Authenticating at: {auth_url}")
@@ -84,26 +419,148 @@ class DavClient:
                 timeout=(5, 15)  # (connect timeout, read timeout)
             )
             
-            return response.status_code == 207  # Multi-Status response
+            if response.status_code != 207:  # Multi-Status response
+                self.authenticated_at = None
+                return False
+            self.authenticated_at = time.monotonic()
+            return True
         except RequestException as e:
             self.logger.error(f"Authentication failed: {e}")
+            self.authenticated_at = None
             return False
+    
+    def is_authenticated(self):
+        """Whether a login was confirmed within the last auth_ttl seconds"""
+        return self.authenticated_at is not None and time.monotonic() - self.authenticated_at < self.auth_ttl
 
-    def fetch_tasks(self):
-        """Fetch all tasks from the CalDAV server"""
-        # Fixed CalDAV REPORT request with proper namespaces and formatting
-        calendar_query = """<?xml version="1.0" encoding="utf-8" ?>
-<c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+    def get_collection_state(self):
+        """Read the collection's getctag and sync-token with a Depth: 0 PROPFIND"""
+        propfind_body = """<?xml version="1.0" encoding="utf-8" ?>
+<d:propfind xmlns:d="DAV:" xmlns:cs="http://calendarserver.org/ns/">
     <d:prop>
+        <cs:getctag />
+        <d:sync-token />
+    </d:prop>
+</d:propfind>"""
+        
+        try:
+            response = self._make_request(
+                'PROPFIND',
+                f"{self.server_url}{self.todo_list_path}",
+                data=propfind_body,
+                headers={**self.headers, 'Depth': '0'},
+                timeout=(5, 15)
+            )
+            
+            if response.status_code != 207:
+                self.logger.error(f"Failed to read collection state: {response.status_code}")
+                return None
+            
+            root = ET.fromstring(response.text)
+            ns = {'d': 'DAV:', 'cs': 'http://calendarserver.org/ns/'}
+            ctag = root.find('.//cs:getctag', ns)
+            sync_token = root.find('.//d:sync-token', ns)
+            return {
+                'ctag': ctag.text if ctag is not None else None,
+                'sync_token': sync_token.text if sync_token is not None else None,
+            }
+        except (RequestException, ET.ParseError) as e:
+            self.logger.error(f"Error reading collection state: {e}")
+            return None
+    
+    def has_collection_changed(self):
+        """Check whether the collection changed since the last check
+        
+        Returns True when the server exposes neither getctag nor sync-token,
+        since nothing can be concluded without them.
+        """
+        state = self.get_collection_state()
+        if state is None or not any(state.values()):
+            self.collection_state = None
+            return True
+        
+        if state == self.collection_state:
+            self.logger.info("Collection unchanged since last sync")
+            return False
+        
+        self.collection_state = state
+        return True
+    
+    def fetch_etags(self):
+        """List the ETag of every resource in the collection with a Depth: 1 PROPFIND"""
+        propfind_body = """<?xml version="1.0" encoding="utf-8" ?>
+<d:propfind xmlns:d="DAV:">
+    <d:prop>
+        <d:resourcetype />
         <d:getetag />
-        <c:calendar-data />
     </d:prop>
-    <c:filter>
-        <c:comp-filter name="VCALENDAR">
-            <c:comp-filter name="VTODO" />
-        </c:comp-filter>
-    </c:filter>
-</c:calendar-query>"""
+</d:propfind>"""
+        
+        try:
+            response = self._make_request(
+                'PROPFIND',
+                f"{self.server_url}{self.todo_list_path}",
+                data=propfind_body,
+                headers={**self.headers, 'Depth': '1'},
+                timeout=(5, 15)
+            )
+            
+            if response.status_code != 207:
+                self.logger.error(f"Failed to list ETags: {response.status_code}")
+                return None
+            
+            root = ET.fromstring(response.text)
+            ns = {'d': 'DAV:'}
+            etags = {}
+            for response_elem in root.findall('.//d:response', ns):
+                href = response_elem.find('./d:href', ns)
+                if href is None or not href.text:
+                    continue
+                if response_elem.find('.//d:resourcetype/d:collection', ns) is not None:
+                    continue
+                etag = response_elem.find('.//d:getetag', ns)
+                etags[href.text] = etag.text if etag is not None else None
+            return etags
+        except (RequestException, ET.ParseError) as e:
+            self.logger.error(f"Error listing ETags: {e}")
+            return None
+
+    def fetch_tasks(self, status=None, exclude_status=(), completed_since=None, time_range=None, properties=None):
+        """Fetch all tasks from the CalDAV server
+        
+        The optional filters are evaluated by the server, see iter_tasks().
+        Returns None when the tasks could not all be fetched and raises
+        AuthenticationError when the server rejects the credentials.
+        """
+        try:
+            return list(self.iter_tasks(status, exclude_status, completed_since, time_range, properties))
+        except FetchError:
+            return None
+    
+    def iter_tasks(self, status=None, exclude_status=(), completed_since=None, time_range=None, properties=None):
+        """Fetch all tasks from the CalDAV server, yielding each one as soon as it is parsed
+        
+        The REPORT response is streamed and parsed incrementally, so memory use
+        stays flat however large the collection is.
+        
+        The filters (see utils.query.build_calendar_query) are sent as part of
+        the calendar-query, so the server leaves out the tasks that do not
+        match; exclude_status=('COMPLETED', 'CANCELLED') gives open tasks
+        only, including those without a STATUS, which take a second query.
+        A server that rejects the filter gets the plain query and the tasks
+        are filtered here instead. Only an unfiltered fetch updates the ETags
+        used for incremental sync.
+        
+        With properties (e.g. utils.query.SUMMARY_PROPERTIES) the server only
+        sends those VTODO properties. Such tasks are marked 'partial' and
+        fetch_task() gets the complete one when it is needed.
+        
+        Raises FetchError when the tasks cannot all be fetched, possibly after
+        some were already yielded, so callers never take a partial listing
+        for the whole collection.
+        """
+        filters = (status, exclude_status, completed_since, time_range)
+        filtered = bool(status or exclude_status) or completed_since is not None or time_range is not None
         
         # Construct proper URL
         url = f"{self.server_url}{self.todo_list_path}"
@@ -119,32 +576,81 @@ class DavClient:
             response = self._make_request(
                 'REPORT',
                 url,
-                data=calendar_query,
+                data=build_calendar_query(*filters, properties) if filtered or properties else CALENDAR_QUERY,
                 headers=headers,
-                timeout=(5, 15)
+                timeout=(5, 15),
+                stream=True
             )
             
             self.logger.info(f"Fetch tasks response code: {response.status_code}")
             
             if response.status_code == 207:
-                return self._parse_tasks(response.text)
-            elif response.status_code == 400:
-                self.logger.error(f"Bad request: {response.text[:200]}...")
+                etags = {}
+                for task in self._iter_response_tasks(response, properties):
+                    etags[task['href']] = task.get('etag')
+                    yield task
+                if exclude_status and not status:
+                    # Negated text-matches skip tasks without a STATUS, so ask for those separately
+                    yield from self._iter_tasks_without_status(url, headers, exclude_status, completed_since,
+                                                               time_range, properties)
+                if not filtered:
+                    self.etags = etags
+            elif response.status_code == 401:
+                response.close()
+                raise AuthenticationError(f"Server rejected the credentials for {url}")
+            elif filtered:
+                response.close()
+                self.logger.info(f"Filtered calendar-query failed ({response.status_code}), filtering locally")
+                tasks = self.iter_tasks(properties=filter_properties(properties, *filters))
+                yield from (task for task in tasks if task_matches(task, *filters))
+            elif response.status_code in (400, 404):
+                response.close()
                 # Fall back to PROPFIND which is more widely supported
-                return self._fetch_tasks_propfind()
+                self.logger.info(f"calendar-query failed ({response.status_code}), falling back to PROPFIND")
+                tasks = self._fetch_tasks_propfind(properties)
+                if tasks is None:
+                    raise FetchError(f"Could not list the tasks of {url}")
+                yield from tasks
             else:
+                response.close()
                 self.logger.error(f"Failed to fetch tasks: {response.status_code}")
-                if response.status_code == 404:
-                    self.logger.info("Falling back to PROPFIND method")
-                    return self._fetch_tasks_propfind()
-                return []
+                raise FetchError(f"Server answered {response.status_code} for {url}")
                 
         except RequestException as e:
             self.logger.error(f"Error fetching tasks: {e}")
-            return []
+            raise FetchError(f"Error fetching tasks: {e}") from e
+        except ET.ParseError as e:
+            self.logger.error(f"XML parse error: {e}")
+            raise FetchError(f"XML parse error: {e}") from e
     
-    def _fetch_tasks_propfind(self):
-        """Alternative method to fetch tasks using PROPFIND"""
+    def _iter_tasks_without_status(self, url, headers, exclude_status, completed_since, time_range, properties):
+        """The is-not-defined half of an exclude_status fetch, see iter_tasks()
+        
+        A server that rejects is-not-defined gets the query without it, and
+        the tasks without a STATUS are picked here instead.
+        """
+        response = self._make_request(
+            'REPORT',
+            url,
+            data=build_calendar_query(None, (), completed_since, time_range, properties, status_undefined=True),
+            headers=headers,
+            timeout=(5, 15),
+            stream=True
+        )
+        if response.status_code == 401:
+            response.close()
+            raise AuthenticationError(f"Server rejected the credentials for {url}")
+        if response.status_code != 207:
+            response.close()
+            self.logger.info(f"is-not-defined query failed ({response.status_code}), filtering locally")
+            tasks = self.iter_tasks(completed_since=completed_since, time_range=time_range,
+                                    properties=filter_properties(properties, exclude_status=exclude_status))
+            yield from (task for task in tasks if not task.get('status'))
+            return
+        yield from self._iter_response_tasks(response, properties)
+    
+    def _fetch_tasks_propfind(self, properties=None):
+        """Alternative method to fetch tasks using PROPFIND and calendar-multiget, None on failure"""
         try:
             # Use PROPFIND to list all .ics files
             url = f"{self.server_url}{self.todo_list_path}"
@@ -154,18 +660,10 @@ class DavClient:
                 'Depth': '1'
             }
             
-            propfind_body = """<?xml version="1.0" encoding="utf-8" ?>
-<d:propfind xmlns:d="DAV:">
-    <d:prop>
-        <d:resourcetype/>
-        <d:getcontenttype/>
-    </d:prop>
-</d:propfind>"""
-            
             response = self._make_request(
                 'PROPFIND',
                 url,
-                data=propfind_body,
+                data=PROPFIND_RESOURCES,
                 headers=headers,
                 timeout=(5, 15)
             )
@@ -173,39 +671,69 @@ class DavClient:
             self.logger.info(f"PROPFIND response: {response.status_code}")
             
             if response.status_code == 207:
-                tasks = []
-                root = ET.fromstring(response.text)
-                
-                ns = {'d': 'DAV:'}
-                
-                for response_elem in root.findall('.//d:response', ns):
-                    href = response_elem.find('./d:href', ns)
-                    if href is not None and href.text and href.text.endswith('.ics'):
-                        # Only fetch .ics files
-                        task = self._fetch_individual_task(href.text)
-                        if task:
-                            tasks.append(task)
-                
+                tasks = self._fetch_tasks_by_href(self._parse_ics_hrefs(response.text), properties)
+                self.etags = {task['href']: task.get('etag') for task in tasks}
                 return tasks
             else:
                 self.logger.error(f"PROPFIND failed: {response.status_code}")
-                return []
+                return None
                 
         except RequestException as e:
             self.logger.error(f"Error in PROPFIND: {e}")
-            return []
+            return None
+        except FetchError as e:
+            self.logger.error(f"Error fetching tasks by href: {e}")
+            return None
+    
+    def _fetch_tasks_multiget(self, hrefs, properties=None):
+        """Fetch several tasks with a single calendar-multiget REPORT
+        
+        Returns None when the server does not support calendar-multiget and
+        raises FetchError when the chunk could not be fetched.
+        """
+        url = f"{self.server_url}{self.todo_list_path}"
+        self.logger.info(f"Fetching {len(hrefs)} tasks with calendar-multiget")
+        
+        try:
+            response = self._make_request(
+                'REPORT',
+                url,
+                data=self._build_multiget(hrefs, properties),
+                headers={**self.headers, 'Depth': '1'},
+                timeout=(5, 15),
+                stream=True
+            )
             
+            if response.status_code == 207:
+                self.multiget_supported = True
+                return list(self._iter_response_tasks(response, properties))
+        except RequestException as e:
+            self.logger.error(f"Error in calendar-multiget: {e}")
+            raise FetchError(f"Error in calendar-multiget: {e}") from e
+        except ET.ParseError as e:
+            self.logger.error(f"XML parse error: {e}")
+            raise FetchError(f"XML parse error: {e}") from e
+        
+        response.close()
+        if response.status_code in UNSUPPORTED_REPORT_STATUSES and not self.multiget_supported:
+            self.logger.info(f"calendar-multiget not supported ({response.status_code}), using individual GETs")
+            self.multiget_supported = False
+            return None
+        
+        self.logger.error(f"calendar-multiget failed: {response.status_code}")
+        raise FetchError(f"Server answered {response.status_code} to calendar-multiget")
+            
+    def fetch_task(self, href):
+        """Fetch the complete task stored at href, e.g. to fill in a partial one
+        
+        Returns None when it cannot be read.
+        """
+        return self._fetch_individual_task(href)
+    
     def _fetch_individual_task(self, href):
         """Fetch an individual task by its href"""
         try:
-            # Normalize href
-            if href.startswith(self.server_url):
-                full_url = href
-            elif href.startswith('/'):
-                full_url = f"{self.server_url}{href}"
-            else:
-                full_url = f"{self.server_url}/{href}"
-                
+            full_url = self._full_url(href)
             self.logger.info(f"Fetching individual task: {full_url}")
             
             response = self._make_request(
@@ -215,184 +743,494 @@ class DavClient:
             )
             
             if response.status_code == 200:
-                ical_data = response.text
-                if 'BEGIN:VTODO' in ical_data:
-                    todo_data = self._parse_ical(ical_data)
-                    if todo_data:
-                        todo_data['href'] = href
-                        return todo_data
+                return self._parse_individual_task(href, response.text, response.headers.get('ETag'))
             return None
         except RequestException as e:
             self.logger.error(f"Error fetching individual task: {e}")
             return None
     
-    def _parse_tasks(self, xml_response):
-        """Parse the XML response and extract todo items"""
+    def _fetch_tasks_by_href(self, hrefs, properties=None):
+        """Fetch the tasks stored at the given hrefs
+        
+        Batches the hrefs into calendar-multiget REPORTs of multiget_chunk_size
+        and only falls back to one GET per href for servers without multiget.
+        The GETs always return complete tasks, whatever properties asks for.
+        Raises FetchError when a multiget chunk fails, rather than returning
+        the tasks of the other chunks as if they were all.
+        """
         tasks = []
-        try:
-            root = ET.fromstring(xml_response)
+        for start in range(0, len(hrefs), self.multiget_chunk_size):
+            chunk = hrefs[start:start + self.multiget_chunk_size]
             
-            # CalDAV namespaces
-            ns = {
-                'd': 'DAV:',
-                'c': 'urn:ietf:params:xml:ns:caldav',
-            }
+            chunk_tasks = None
+            if self.multiget_supported is not False:
+                chunk_tasks = self._fetch_tasks_multiget(chunk, properties)
+            if chunk_tasks is None:
+                chunk_tasks = [task for task in self._map_concurrent(self._fetch_individual_task, chunk) if task]
             
-            for response_elem in root.findall('.//d:response', ns):
-                href_elem = response_elem.find('./d:href', ns)
-                if href_elem is None:
-                    continue
+            tasks.extend(chunk_tasks)
+        return tasks
+    
+    def _map_concurrent(self, func, items):
+        """Apply func to every item on up to max_workers threads, preserving order"""
+        items = list(items)
+        workers = min(self.max_workers, len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+    
+    def _iter_multistatus(self, response, trailer=None):
+        """Incrementally parse a streamed multistatus body, yielding each <d:response>
+        
+        Every response element is dropped from the tree once the caller is done
+        with it, so neither the raw body nor the full tree is ever held in
+        memory. Other top-level elements (such as sync-token) are stored by tag
+        in the trailer dict when one is given.
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        root = None
+        depth = 0
+        size = 0
+        try:
+            # iter_content() undoes any gzip/deflate coding chunk by chunk
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                parser.feed(chunk)
+                for event, elem in parser.read_events():
+                    if event == 'start':
+                        if root is None:
+                            root = elem
+                        depth += 1
+                        continue
                     
-                href = href_elem.text
-                calendar_data = response_elem.find('.//c:calendar-data', ns)
-                
-                if calendar_data is not None and calendar_data.text and 'VTODO' in calendar_data.text:
-                    # Parse iCalendar data to extract todo information
-                    todo_data = self._parse_ical(calendar_data.text)
-                    if todo_data:
-                        todo_data['href'] = href
-                        tasks.append(todo_data)
-        except ET.ParseError as e:
-            self.logger.error(f"XML parse error: {e}")
+                    depth -= 1
+                    if depth != 1:
+                        continue
+                    if elem.tag == '{DAV:}response':
+                        yield elem
+                    elif trailer is not None:
+                        trailer[elem.tag] = elem.text
+                    root.remove(elem)
+            parser.close()
+        finally:
+            self._record_received(response, size)
+            response.close()
+    
+    def _iter_response_tasks(self, response, properties=None):
+        """Yield the tasks of a streamed calendar-query or calendar-multiget response"""
+        for response_elem in self._iter_multistatus(response):
+            todo_data = self._parse_response_task(response_elem, properties)
+            if todo_data:
+                yield todo_data
+    
+    def sync_tasks(self, sync_token=None, properties=None):
+        """Fetch only what changed since sync_token using an RFC 6578 sync-collection REPORT
+        
+        Uses the token from the previous call when sync_token is None. Returns a
+        dict with 'added' and 'changed' task lists, 'removed' hrefs, the new
+        'sync_token' and 'full', which is True when every task was re-fetched.
+        Falls back to fetch_tasks() when the server lacks sync-collection.
+        A result the server truncated (507 on the collection) is completed
+        with further requests from the token it returned.
+        properties asks for partial tasks, as in iter_tasks().
+        Raises AuthenticationError when the server rejects the credentials.
+        """
+        if sync_token is None:
+            sync_token = self.sync_token
+        
+        url = f"{self.server_url}{self.todo_list_path}"
+        self.logger.info(f"Syncing tasks from: {url}")
+        
+        try:
+            response = self._request_sync_collection(url, sync_token, properties)
+        except RequestException as e:
+            self.logger.error(f"Error syncing tasks: {e}")
+            self.collection_state = None
+            return None
+        
+        if response.status_code == 401:
+            response.close()
+            self.collection_state = None
+            raise AuthenticationError(f"Server rejected the credentials for {url}")
+        
+        if response.status_code == 207:
+            try:
+                result = self._read_sync_responses(url, response, properties)
+            except (RequestException, ET.ParseError) as e:
+                self.logger.error(f"XML parse error: {e}")
+                self.collection_state = None
+                return None
+            if result is None:
+                self.collection_state = None
+                return None
+            return self._apply_sync_result(*result, full=not sync_token)
+        
+        if sync_token and 'valid-sync-token' in response.text:
+            # The server expired our token, start over with an initial sync
+            self.logger.info("Sync token rejected by server, performing initial sync")
+            self.sync_token = None
+            return self.sync_tasks('', properties)
+        
+        if response.status_code in UNSUPPORTED_REPORT_STATUSES:
+            self.sync_token = None
+            if self.etags:
+                self.logger.info(f"sync-collection not supported ({response.status_code}), comparing ETags")
+                return self._sync_by_etags(properties)
             
-        return tasks
+            self.logger.info(f"sync-collection not supported ({response.status_code}), falling back to calendar-query")
+            previous = dict(self.etags)
+            tasks = self.fetch_tasks(properties=properties)
+            if tasks is None:
+                # A partial listing would report every missing task as removed
+                self.collection_state = None
+                return None
+            self.etags = {task['href']: task.get('etag') for task in tasks}
+            removed = [href for href in previous if href not in self.etags]
+            return self._split_sync_result(tasks, removed, previous, None, full=True)
+        
+        self.logger.error(f"Failed to sync tasks: {response.status_code}")
+        self.collection_state = None
+        return None
+    
+    def _request_sync_collection(self, url, sync_token, properties=None):
+        """Send a streamed sync-collection REPORT starting from sync_token"""
+        token_elem = f"<d:sync-token>{xml_escape(sync_token)}</d:sync-token>" if sync_token else "<d:sync-token />"
+        sync_collection = f"""<?xml version="1.0" encoding="utf-8" ?>
+<d:sync-collection xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+    {token_elem}
+    <d:sync-level>1</d:sync-level>
+    <d:prop>
+        <d:getetag />
+        {calendar_data_prop(properties)}
+    </d:prop>
+</d:sync-collection>"""
+        
+        return self._make_request(
+            'REPORT',
+            url,
+            data=sync_collection,
+            headers={**self.headers, 'Depth': '0'},
+            timeout=(5, 15),
+            stream=True
+        )
+    
+    def _read_sync_responses(self, url, response, properties=None):
+        """Read a sync-collection result into (changed tasks, removed hrefs, new token)
+        
+        While the server reports the result as truncated (RFC 6578 section
+        3.6), the rest is requested from the token it returned and merged
+        in, so an initial sync always sees every member. Returns None when a
+        follow-up request fails.
+        """
+        changed = {}
+        removed = {}
+        while True:
+            page_changed, page_removed, new_token, truncated = self._parse_sync_response(response, properties)
+            for task in page_changed:
+                removed.pop(task['href'], None)
+                changed[task['href']] = task
+            for href in page_removed:
+                changed.pop(href, None)
+                removed[href] = None
+            if not truncated:
+                return list(changed.values()), list(removed), new_token
+            
+            if not new_token:
+                self.logger.error("Truncated sync-collection result without a sync token")
+                return None
+            self.logger.info("sync-collection result truncated, requesting the rest")
+            response = self._request_sync_collection(url, new_token, properties)
+            if response.status_code != 207:
+                response.close()
+                self.logger.error(f"Failed to continue a truncated sync: {response.status_code}")
+                return None
+    
+    def _sync_by_etags(self, properties=None):
+        """Incremental sync for servers without sync-collection
+        
+        Lists the current ETags and re-fetches only the resources whose ETag
+        differs from the one recorded at the previous sync.
+        """
+        remote = self.fetch_etags()
+        if remote is None:
+            self.collection_state = None
+            return None
+        
+        previous = dict(self.etags)
+        stale = [href for href, etag in remote.items() if etag is None or previous.get(href) != etag]
+        removed = [href for href in previous if href not in remote]
+        try:
+            tasks = self._fetch_tasks_by_href(stale, properties)
+        except FetchError:
+            self.collection_state = None
+            return None
+        
+        fetched = set()
+        for task in tasks:
+            task.setdefault('etag', remote.get(task['href']))
+            fetched.add(task['href'])
+        
+        # Forget the ETags of resources we could not fetch so they are retried next time
+        self.etags = {href: etag for href, etag in remote.items() if href not in stale or href in fetched}
+        return self._split_sync_result(tasks, removed, previous, None, full=False)
     
-    def _parse_ical(self, ical_data):
-        """Simple parser for iCalendar todo items"""
-        lines = ical_data.splitlines()
-        todo = {}
-        in_vtodo = False
+    def _parse_sync_response(self, response, properties=None):
+        """Parse a streamed sync-collection multistatus
+        
+        Returns (changed tasks, removed hrefs, new token, truncated), where
+        truncated tells whether the server cut the result short with a 507
+        on the collection itself.
+        """
+        trailer = {}
+        collection_url = f"{self.server_url}{self.todo_list_path}".rstrip('/')
         
-        for line in lines:
-            if line == 'BEGIN:VTODO':
-                in_vtodo = True
+        changed = []
+        removed = []
+        truncated = False
+        for response_elem in self._iter_multistatus(response, trailer):
+            href_elem = response_elem.find('{DAV:}href')
+            if href_elem is None or not href_elem.text:
                 continue
-            elif line == 'END:VTODO':
-                in_vtodo = False
+            
+            # Deleted members carry a bare 404 status instead of a propstat
+            status_elem = response_elem.find('{DAV:}status')
+            status = status_elem.text if status_elem is not None and status_elem.text else ''
+            if ' 507' in status and self._full_url(href_elem.text).rstrip('/') == collection_url:
+                truncated = True
+                continue
+            if ' 404' in status:
+                removed.append(href_elem.text)
                 continue
             
-            if in_vtodo and ':' in line:
-                key, value = line.split(':', 1)
-                if key == 'SUMMARY':
-                    todo['title'] = value
-                elif key == 'DESCRIPTION':
-                    todo['description'] = value
-                elif key == 'STATUS':
-                    todo['status'] = value.lower()
-                elif key == 'UID':
-                    todo['uid'] = value
-        
-        return todo
-    
-    def add_task(self, title, description='', status='NEEDS-ACTION'):
-        """Add a new task to the CalDAV server"""
-        uid = str(uuid.uuid4())
-        now = datetime.now().strftime('%Y%m%dT%H%M%SZ')
+            todo_data = self._parse_response_task(response_elem, properties)
+            if todo_data:
+                changed.append(todo_data)
         
-        ical_data = f"""BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:-//Linux-DAV-Todo//EN
-BEGIN:VTODO
-UID:{uid}
-DTSTAMP:{now}
-CREATED:{now}
-LAST-MODIFIED:{now}
-SUMMARY:{title}
-DESCRIPTION:{description}
-STATUS:{status}
-END:VTODO
-END:VCALENDAR
-"""
+        return changed, removed, trailer.get('{DAV:}sync-token'), truncated
+    
+    def _apply_sync_result(self, changed, removed, new_token, full):
+        """Update the tracked ETags and sync token from a sync-collection result"""
+        previous = dict(self.etags)
+        if full:
+            # An initial sync lists every member, anything else is gone
+            seen = {task['href'] for task in changed}
+            removed = list(removed) + [href for href in previous if href not in seen]
+            self.etags = {}
+        
+        for href in removed:
+            self.etags.pop(href, None)
+            self.ical_cache.pop(href, None)
+        for task in changed:
+            self.etags[task['href']] = task.get('etag')
+        
+        self.sync_token = new_token
+        return self._split_sync_result(changed, removed, previous, new_token, full)
+    
+    def _split_sync_result(self, tasks, removed, previous, new_token, full):
+        """Build the sync_tasks() result, separating new hrefs from modified ones"""
+        return {
+            'added': [task for task in tasks if task['href'] not in previous],
+            'changed': [task for task in tasks if task['href'] in previous],
+            'removed': removed,
+            'sync_token': new_token,
+            'full': full,
+        }
+    
+    def add_task(self, title, description='', status='NEEDS-ACTION', uid=None):
+        """Add a new task to the CalDAV server
+        
+        A caller-chosen uid makes the task's href known up front. With one,
+        an existing resource at that href raises ConflictError.
+        """
+        result = self._add_one({'title': title, 'description': description, 'status': status, 'uid': uid})
+        if result['conflict'] and uid is not None:
+            raise ConflictError(result['href'])
+        return result['ok']
+    
+    def add_tasks(self, tasks, progress=None):
+        """Add many tasks, with up to max_workers PUTs in flight at once
+        
+        tasks holds dicts with a 'title' and optionally 'description',
+        'status' and 'uid'. Returns a result dict per task, in order (see
+        _run_batch); a clash with an existing resource sets 'conflict'.
+        """
+        return self._run_batch(self._add_one, tasks, progress)
+    
+    def _add_one(self, task):
+        uid = task.get('uid') or str(uuid.uuid4())
+        href = f"{self.todo_list_path}{uid}.ics"
+        ical_data = self._build_vtodo(
+            uid, task['title'], task.get('description') or '', task.get('status') or 'NEEDS-ACTION'
+        )
         
         try:
             response = self._make_request(
                 'PUT',
-                f"{self.server_url}{self.todo_list_path}{uid}.ics",
+                f"{self.server_url}{href}",
                 data=ical_data,
-                headers={'Content-Type': 'text/calendar; charset=utf-8'},
+                headers={'Content-Type': 'text/calendar; charset=utf-8', 'If-None-Match': '*'},
                 timeout=(5, 15)
             )
-            
-            return response.status_code in (201, 204)  # Created or No Content
         except RequestException as e:
             logging.error(f"Error adding task: {e}")
-            return False
+            return self._task_result(href, error=str(e))
+        
+        ok = response.status_code in (201, 204)  # Created or No Content
+        if ok:
+            self._remember_ical(href, response.headers.get('ETag'), ical_data)
+        return self._task_result(href, response, ok)
     
-    def update_task(self, href, title=None, description=None, status=None):
-        """Update an existing task on the CalDAV server"""
-        # First get the current task data
+    def update_task(self, href, title=None, description=None, status=None, etag=None):
+        """Update an existing task on the CalDAV server
+        
+        Edits the body seen at the last fetch and PUTs it with If-Match, so an
+        update normally costs one request. The task is only re-read when the
+        server reports it changed in the meantime (412 Precondition Failed).
+        
+        Passing the etag the change was made against instead raises
+        ConflictError when the server copy no longer has it.
+        """
+        result = self._update_one(
+            {'href': href, 'title': title, 'description': description, 'status': status, 'etag': etag}
+        )
+        if result['conflict'] and etag is not None:
+            raise ConflictError(href)
+        return result['ok']
+    
+    def update_tasks(self, updates, progress=None):
+        """Update many tasks, with up to max_workers requests in flight at once
+        
+        updates holds dicts with an 'href' and any of 'title', 'description',
+        'status' and 'etag', which mean the same as for update_task(). Returns
+        a result dict per update, in order (see _run_batch).
+        """
+        return self._run_batch(self._update_one, updates, progress)
+    
+    def _update_one(self, update):
+        href = update['href']
+        etag = update.get('etag')
+        changes = (update.get('title'), update.get('description'), update.get('status'))
+        
         try:
-            response = self._make_request(
-                'GET',
-                f"{self.server_url}{href}",
-                headers=self.headers,
-                timeout=(5, 15)
-            )
-            
-            if response.status_code != 200:
-                return False
-                
-            # Simple update of the iCalendar data
-            ical_data = response.text
-            if title:
-                ical_data = self._replace_ical_property(ical_data, 'SUMMARY', title)
-            if description:
-                ical_data = self._replace_ical_property(ical_data, 'DESCRIPTION', description)
-            if status:
-                ical_data = self._replace_ical_property(ical_data, 'STATUS', status.upper())
-                
-            # Update the last modified timestamp
-            now = datetime.now().strftime('%Y%m%dT%H%M%SZ')
-            ical_data = self._replace_ical_property(ical_data, 'LAST-MODIFIED', now)
+            current = self.ical_cache.get(href)
+            if current is None or (etag is not None and current[0] != etag):
+                current = self._get_task_resource(href)
+                if current is None:
+                    return self._task_result(href, error="could not read the task")
+                if etag is not None and current[0] != etag:
+                    return self._task_result(href, conflict=True)
             
-            # Send the update to the server
-            update_response = self._make_request(
-                'PUT',
-                f"{self.server_url}{href}",
-                data=ical_data,
-                headers={'Content-Type': 'text/calendar; charset=utf-8'},
-                timeout=(5, 15)
-            )
-            
-            return update_response.status_code == 204  # No Content
+            update_response = self._put_task_changes(href, current, *changes)
+            if update_response.status_code == 412 and etag is None:
+                self.logger.info(f"Task changed on the server, re-reading before update: {href}")
+                current = self._get_task_resource(href)
+                if current is None:
+                    return self._task_result(href, error="could not read the task")
+                update_response = self._put_task_changes(href, current, *changes)
         except RequestException as e:
             logging.error(f"Error updating task: {e}")
-            return False
+            return self._task_result(href, error=str(e))
+        
+        return self._task_result(href, update_response, update_response.status_code in (200, 201, 204))
+    
+    def _get_task_resource(self, href):
+        """GET the current (ETag, iCalendar body) of a task"""
+        response = self._make_request(
+            'GET',
+            f"{self.server_url}{href}",
+            headers=self.headers,
+            timeout=(5, 15)
+        )
+        
+        if response.status_code != 200:
+            self.logger.error(f"Failed to read task {href}: {response.status_code}")
+            return None
+        return response.headers.get('ETag'), response.text
+    
+    def _put_task_changes(self, href, current, title, description, status):
+        """PUT the changed task, conditional on the ETag it was read with"""
+        etag, ical_data = current
+        ical_data = self._apply_task_changes(ical_data, title, description, status)
+        
+        headers = {'Content-Type': 'text/calendar; charset=utf-8'}
+        if etag:
+            headers['If-Match'] = etag
+        
+        response = self._make_request(
+            'PUT',
+            f"{self.server_url}{href}",
+            data=ical_data,
+            headers=headers,
+            timeout=(5, 15)
+        )
+        
+        self._record_put(href, response, ical_data)
+        return response
+    
+    def delete_task(self, href, etag=None):
+        """Delete a task from the CalDAV server
+        
+        With an etag the delete is conditional, and ConflictError is raised
+        when the task changed on the server since that version.
+        """
+        result = self._delete_one({'href': href, 'etag': etag})
+        if result['conflict'] and etag is not None:
+            raise ConflictError(href)
+        return result['ok']
+    
+    def delete_tasks(self, hrefs, progress=None):
+        """Delete many tasks, with up to max_workers DELETEs in flight at once
+        
+        hrefs holds hrefs, or dicts with an 'href' and an 'etag' to make that
+        delete conditional. Returns a result dict per task, in order (see
+        _run_batch).
+        """
+        items = [{'href': item} if isinstance(item, str) else item for item in hrefs]
+        return self._run_batch(self._delete_one, items, progress)
     
-    def delete_task(self, href):
-        """Delete a task from the CalDAV server"""
+    def _delete_one(self, item):
+        href = item['href']
+        etag = item.get('etag')
         try:
             url = f"{self.server_url}{href}"
             self.logger.info(f"Deleting task at: {url}")
             
+            headers = self.headers
+            if etag is not None:
+                headers = {**self.headers, 'If-Match': etag}
+            
             response = self._make_request(
                 'DELETE',
                 url,
-                headers=self.headers,
+                headers=headers,
                 timeout=(5, 15)
             )
-            
-            success = response.status_code == 204  # No Content
-            if success:
-                self.logger.info(f"Task deleted successfully: {href}")
-            else:
-                self.logger.error(f"Failed to delete task: {response.status_code}")
-                
-            return success
-            
         except RequestException as e:
             self.logger.error(f"Error deleting task: {e}")
-            return False
+            return self._task_result(href, error=str(e))
+        
+        return self._task_result(href, response, self._record_delete(href, response))
     
-    def _replace_ical_property(self, ical_data, property_name, new_value):
-        """Replace a property in iCalendar data"""
-        lines = ical_data.splitlines()
-        result = []
+    def _run_batch(self, func, items, progress=None):
+        """Apply a single-item write to every item, with up to max_workers in flight
         
-        for line in lines:
-            if line.startswith(f"{property_name}:"):
-                result.append(f"{property_name}:{new_value}")
-            else:
-                result.append(line)
-                
-        return '\n'.join(result)
\ No newline at end of file
+        The workers share the session's pool, so each keeps one connection
+        alive. Returns func's result dict for every item, in input order:
+        'href', 'ok', the HTTP 'status' (None without a response), the new
+        'etag', 'conflict' and an 'error' message. progress(done, total,
+        result) is called on the calling thread as each item completes.
+        """
+        items = list(items)
+        results = [None] * len(items)
+        if not items:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            futures = {executor.submit(func, item): index for index, item in enumerate(items)}
+            for done, future in enumerate(as_completed(futures), 1):
+                result = results[futures[future]] = future.result()
+                if progress is not None:
+                    progress(done, len(items), result)
+        return results
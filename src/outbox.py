@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import os
+import sys
+import uuid
+
+src_path = os.path.dirname(os.path.abspath(__file__))
+if (src_path not in sys.path):
+    sys.path.insert(0, src_path)
+
+from dav_client import ConflictError
+
+
+class Outbox:
+    """Write-ahead journal for task writes
+
+    add_task/update_task/delete_task apply the change to the TaskCache and
+    journal it in the same transaction, without touching the network. replay()
+    later sends the journal to the server in order. Updates and deletes are
+    conditional on the ETag the change was made against, so a task edited on
+    the server in the meantime is reported as a conflict and the server copy
+    wins rather than being overwritten.
+    """
+
+    # A write the server keeps rejecting is dropped after this many replays
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, task_cache, dav_client):
+        self.task_cache = task_cache
+        self.dav_client = dav_client
+        self.logger = logging.getLogger(__name__)
+
+    def pending_count(self):
+        return self.task_cache.count_mutations()
+
+    def add_task(self, title, description='', status='NEEDS-ACTION'):
+        """Journal a new task and return its task dict"""
+        uid = str(uuid.uuid4())
+        href = f"{self.dav_client.todo_list_path}{uid}.ics"
+        task = {
+            'uid': uid,
+            'title': title,
+            'description': description,
+            'status': status.lower(),
+            'href': href,
+            'etag': None,
+        }
+        fields = {'uid': uid, 'title': title, 'description': description, 'status': status}
+        self.task_cache.queue_mutation('add', href, None, fields, task)
+        return task
+
+    def update_task(self, href, title=None, description=None, status=None):
+        """Journal a change to a task and return the updated task dict, or None if it is unknown"""
+        task = self.task_cache.get_task_by_href(href)
+        if task is None:
+            return None
+
+        fields = {}
+        if title is not None:
+            task['title'] = fields['title'] = title
+        if description is not None:
+            task['description'] = fields['description'] = description
+        if status is not None:
+            fields['status'] = status
+            task['status'] = status.lower()
+
+        self.task_cache.queue_mutation('update', href, task.get('etag'), fields, task)
+        return task
+
+    def delete_task(self, href):
+        """Journal the deletion of a task"""
+        task = self.task_cache.get_task_by_href(href)
+        etag = task.get('etag') if task else None
+        self.task_cache.queue_mutation('delete', href, etag, {})
+
+    def replay(self):
+        """Send journaled writes to the server in order
+
+        Stops at the first write that fails so later ones stay ordered behind
+        it. Returns a dict with the number of 'applied' writes, the hrefs of
+        'conflicts' (dropped, the server copy wins) and 'failed' writes
+        (dropped after MAX_ATTEMPTS), and how many are still 'pending'.
+        """
+        result = {'applied': 0, 'conflicts': [], 'failed': [], 'pending': 0}
+        mutations = self.task_cache.load_mutations()
+        if not mutations:
+            return result
+
+        if not self.dav_client.authenticate():
+            self.logger.info(f"Server unreachable, {len(mutations)} writes left in the outbox")
+            result['pending'] = len(mutations)
+            return result
+
+        for index, mutation in enumerate(mutations):
+            # Re-read the write as it is now; later edits may have been merged into it
+            mutation = self.task_cache.claim_mutation(mutation['id'])
+            if mutation is None:
+                continue
+            href = mutation['href']
+            try:
+                applied = self._send(mutation)
+            except ConflictError:
+                if mutation['action'] == 'add':
+                    # Our uid is unique, so an earlier replay already created it
+                    applied = True
+                else:
+                    self.logger.warning(f"Dropping offline {mutation['action']} of {href}: changed on the server")
+                    self.task_cache.remove_mutation(mutation['id'])
+                    result['conflicts'].append(href)
+                    continue
+
+            if applied:
+                if mutation['action'] == 'delete':
+                    self.task_cache.remove_mutation(mutation['id'])
+                else:
+                    current = self.dav_client.ical_cache.get(href)
+                    self.task_cache.complete_mutation(mutation['id'], href, current[0] if current else None)
+                    if current:
+                        self.task_cache.store_bodies({href: current})
+                result['applied'] += 1
+                continue
+
+            if not self.dav_client.authenticate(force=True):
+                # Lost the connection, which is not the write's fault
+                self.task_cache.release_mutation(mutation['id'])
+                result['pending'] = len(mutations) - index
+                break
+
+            attempts = self.task_cache.record_attempt(mutation['id'])
+            if attempts is None:
+                # Removed while it was being sent, so there is nothing left to retry
+                continue
+            if attempts >= self.MAX_ATTEMPTS:
+                self.logger.error(f"Dropping offline {mutation['action']} of {href} after {self.MAX_ATTEMPTS} attempts")
+                self.task_cache.remove_mutation(mutation['id'])
+                result['failed'].append(href)
+                continue
+
+            result['pending'] = len(mutations) - index
+            break
+
+        return result
+
+    def _send(self, mutation):
+        fields = mutation['fields']
+        if mutation['action'] == 'add':
+            return self.dav_client.add_task(
+                fields['title'], fields.get('description', ''), fields.get('status', 'NEEDS-ACTION'), uid=fields['uid']
+            )
+        if mutation['action'] == 'update':
+            # A body kept by an earlier session spares the GET before the PUT
+            if mutation['href'] not in self.dav_client.ical_cache:
+                body = self.task_cache.get_body(mutation['href'])
+                if body is not None and body[0] == mutation['etag']:
+                    self.dav_client.ical_cache[mutation['href']] = body
+            return self.dav_client.update_task(
+                mutation['href'], fields.get('title'), fields.get('description'), fields.get('status'),
+                etag=mutation['etag']
+            )
+        return self.dav_client.delete_task(mutation['href'], etag=mutation['etag'])
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import fcntl
+import hashlib
+import logging
+import os
+import sys
+import threading
+
+src_path = os.path.dirname(os.path.abspath(__file__))
+if (src_path not in sys.path):
+    sys.path.insert(0, src_path)
+
+from dav_client import AuthenticationError
+from utils.cache import TaskCache
+
+
+class SyncLock:
+    """Exclusive lock on a collection, held across processes with flock(2)
+
+    The GUI, the sync daemon and scripts all keep the same cache, so only one
+    of them talks to the server for a collection at a time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.thread_lock = threading.Lock()
+        self.file = None
+
+    @staticmethod
+    def for_collection(collection):
+        digest = hashlib.sha1(collection.encode('utf-8')).hexdigest()[:16]
+        return SyncLock(os.path.join(TaskCache.get_data_dir(), f'sync-{digest}.lock'))
+
+    def acquire(self, blocking=True):
+        """Take the lock, or return False at once when blocking is False and it is held"""
+        if not self.thread_lock.acquire(blocking):
+            return False
+        lock_file = open(self.path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            self.thread_lock.release()
+            if blocking:
+                raise
+            return False
+        self.file = lock_file
+        return True
+
+    def release(self):
+        fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+        self.file = None
+        self.thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class CollectionSync:
+    """Keeps a TaskCache in step with the server, one refresh at a time
+
+    Refreshes are single-flight across processes: a caller that finds one
+    already running waits for it and takes the result from the cache rather
+    than asking the server again. When another process moved the cache on
+    since this one last looked, the client continues from the cached sync
+    state and the result lists every cached task, so the caller can catch up.
+    """
+
+    def __init__(self, dav_client, task_cache, outbox, properties=None, lock=None):
+        self.dav_client = dav_client
+        self.task_cache = task_cache
+        self.outbox = outbox
+        self.properties = properties
+        self.lock = lock or SyncLock.for_collection(task_cache.collection)
+        self.logger = logging.getLogger(__name__)
+
+        # The cached sync state the caller's view of the tasks corresponds to
+        self.seen_state = task_cache.load_state()
+        task_cache.restore_client(dav_client)
+
+    def refresh(self, check_changed=True, cancelled=None):
+        """Replay the outbox, then sync the collection into the cache
+
+        check_changed=False skips the getctag check and always syncs.
+        Returns a dict whose 'state' is 'synced' (with the 'changes' to
+        apply), 'unchanged', 'pending' (with the outbox 'replay'),
+        'auth_failed', 'failed' or 'cancelled'.
+        """
+        cancelled = cancelled or (lambda: False)
+        shared = not self.lock.acquire(blocking=False)
+        if shared:
+            self.logger.info("Another refresh of the collection is running, waiting for it")
+            self.lock.acquire()
+        try:
+            return self._refresh(shared, check_changed, cancelled)
+        finally:
+            self.lock.release()
+
+    def replay_outbox(self):
+        """Outbox.replay() under the collection lock, so no write is sent twice"""
+        with self.lock:
+            return self.outbox.replay()
+
+    def load_full_task(self, href):
+        """Fetch the complete task at href and store it in place of its summary
+
+        Returns the stored task dict, or None when it cannot be read.
+        """
+        full = self.dav_client.fetch_task(href)
+        if full is None:
+            return None
+        # Fields known locally, including unsent edits, win over the server copy
+        task = {**full, **(self.task_cache.get_task_by_href(href) or {})}
+        task.pop('partial', None)
+        self.task_cache.store_task(task)
+        self._store_bodies([href])
+        return task
+
+    def _refresh(self, shared, check_changed, cancelled):
+        stale = self.task_cache.load_state() != self.seen_state
+        if stale:
+            self.task_cache.restore_client(self.dav_client)
+        if shared:
+            return self._cached_result() if stale else {'state': 'unchanged'}
+
+        if cancelled():
+            return {'state': 'cancelled'}
+
+        if self.outbox.pending_count():
+            replay = self.outbox.replay()
+            if replay['pending']:
+                return {'state': 'pending', 'replay': replay}
+
+        # No separate login check: the sync itself reports rejected credentials
+        try:
+            if cancelled():
+                return {'state': 'cancelled'}
+            seen_collection_state = self.dav_client.collection_state
+            if check_changed and not self.dav_client.has_collection_changed():
+                return self._cached_result() if stale else {'state': 'unchanged'}
+
+            if cancelled():
+                # The check already took in the new state; without this the
+                # next refresh would report unchanged and skip these changes
+                self.dav_client.collection_state = seen_collection_state
+                return {'state': 'cancelled'}
+            changes = self.dav_client.sync_tasks(properties=self.properties)
+        except AuthenticationError:
+            return {'state': 'auth_failed'}
+        if changes is None:
+            return {'state': 'failed'}
+
+        # The client's sync token has moved on, so the cache follows even if cancelled now
+        self.task_cache.apply_changes(changes, self.dav_client.collection_state)
+        self._store_bodies(task['href'] for task in changes['added'] + changes['changed'])
+        if stale:
+            return self._cached_result()
+        self.seen_state = self.task_cache.load_state()
+        return {'state': 'synced', 'changes': changes}
+
+    def _store_bodies(self, hrefs):
+        """Keep the bodies the client holds for hrefs, for conditional updates in later sessions"""
+        ical_cache = self.dav_client.ical_cache
+        self.task_cache.store_bodies({href: ical_cache[href] for href in hrefs if href in ical_cache})
+
+    def _cached_result(self):
+        self.seen_state = self.task_cache.load_state()
+        changes = {
+            'added': self.task_cache.load_tasks(), 'changed': [], 'removed': [],
+            'sync_token': self.dav_client.sync_token, 'full': True,
+        }
+        return {'state': 'synced', 'changes': changes}
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Headless mode: keep the local task cache in sync on an adaptive schedule
+
+Started with `linux-dav-todo --daemon`. It imports no GTK, sleeps between
+syncs and syncs at once on SIGUSR1 (systemctl reload). The GUI and scripts
+then read warm data from the shared cache.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+src_path = os.path.dirname(os.path.abspath(__file__))
+if (src_path not in sys.path):
+    sys.path.insert(0, src_path)
+
+from dav_client import DavClient
+from outbox import Outbox
+from sync import CollectionSync
+from utils.cache import TaskCache
+
+
+class SyncDaemon:
+    """Polls the server, quickly while tasks are changing and backing off while idle
+
+    After a sync that brought changes the next one follows min_interval
+    seconds later. Every quiet or failed sync multiplies the interval by
+    backoff, up to max_interval.
+    """
+
+    def __init__(self, collection_sync, min_interval=60, max_interval=1800, backoff=2.0):
+        self.collection_sync = collection_sync
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self.interval = min_interval
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.logger = logging.getLogger(__name__)
+
+    def run(self):
+        while not self.stopping:
+            result = self.sync_once()
+            self.interval = self.next_interval(result)
+            self.logger.info(f"Sync {result['state']}, next one in {self.interval:.0f}s")
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+
+    def sync_once(self):
+        try:
+            result = self.collection_sync.refresh()
+        except Exception as e:
+            self.logger.exception("Sync failed")
+            return {'state': 'error', 'error': str(e)}
+        return result
+
+    def next_interval(self, result):
+        changes = result.get('changes')
+        if changes and (changes['added'] or changes['changed'] or changes['removed']):
+            return self.min_interval
+        return min(self.interval * self.backoff, self.max_interval)
+
+    def sync_now(self):
+        """Cut the current wait short"""
+        self.wakeup.set()
+
+    def stop(self):
+        self.stopping = True
+        self.wakeup.set()
+
+
+def wait_for_credentials(get_credentials, interval, wakeup):
+    """Poll get_credentials every interval seconds, or when wakeup is set, until it returns some"""
+    while True:
+        wakeup.wait(interval)
+        wakeup.clear()
+        credentials = get_credentials()
+        if credentials:
+            return credentials
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='linux-dav-todo --daemon', description=__doc__.splitlines()[0])
+    parser.add_argument('--min-interval', type=float, default=60, help="seconds between syncs while tasks change")
+    parser.add_argument('--max-interval', type=float, default=1800, help="longest wait while nothing changes")
+    parser.add_argument('--once', action='store_true', help="sync once and exit")
+    args = parser.parse_args(argv)
+
+    from utils.credentials import CredentialsManager
+    credentials = CredentialsManager.get_credentials()
+    if not credentials and args.once:
+        logging.error("No stored credentials, log in with the GUI first")
+        return 1
+    if not credentials:
+        # Exiting would have the service manager restart the daemon into the same state
+        logging.warning("No stored credentials yet, waiting for a login with the GUI")
+        wakeup = threading.Event()
+        signal.signal(signal.SIGUSR1, lambda signum, frame: wakeup.set())
+        credentials = wait_for_credentials(CredentialsManager.get_credentials, args.min_interval, wakeup)
+
+    dav_client = DavClient(
+        credentials['server_url'],
+        credentials['username'],
+        credentials['password'],
+        credentials['todo_list_path'],
+        credentials.get('auth_path')
+    )
+    task_cache = TaskCache(TaskCache.collection_key(
+        dav_client.server_url, dav_client.username, dav_client.todo_list_path
+    ))
+    collection_sync = CollectionSync(dav_client, task_cache, Outbox(task_cache, dav_client))
+    daemon = SyncDaemon(collection_sync, args.min_interval, args.max_interval)
+
+    if args.once:
+        result = daemon.sync_once()
+        return 0 if result['state'] in ('synced', 'unchanged') else 1
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGINT, lambda signum, frame: daemon.stop())
+    signal.signal(signal.SIGUSR1, lambda signum, frame: daemon.sync_now())
+
+    logging.info(f"Sync daemon started for {task_cache.collection}")
+    daemon.run()
+    task_cache.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,13 +17,38 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import sys
+
+# Canonical (upper-case, interned) form of every status spelling seen so far,
+# so 100k tasks share a handful of status strings
+_STATUSES = {}
+
+
+def _canonical_status(status):
+    canonical = _STATUSES.get(status)
+    if canonical is None:
+        canonical = _STATUSES[status] = sys.intern(status.upper())
+    return canonical
+
+
 class Todo:
-    def __init__(self, uid=None, title="", description="", status="NEEDS-ACTION", href=None):
+    """A task as shown in the UI
+
+    Slotted to keep large lists small. The status is stored in its
+    canonical form with the completion flag worked out once, when it is set.
+    """
+    __slots__ = ('uid', 'title', 'description', '_status', '_completed', 'href', 'etag', 'partial')
+
+    def __init__(self, uid=None, title="", description="", status="NEEDS-ACTION", href=None, etag=None,
+                 partial=False):
         self.uid = uid
         self.title = title
         self.description = description
         self.status = status
         self.href = href
+        self.etag = etag
+        # Loaded from a summary-only fetch: the description is not known yet
+        self.partial = partial
         
     @classmethod
     def from_dav_task(cls, task_data):
@@ -31,10 +56,32 @@ class Todo:
             uid=task_data.get('uid'),
             title=task_data.get('title', ''),
             description=task_data.get('description', ''),
-            status=task_data.get('status', 'NEEDS-ACTION').upper(),
-            href=task_data.get('href')
+            status=task_data.get('status', 'NEEDS-ACTION'),
+            href=task_data.get('href'),
+            etag=task_data.get('etag'),
+            partial=task_data.get('partial', False)
         )
 
+    @classmethod
+    def from_dav_tasks(cls, tasks):
+        """Build Todos for many task dicts at once, like from_dav_task() without its per-call overhead"""
+        todos = []
+        append = todos.append
+        new = object.__new__
+        for task_data in tasks:
+            get = task_data.get
+            todo = new(cls)
+            todo.uid = get('uid')
+            todo.title = get('title', '')
+            todo.description = get('description', '')
+            todo._status = status = _canonical_status(get('status', 'NEEDS-ACTION'))
+            todo._completed = status == 'COMPLETED'
+            todo.href = get('href')
+            todo.etag = get('etag')
+            todo.partial = get('partial', False)
+            append(todo)
+        return todos
+
     def update(self, title=None, description=None, status=None):
         if title is not None:
             self.title = title
@@ -44,6 +91,14 @@ class Todo:
             self.status = status
         return self
 
+    def edit_changes(self, title, description, status):
+        """The (title, description, status) to send for an edit made in the UI
+
+        The description of a partial task was never loaded, so the empty one
+        shown for it is not sent and the server's copy is left alone.
+        """
+        return title, None if self.partial else description, status
+
     def to_dict(self):
         return {
             'uid': self.uid,
@@ -53,13 +108,45 @@ class Todo:
             'href': self.href
         }
         
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = _canonical_status(value)
+        self._completed = self._status == 'COMPLETED'
+
     @property
     def is_completed(self):
-        return self.status.upper() == 'COMPLETED'
+        return self._completed
         
     @is_completed.setter
     def is_completed(self, value):
         self.status = 'COMPLETED' if value else 'NEEDS-ACTION'
 
     def __str__(self):
-        return f'Todo(title="{self.title}", status={self.status})'
\ No newline at end of file
+        return f'Todo(title="{self.title}", status={self.status})'
+
+
+def diff_todos(current, updated):
+    """Compare two uid -> Todo maps and return the (added, changed, removed) uids
+
+    A task counts as changed when its ETag differs. Without an ETag on both
+    sides, for instance for a task created offline, its fields are compared.
+    """
+    added = [uid for uid in updated if uid not in current]
+    removed = [uid for uid in current if uid not in updated]
+
+    changed = []
+    for uid, todo in updated.items():
+        old = current.get(uid)
+        if old is None or old is todo:
+            continue
+        if old.etag and todo.etag:
+            if old.etag != todo.etag:
+                changed.append(uid)
+        elif old.to_dict() != todo.to_dict():
+            changed.append(uid)
+
+    return added, changed, removed
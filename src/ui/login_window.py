@@ -23,8 +23,8 @@ import gi
 import logging
 
 gi.require_version('Gtk', '4.0')
-gi.require_version('GdkPixbuf', '2.0')
-from gi.repository import Gtk, GLib, Gio, GObject, Gdk, GdkPixbuf
+from gi.repository import Gtk, GLib, Gio, GObject, Gdk
+from utils.assets import get_texture
 from utils.credentials import CredentialsManager
 
 class LoginWindow(Gtk.ApplicationWindow):
@@ -177,37 +177,11 @@ class LoginWindow(Gtk.ApplicationWindow):
         header_box.add_css_class("header-bar")
         header_box.set_margin_bottom(10)
         
-        style_provider = Gtk.CssProvider()
-        css = """
-        .header-bar {
-            background-color: @headerbar_bg_color;
-            padding: 8px 10px;
-            border-bottom: 1px solid alpha(#000, 0.2);
-            min-height: 48px;
-        }
-        .app-title {
-            font-weight: bold;
-            font-size: 16px;
-        }
-        .app-subtitle {
-            font-style: italic;
-            font-size: 12px;
-            color: alpha(@text_color, 0.8);
-        }
-        """
-        style_provider.load_from_data(css.encode())
-        Gtk.StyleContext.add_provider_for_display(
-            Gdk.Display.get_default(),
-            style_provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
-        
         # Add logo
         logo_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        from main import get_asset_path
-        logo_path = get_asset_path("logo.png")
-        if logo_path:
-            app_logo = Gtk.Image.new_from_file(logo_path)
+        logo = get_texture("logo.png", 100)
+        if logo:
+            app_logo = Gtk.Image.new_from_paintable(logo)
             app_logo.set_pixel_size(100)  # Set logo size
             logo_box.append(app_logo)
         
@@ -21,20 +21,25 @@ import os
 import logging
 import gi
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 root_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 if (root_path not in sys.path):
     sys.path.insert(0, root_path)
 
 gi.require_version('Gtk', '4.0')
-gi.require_version('GdkPixbuf', '2.0')
-from gi.repository import Gtk, GLib, Gio, GObject, Gdk, GdkPixbuf
+from gi.repository import Gtk, GLib, Gio, GObject, Gdk
 
-from todo import Todo
+from todo import Todo, diff_todos
 from dav_client import DavClient
+from utils.assets import get_texture
 from utils.config import load_config
 from utils.credentials import CredentialsManager
-from ui.task_widget import TaskWidget
+from utils.cache import TaskCache
+from utils.query import SUMMARY_PROPERTIES
+from outbox import Outbox
+from sync import CollectionSync
+from ui.task_widget import TaskWidget, TaskItem
 
 
 class MainWindow(Gtk.ApplicationWindow):
@@ -88,12 +93,72 @@ class MainWindow(Gtk.ApplicationWindow):
                     self.credentials.get('auth_path')
                 )
         
+        self.task_cache = self._open_task_cache()
+        self.outbox = Outbox(self.task_cache, self.dav_client)
+        # Rows only need a summary; full tasks are fetched when opened
+        self.collection_sync = CollectionSync(
+            self.dav_client, self.task_cache, self.outbox, properties=SUMMARY_PROPERTIES
+        )
+        
+        # DavClient calls run here, one at a time, and report back via GLib.idle_add
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dav')
+        self.refresh_generation = 0
+        self.refresh_running = False
+        self.refresh_requested = False
+        # Set once the executor is shut down; callbacks still queued must not submit work
+        self.closed = False
+        self.connect("close-request", self._on_close_request)
+        
         self._init_ui()
         
         self.todos = {}
-        self.todo_widgets = {}
+        self.task_items = {}
         
-        self.refresh_todos()
+        # Paint the last-known tasks right away, then reconcile with the server
+        # once the first frame is up
+        self._load_cached_todos()
+        GLib.idle_add(self.refresh_todos)
+    
+    def _open_task_cache(self):
+        collection = TaskCache.collection_key(
+            self.dav_client.server_url,
+            self.dav_client.username,
+            self.dav_client.todo_list_path
+        )
+        try:
+            return TaskCache(collection)
+        except Exception as e:
+            logging.warning(f"Task cache unavailable, keeping tasks in memory only: {e}")
+            return TaskCache(collection, ':memory:')
+    
+    def _load_cached_todos(self):
+        for todo in Todo.from_dav_tasks(self.task_cache.load_tasks()):
+            self.todos[todo.uid] = todo
+        
+        if self.todos:
+            self._render_todos()
+            self._update_status(f"Showing {len(self.todos)} cached tasks")
+    
+    def _run_in_background(self, func, callback, *args):
+        """Run func(*args) on the executor and hand its result to callback on the main loop"""
+        if self.closed:
+            return
+        
+        def run():
+            try:
+                result = func(*args)
+            except Exception as e:
+                logging.exception("Background task failed")
+                result = {'state': 'error', 'error': str(e)}
+            GLib.idle_add(callback, result)
+        
+        self.executor.submit(run)
+    
+    def _on_close_request(self, window):
+        self.closed = True
+        self.cancel_refresh()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        return False
     
     def set_logout_callback(self, callback):
         self.logout_callback = callback
@@ -121,15 +186,27 @@ class MainWindow(Gtk.ApplicationWindow):
         scrolled_window.set_hexpand(True)
         scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         
-        self.tasks_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-        self.tasks_box.set_margin_top(10)
-        self.tasks_box.set_margin_bottom(10)
-        self.tasks_box.set_margin_start(10)
-        self.tasks_box.set_margin_end(10)
+        # Only the rows in view are realized; the factory recycles them while scrolling
+        self.task_store = Gio.ListStore(item_type=TaskItem)
+        
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_task_row_setup)
+        factory.connect("bind", self._on_task_row_bind)
+        factory.connect("unbind", self._on_task_row_unbind)
         
-        scrolled_window.set_child(self.tasks_box)
+        self.task_list = Gtk.ListView(model=Gtk.NoSelection(model=self.task_store), factory=factory)
+        self.task_list.set_margin_top(10)
+        self.task_list.set_margin_bottom(10)
+        self.task_list.set_margin_start(10)
+        self.task_list.set_margin_end(10)
+        
+        scrolled_window.set_child(self.task_list)
         main_box.append(scrolled_window)
         
+        self.no_tasks_label = Gtk.Label(label="No tasks found. Add a new task to get started.")
+        self.no_tasks_label.set_visible(False)
+        main_box.append(self.no_tasks_label)
+        
         button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=20)
         button_box.set_halign(Gtk.Align.CENTER)
         button_box.set_margin_top(10)
@@ -158,41 +235,14 @@ class MainWindow(Gtk.ApplicationWindow):
         header_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
         header_box.add_css_class("header-bar")
         header_box.set_margin_bottom(10)
-        
-        style_provider = Gtk.CssProvider()
-        css = """
-        .header-bar {
-            background-color: @headerbar_bg_color;
-            padding: 8px 10px;
-            border-bottom: 1px solid alpha(#000, 0.2);
-            min-height: 48px;
-        }
-        .app-title {
-            font-weight: bold;
-            font-size: 16px;
-        }
-        .user-info {
-            font-style: italic;
-            font-size: 12px;
-            color: alpha(@text_color, 0.8);
-        }
-        """
-        style_provider.load_from_data(css.encode())
-        Gtk.StyleContext.add_provider_for_display(
-            Gdk.Display.get_default(),
-            style_provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
 
         # Add logo
         logo_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-        from main import get_asset_path
-        logo_path = get_asset_path("logo.png")
-        if logo_path:
-            app_logo = Gtk.Image.new_from_file(logo_path)
+        logo = get_texture("logo.png", 100)
+        if logo:
+            app_logo = Gtk.Image.new_from_paintable(logo)
             app_logo.set_pixel_size(100)  # Set logo size
             logo_box.append(app_logo)
-            logging.info(f"Loaded logo from: {logo_path}")
         else:
             logging.warning("Could not load application logo")
         
@@ -268,18 +318,9 @@ class MainWindow(Gtk.ApplicationWindow):
         about_dialog.set_license_type(Gtk.License.LGPL_3_0)
         
         # Add logo to About dialog
-        logo_path = os.path.join(root_path, "assets", "logo.png")
-        if os.path.exists(logo_path):
-            try:
-                # Load the logo as pixbuf
-                pixbuf = GdkPixbuf.Pixbuf.new_from_file(logo_path)
-                # Scale it to a reasonable size for the dialog
-                pixbuf = pixbuf.scale_simple(96, 96, GdkPixbuf.InterpType.BILINEAR)
-                # Convert pixbuf to a texture
-                texture = Gdk.Texture.new_for_pixbuf(pixbuf)
-                about_dialog.set_logo(texture)
-            except Exception as e:
-                logging.warning(f"Failed to set logo in about dialog: {e}")
+        logo = get_texture("logo.png", 96)
+        if logo:
+            about_dialog.set_logo(logo)
         
         about_dialog.show()
     
@@ -332,23 +373,24 @@ class MainWindow(Gtk.ApplicationWindow):
                 self._show_error_dialog("Title is required", "Please enter a title for the task.")
                 return
             
-            self._update_status("Adding task to server...")
+            todo = Todo.from_dav_task(self.outbox.add_task(title, description))
+            self.todos[todo.uid] = todo
+            self._reconcile_rows([todo.uid], [], [])
+            self._update_status("Task added successfully!")
             
-            if self.dav_client.add_task(title, description):
-                self.refresh_todos()
-                self._update_status("Task added successfully!")
-                
-                GLib.timeout_add_seconds(3, self._clear_status)
-            else:
-                self._show_error_dialog("Error", "Failed to add task to server.")
-                self._update_status("Failed to add task")
+            GLib.timeout_add_seconds(3, self._clear_status)
+            self._schedule_outbox_replay()
         
         dialog.destroy()
     
-    def _show_edit_dialog(self, uid):
+    def _show_edit_dialog(self, uid, load_details=True):
         task = self.todos.get(uid)
         if not task:
             return
+        if task.partial and load_details:
+            # The list only holds a summary, read the description before editing
+            self._load_full_task(uid, lambda uid: self._show_edit_dialog(uid, load_details=False))
+            return
         
         dialog = Gtk.Dialog(title="Edit Task", modal=True, transient_for=self)
         dialog.add_button("Cancel", Gtk.ResponseType.CANCEL)
@@ -423,16 +465,14 @@ class MainWindow(Gtk.ApplicationWindow):
                 self._show_error_dialog("Title is required", "Please enter a title for the task.")
                 return
             
-            self._update_status("Updating task...")
+            changes = task.edit_changes(new_title, new_description, new_status)
+            self.outbox.update_task(task.href, *changes)
+            task.update(*changes)
+            self._refresh_task_row(uid)
+            self._update_status("Task updated successfully!")
             
-            if self.dav_client.update_task(task.href, new_title, new_description, new_status):
-                self.refresh_todos()
-                self._update_status("Task updated successfully!")
-                
-                GLib.timeout_add_seconds(3, self._clear_status)
-            else:
-                self._show_error_dialog("Error", "Failed to update task on server.")
-                self._update_status("Failed to update task")
+            GLib.timeout_add_seconds(3, self._clear_status)
+            self._schedule_outbox_replay()
         
         dialog.destroy()
     
@@ -506,94 +546,223 @@ class MainWindow(Gtk.ApplicationWindow):
                 dialog.destroy()
                 return
             
-            self._update_status("Deleting task...")
+            self.outbox.delete_task(task.href)
+            del self.todos[uid]
+            self._reconcile_rows([], [], [uid])
             
-            if self.dav_client.delete_task(task.href):
-                if uid in self.todos:
-                    del self.todos[uid]
-                    
-                if uid in self.todo_widgets:
-                    widget = self.todo_widgets[uid]
-                    self.tasks_box.remove(widget)
-                    del self.todo_widgets[uid]
-                    
-                self._update_status("Task deleted successfully!")
-                
-                GLib.timeout_add_seconds(3, self._clear_status)
-            else:
-                self._show_error_dialog("Error", "Failed to delete task from server.")
-                self._update_status("Failed to delete task")
+            self._update_status("Task deleted successfully!")
+            
+            GLib.timeout_add_seconds(3, self._clear_status)
+            self._schedule_outbox_replay()
         
         dialog.destroy()
     
+    def _show_description(self, uid):
+        task = self.todos.get(uid)
+        if task and task.partial:
+            self._load_full_task(uid)
+    
+    def _load_full_task(self, uid, then=None):
+        """Fetch the complete body of a partial task in the background, then call then(uid)"""
+        self._update_status("Loading task...")
+        self._run_in_background(
+            self._fetch_full_task, lambda result: self._on_full_task_loaded(uid, result, then), self.todos[uid].href
+        )
+    
+    def _fetch_full_task(self, href):
+        task = self.collection_sync.load_full_task(href)
+        if task is None:
+            return {'state': 'failed'}
+        return {'state': 'loaded', 'task': task}
+    
+    def _on_full_task_loaded(self, uid, result, then):
+        todo = self.todos.get(uid)
+        if result['state'] == 'loaded' and todo is not None:
+            self.todos[uid] = Todo.from_dav_task(result['task'])
+            self._refresh_task_row(uid)
+            self._clear_status()
+        elif result['state'] != 'loaded':
+            # Editing the summary alone would offer an empty description
+            self._update_status("Could not load the task details")
+            return False
+        
+        if then is not None and uid in self.todos:
+            then(uid)
+        return False
+    
     def update_task_status(self, uid, new_status):
         task = self.todos.get(uid)
         if task:
-            self._update_status("Updating task status...")
+            self.outbox.update_task(task.href, status=new_status)
+            task.status = new_status
+            self._update_status("Task status updated!")
             
-            if self.dav_client.update_task(task.href, status=new_status):
-                task.status = new_status
-                self._update_status("Task status updated!")
-                
-                GLib.timeout_add_seconds(3, self._clear_status)
-            else:
-                self._show_error_dialog("Error", "Failed to update task status.")
-                self._update_status("Failed to update status")
-                
-                if uid in self.todo_widgets:
-                    self.todo_widgets[uid].update_from_todo(task)
+            GLib.timeout_add_seconds(3, self._clear_status)
+            self._schedule_outbox_replay()
+    
+    def _schedule_outbox_replay(self):
+        self._run_in_background(self.collection_sync.replay_outbox, self._on_replay_done)
+    
+    def _on_replay_done(self, result):
+        if result.get('state') == 'error':
+            self._update_status(f"Error: {result['error']}")
+        else:
+            self._report_replay(result)
+        return False
+    
+    def _report_replay(self, result):
+        if result['conflicts']:
+            self._update_status(
+                f"{len(result['conflicts'])} offline changes conflicted with server edits, kept the server version"
+            )
+            self.refresh_todos()
+        elif result['failed']:
+            self._update_status(f"Server rejected {len(result['failed'])} changes")
+        elif result['pending']:
+            self._update_status(f"Offline: {result['pending']} changes waiting to sync")
     
     def refresh_todos(self):
-        try:
-            self._update_status("Refreshing tasks...")
-            
-            for widget in self.todo_widgets.values():
-                self.tasks_box.remove(widget)
-            
-            self.todo_widgets = {}
-            self.todos = {}
-            
-            if not self.dav_client.authenticate():
-                self._show_error_dialog(
-                    "Authentication Error", 
-                    "Failed to connect to DAV server. Check your credentials."
-                )
-                self._update_status("Authentication failed")
-                return
-            
-            tasks_data = self.dav_client.fetch_tasks()
-            
-            if not tasks_data:
-                no_tasks_label = Gtk.Label(label="No tasks found. Add a new task to get started.")
-                self.tasks_box.append(no_tasks_label)
-                self._update_status("No tasks found")
-                return
-                
-            for task_data in tasks_data:
-                todo = Todo.from_dav_task(task_data)
-                self.todos[todo.uid] = todo
-                
-                task_widget = TaskWidget(todo)
-                task_widget.set_on_status_changed(self.update_task_status)
-                task_widget.set_on_task_deleted(self._show_delete_confirmation)
-                task_widget.set_on_task_edited(self._show_edit_dialog)
-                
-                self.tasks_box.append(task_widget)
-                self.todo_widgets[todo.uid] = task_widget
-            
-            self._update_status(f"Loaded {len(tasks_data)} tasks")
-            
+        """Reconcile with the server without blocking the main loop
+        
+        A refresh requested while one is running is coalesced into a single
+        follow-up refresh once the current one finishes.
+        """
+        if self.refresh_running:
+            self.refresh_requested = True
+            return
+        
+        self.refresh_running = True
+        self.refresh_requested = False
+        self.refresh_generation += 1
+        self._update_status("Refreshing tasks...")
+        self._run_in_background(
+            self._fetch_changes, self._on_refresh_done, self.refresh_generation, bool(self.todos)
+        )
+    
+    def cancel_refresh(self):
+        """Abandon the running refresh: it stops at its next step and its result is ignored"""
+        self.refresh_generation += 1
+        self.refresh_requested = False
+    
+    def _fetch_changes(self, generation, have_todos):
+        """The network part of a refresh, run on the executor
+        
+        Shares the refresh with the sync daemon or another window when one is
+        already running, see CollectionSync.
+        """
+        result = self.collection_sync.refresh(
+            check_changed=have_todos, cancelled=lambda: generation != self.refresh_generation
+        )
+        result['generation'] = generation
+        return result
+    
+    def _on_refresh_done(self, result):
+        self.refresh_running = False
+        state = result['state']
+        
+        if state == 'synced':
+            # Applied even when cancelled, the cache and client already moved on
+            self._apply_changes(result['changes'])
+            if result['generation'] == self.refresh_generation:
+                if self.todos:
+                    self._update_status(f"Loaded {len(self.todos)} tasks")
+                    GLib.timeout_add_seconds(3, self._clear_status)
+                else:
+                    self._update_status("No tasks found")
+        elif state == 'cancelled':
+            self._clear_status()
+        elif state == 'auth_failed':
+            self._show_error_dialog(
+                "Authentication Error", 
+                "The DAV server rejected your credentials."
+            )
+            self._update_status("Authentication failed")
+        elif state == 'pending':
+            self._report_replay(result['replay'])
+        elif state == 'unchanged':
+            self._update_status("Tasks are up to date")
             GLib.timeout_add_seconds(3, self._clear_status)
-                
-        except Exception as e:
-            self._show_error_dialog("Error", f"An error occurred: {str(e)}")
-            self._update_status(f"Error: {str(e)}")
+        elif state == 'failed':
+            if self.todos:
+                # Keep working from the cache, writes wait in the outbox
+                self._update_status("Offline: showing cached tasks")
+            else:
+                self._update_status("Failed to fetch tasks")
+        else:
+            self._show_error_dialog("Error", f"An error occurred: {result['error']}")
+            self._update_status(f"Error: {result['error']}")
+        
+        if self.refresh_requested:
+            self.refresh_todos()
+        return False
+    
+    def _apply_changes(self, changes):
+        todos = {} if changes['full'] else dict(self.todos)
+        
+        removed = set(changes['removed'])
+        if removed:
+            todos = {uid: todo for uid, todo in todos.items() if todo.href not in removed}
+        
+        for todo in Todo.from_dav_tasks(changes['added'] + changes['changed']):
+            todos[todo.uid] = todo
+        
+        # Even a full sync only touches the rows whose uid or ETag changed
+        added, changed, removed = diff_todos(self.todos, todos)
+        self.todos = todos
+        self._reconcile_rows(added, changed, removed)
+    
+    def _render_todos(self):
+        self.task_items = {uid: TaskItem(todo) for uid, todo in self.todos.items()}
+        # One splice emits a single items-changed for the whole list
+        self.task_store.splice(0, self.task_store.get_n_items(), list(self.task_items.values()))
+        self.no_tasks_label.set_visible(not self.todos)
+    
+    def _reconcile_rows(self, added, changed, removed):
+        """Apply a diff of self.todos to the list store, leaving other rows alone"""
+        for uid in removed:
+            item = self.task_items.pop(uid, None)
+            if item is not None:
+                found, position = self.task_store.find(item)
+                if found:
+                    self.task_store.remove(position)
+        
+        for uid in changed:
+            item = self.task_items.get(uid)
+            if item is not None:
+                item.set_todo(self.todos[uid])
+        
+        if added:
+            items = [TaskItem(self.todos[uid]) for uid in added]
+            self.task_items.update(zip(added, items))
+            self.task_store.splice(self.task_store.get_n_items(), 0, items)
+        
+        self.no_tasks_label.set_visible(not self.todos)
+    
+    def _refresh_task_row(self, uid):
+        item = self.task_items.get(uid)
+        if item is not None:
+            item.set_todo(self.todos[uid])
+    
+    def _on_task_row_setup(self, factory, list_item):
+        task_widget = TaskWidget()
+        task_widget.set_on_status_changed(self.update_task_status)
+        task_widget.set_on_task_deleted(self._show_delete_confirmation)
+        task_widget.set_on_task_edited(self._show_edit_dialog)
+        task_widget.set_on_description_requested(self._show_description)
+        list_item.set_child(task_widget)
+    
+    def _on_task_row_bind(self, factory, list_item):
+        list_item.get_child().bind_item(list_item.get_item())
+    
+    def _on_task_row_unbind(self, factory, list_item):
+        list_item.get_child().unbind_item()
     
     def _on_logout_response(self, dialog, response_id):
         if response_id == Gtk.ResponseType.YES:
             if hasattr(self, 'clear_credentials_check') and self.clear_credentials_check.get_active():
                 if 'username' in self.credentials:
                     CredentialsManager.delete_credentials(self.credentials['username'])
+                    self.task_cache.clear()
                     self._update_status("Credentials cleared")
             
             if self.logout_callback:
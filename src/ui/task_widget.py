@@ -26,27 +26,52 @@ if (root_path not in sys.path):
     sys.path.insert(0, root_path)
 
 gi.require_version('Gtk', '4.0')
-from gi.repository import Gtk, Gdk, GLib, Pango
+from gi.repository import Gtk, Gdk, GLib, GObject, Pango
+
+from todo import Todo
+
+
+class TaskItem(GObject.Object):
+    """A Todo wrapped for Gio.ListStore, the model behind the task list
+    
+    Emits 'changed' when its task is replaced or edited, so the row showing
+    it, if any, updates in place.
+    """
+    __gtype_name__ = 'DavTodoTaskItem'
+    __gsignals__ = {
+        'changed': (GObject.SignalFlags.RUN_FIRST, None, ()),
+    }
 
-class TaskWidget(Gtk.Box):
     def __init__(self, todo):
-        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        super().__init__()
+        self.todo = todo
+
+    def set_todo(self, todo):
         self.todo = todo
+        self.emit('changed')
+
+
+class TaskWidget(Gtk.Box):
+    """One row of the task list
+    
+    Rows are recycled by the list view: update_from_todo() rebinds a row to
+    another task, so a widget must not keep state from its previous task.
+    """
+    def __init__(self, todo=None):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        self.todo = todo or Todo()
+        self.item = None
+        self.item_handler = None
         
         self.on_status_changed_callback = None
         self.on_task_deleted_callback = None
         self.on_task_edited_callback = None
+        self.on_description_requested_callback = None
         
-        self.is_dark_mode = self._is_dark_mode()
+        self.status_class = None
         
         self.setup_ui()
     
-    def _is_dark_mode(self):
-        settings = Gtk.Settings.get_default()
-        if settings:
-            return settings.get_property("gtk-application-prefer-dark-theme")
-        return False
-    
     def setup_ui(self):
         frame = Gtk.Frame()
         frame.set_margin_top(4)
@@ -72,36 +97,38 @@ class TaskWidget(Gtk.Box):
         self.title_label.set_wrap_mode(Pango.WrapMode.WORD_CHAR)
         self.title_label.set_hexpand(True)
         self.title_label.set_xalign(0)
-        
+        self.title_label.add_css_class("task-title")
         self._update_title_style()
         
         header_box.append(self.title_label)
         
-        status_color = self._get_status_color(self.todo.status)
         self.status_label = Gtk.Label(label=f"• {self.todo.status.upper()}")
-        
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(f"label {{ color: {status_color}; font-weight: bold; }}".encode())
-        
-        style_context = self.status_label.get_style_context()
-        style_context.add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+        self.status_label.add_css_class("task-status")
+        self._update_status_style(self.todo.status)
         
         header_box.append(self.status_label)
         content_box.append(header_box)
         
-        if self.todo.description:
-            self.desc_label = Gtk.Label(label=self.todo.description)
-            self.desc_label.set_wrap(True)
-            self.desc_label.set_wrap_mode(Pango.WrapMode.WORD_CHAR)
-            self.desc_label.set_xalign(0)
-            self.desc_label.set_margin_start(24)
-            
-            desc_color = "#a3e4ff" if self.is_dark_mode else "rgba(44, 62, 80, 0.7)"
-            desc_css_provider = Gtk.CssProvider()
-            desc_css_provider.load_from_data(f"label {{ color: {desc_color}; }}".encode())
-            self.desc_label.get_style_context().add_provider(desc_css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
-            
-            content_box.append(self.desc_label)
+        # Always created so a recycled row can show a description its first task lacked
+        self.desc_label = Gtk.Label(label=self.todo.description)
+        self.desc_label.set_wrap(True)
+        self.desc_label.set_wrap_mode(Pango.WrapMode.WORD_CHAR)
+        self.desc_label.set_xalign(0)
+        self.desc_label.set_margin_start(24)
+        self.desc_label.set_visible(bool(self.todo.description))
+        self.desc_label.add_css_class("task-desc")
+        
+        content_box.append(self.desc_label)
+        
+        # Summary-only tasks load their description on request
+        self.details_btn = Gtk.Button(label="Show description")
+        self.details_btn.set_halign(Gtk.Align.START)
+        self.details_btn.set_margin_start(24)
+        self.details_btn.add_css_class("flat")
+        self.details_btn.set_visible(self.todo.partial)
+        self.details_btn.connect("clicked", self._on_details_clicked)
+        
+        content_box.append(self.details_btn)
         
         button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
         button_box.set_halign(Gtk.Align.END)
@@ -112,10 +139,7 @@ class TaskWidget(Gtk.Box):
         button_box.append(self.edit_btn)
         
         self.delete_btn = Gtk.Button(label="Delete")
-        delete_color = "#ff6b6b" if self.is_dark_mode else "#d9534f"
-        delete_css_provider = Gtk.CssProvider()
-        delete_css_provider.load_from_data(f"button {{ color: {delete_color}; }}".encode())
-        self.delete_btn.get_style_context().add_provider(delete_css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+        self.delete_btn.add_css_class("task-delete")
         self.delete_btn.connect("clicked", self._on_delete_clicked)
         button_box.append(self.delete_btn)
         
@@ -125,41 +149,21 @@ class TaskWidget(Gtk.Box):
         
         self.append(frame)
     
+    # Colors live in the application stylesheet (assets/style.css), rows only toggle classes
     def _update_title_style(self):
-        css_provider = Gtk.CssProvider()
-        
         if self.todo.is_completed:
-            color = "#bbbbbb" if self.is_dark_mode else "#777777"
-            css = f"""
-                label {{ 
-                    text-decoration: line-through; 
-                    color: {color}; 
-                }}
-            """
-        else:
-            color = "#66d4ff" if self.is_dark_mode else "#2c3e50"
-            css = f"""
-                label {{ 
-                    color: {color}; 
-                    font-weight: bold; 
-                }}
-            """
-        
-        css_provider.load_from_data(css.encode())
-        style_context = self.title_label.get_style_context()
-        style_context.add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
-    
-    def _get_status_color(self, status):
-        status = status.upper()
-        
-        if status == "COMPLETED":
-            return "#6ecc6e" if self.is_dark_mode else "#5cb85c"
-        elif status == "IN-PROCESS":
-            return "#ffbc42" if self.is_dark_mode else "#f0ad4e"
-        elif status == "CANCELLED":
-            return "#ff6b6b" if self.is_dark_mode else "#d9534f"
+            self.title_label.add_css_class("completed")
         else:
-            return "#ff9edb" if self.is_dark_mode else "#e83e8c"
+            self.title_label.remove_css_class("completed")
+    
+    def _update_status_style(self, status):
+        status_class = f"status-{status.lower()}"
+        if status_class == self.status_class:
+            return
+        if self.status_class:
+            self.status_label.remove_css_class(self.status_class)
+        self.status_label.add_css_class(status_class)
+        self.status_class = status_class
     
     def _on_checkbox_toggled(self, checkbox):
         new_status = "COMPLETED" if checkbox.get_active() else "NEEDS-ACTION"
@@ -168,13 +172,7 @@ class TaskWidget(Gtk.Box):
         self._update_title_style()
         
         self.status_label.set_text(f"• {new_status}")
-        
-        status_color = self._get_status_color(new_status)
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(f"label {{ color: {status_color}; font-weight: bold; }}".encode())
-        
-        style_context = self.status_label.get_style_context()
-        style_context.add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
+        self._update_status_style(new_status)
         
         if self.on_status_changed_callback:
             self.on_status_changed_callback(self.todo.uid, new_status)
@@ -183,6 +181,10 @@ class TaskWidget(Gtk.Box):
         if self.on_task_edited_callback:
             self.on_task_edited_callback(self.todo.uid)
     
+    def _on_details_clicked(self, button):
+        if self.on_description_requested_callback:
+            self.on_description_requested_callback(self.todo.uid)
+    
     def _on_delete_clicked(self, button):
         if self.on_task_deleted_callback:
             self.on_task_deleted_callback(self.todo.uid)
@@ -196,6 +198,25 @@ class TaskWidget(Gtk.Box):
     def set_on_task_edited(self, callback):
         self.on_task_edited_callback = callback
     
+    def set_on_description_requested(self, callback):
+        self.on_description_requested_callback = callback
+    
+    def bind_item(self, item):
+        """Show a list item's task and follow its changes until unbind_item()"""
+        self.unbind_item()
+        self.item = item
+        self.item_handler = item.connect('changed', self._on_item_changed)
+        self.update_from_todo(item.todo)
+    
+    def unbind_item(self):
+        if self.item is not None:
+            self.item.disconnect(self.item_handler)
+            self.item = None
+            self.item_handler = None
+    
+    def _on_item_changed(self, item):
+        self.update_from_todo(item.todo)
+    
     def update_from_todo(self, todo):
         self.todo = todo
         
@@ -203,20 +224,11 @@ class TaskWidget(Gtk.Box):
         self._update_title_style()
         
         self.status_label.set_text(f"• {todo.status.upper()}")
+        self._update_status_style(todo.status)
         
-        status_color = self._get_status_color(todo.status)
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(f"label {{ color: {status_color}; font-weight: bold; }}".encode())
-        
-        style_context = self.status_label.get_style_context()
-        style_context.add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
-        
-        if hasattr(self, 'desc_label'):
-            if todo.description:
-                self.desc_label.set_text(todo.description)
-                self.desc_label.set_visible(True)
-            else:
-                self.desc_label.set_visible(False)
+        self.desc_label.set_text(todo.description)
+        self.desc_label.set_visible(bool(todo.description))
+        self.details_btn.set_visible(todo.partial)
         
         self.checkbox.handler_block_by_func(self._on_checkbox_toggled)
         self.checkbox.set_active(todo.is_completed)
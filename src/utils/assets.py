@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import functools
+import logging
+import os
+import site
+import sys
+import threading
+
+# Repository root in a development checkout
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Compiled by build.sh from assets/linux-dav-todo.gresource.xml
+RESOURCE_FILE = "linux-dav-todo.gresource"
+RESOURCE_PREFIX = "/org/sppidy/linux-dav-todo"
+
+_resources_registered = None
+_textures = {}
+_textures_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def get_asset_path(filename):
+    """Get the path to an asset file, checking multiple possible locations"""
+    possible_paths = [
+        # Development environment
+        os.path.join(ROOT_PATH, "assets", filename),
+        # Installed by setup.py under the interpreter's prefix (e.g. a virtualenv) or for the user
+        os.path.join(sys.prefix, "share", "linux-dav-todo", "assets", filename),
+        os.path.join(site.getuserbase(), "share", "linux-dav-todo", "assets", filename),
+        # Installed system-wide
+        os.path.join("/usr/share/linux-dav-todo/assets", filename),
+        # Relative to binary location
+        os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "assets", filename),
+        # Inside onefile bundle
+        os.path.join(sys._MEIPASS, "assets", filename) if hasattr(sys, '_MEIPASS') else None
+    ]
+    
+    for path in possible_paths:
+        if path and os.path.exists(path):
+            return path
+    
+    logging.warning(f"Asset not found: {filename}")
+    return None
+
+
+def register_resources():
+    """Register the compiled GResource bundle once per process
+
+    Returns False when the bundle has not been built (e.g. in a development
+    checkout), in which case assets are read from their files instead.
+    """
+    global _resources_registered
+    if _resources_registered is None:
+        _resources_registered = False
+        bundle_path = get_asset_path(RESOURCE_FILE)
+        if bundle_path:
+            from gi.repository import Gio
+            try:
+                Gio.resources_register(Gio.Resource.load(bundle_path))
+                _resources_registered = True
+                logging.info(f"Registered resource bundle: {bundle_path}")
+            except Exception as e:
+                logging.warning(f"Failed to load resource bundle {bundle_path}: {e}")
+    return _resources_registered
+
+
+def load_stylesheet(css_provider, filename):
+    """Load a stylesheet into a Gtk.CssProvider from the bundle, or its file"""
+    if register_resources():
+        css_provider.load_from_resource(f"{RESOURCE_PREFIX}/{filename}")
+        return True
+    style_path = get_asset_path(filename)
+    if style_path:
+        css_provider.load_from_path(style_path)
+        return True
+    return False
+
+
+def get_texture(filename, size=None):
+    """Return an image asset as a Gdk.Texture, optionally scaled to size x size
+
+    Textures are kept for the life of the process, keyed by asset and size,
+    so each one is decoded and scaled once however many windows show it.
+    Returns None when the asset cannot be loaded.
+    """
+    key = (filename, size)
+    with _textures_lock:
+        if key not in _textures:
+            _textures[key] = _load_texture(filename, size)
+        return _textures[key]
+
+
+def _load_texture(filename, size):
+    import gi
+    gi.require_version('Gdk', '4.0')
+    from gi.repository import Gdk
+
+    try:
+        if size is None:
+            if register_resources():
+                return Gdk.Texture.new_from_resource(f"{RESOURCE_PREFIX}/{filename}")
+            path = get_asset_path(filename)
+            return Gdk.Texture.new_from_filename(path) if path else None
+
+        gi.require_version('GdkPixbuf', '2.0')
+        from gi.repository import GdkPixbuf
+        if register_resources():
+            pixbuf = GdkPixbuf.Pixbuf.new_from_resource_at_scale(f"{RESOURCE_PREFIX}/{filename}", size, size, True)
+        else:
+            path = get_asset_path(filename)
+            if path is None:
+                return None
+            pixbuf = GdkPixbuf.Pixbuf.new_from_file_at_scale(path, size, size, True)
+        return Gdk.Texture.new_for_pixbuf(pixbuf)
+    except Exception as e:
+        logging.error(f"Failed to load {filename}: {e}")
+        return None
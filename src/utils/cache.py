@@ -0,0 +1,435 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+
+def _locked(method):
+    """Serialize access to the shared connection between the UI and sync threads"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class TaskCache:
+    """Last-known tasks, ETags and sync state of a collection, kept in SQLite
+
+    Lets the window paint the previous session's tasks before the server has
+    answered, and lets DavClient resume an incremental sync from the stored
+    sync token and ETags. It also journals writes that have not reached the
+    server yet (see Outbox). One database holds every collection, keyed by its
+    URL and user name.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            collection TEXT NOT NULL,
+            href TEXT NOT NULL,
+            uid TEXT,
+            etag TEXT,
+            status TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (collection, href)
+        );
+        CREATE INDEX IF NOT EXISTS tasks_uid ON tasks (collection, uid);
+        CREATE INDEX IF NOT EXISTS tasks_status ON tasks (collection, status);
+        CREATE TABLE IF NOT EXISTS bodies (
+            collection TEXT NOT NULL,
+            href TEXT NOT NULL,
+            etag TEXT NOT NULL,
+            ical TEXT NOT NULL,
+            PRIMARY KEY (collection, href)
+        );
+        CREATE TABLE IF NOT EXISTS collections (
+            collection TEXT PRIMARY KEY,
+            sync_token TEXT,
+            ctag TEXT
+        );
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            collection TEXT NOT NULL,
+            action TEXT NOT NULL,
+            href TEXT NOT NULL,
+            etag TEXT,
+            fields TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            sending INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS outbox_href ON outbox (collection, href);
+    """
+
+    def __init__(self, collection, db_path=None):
+        self.collection = collection
+        self.db_path = db_path or os.path.join(TaskCache.get_data_dir(), 'tasks.db')
+        self.logger = logging.getLogger(__name__)
+        self.lock = threading.RLock()
+
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # WAL lets the UI read the cache while a sync writes to it
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(self.SCHEMA)
+        columns = {row['name'] for row in self.connection.execute('PRAGMA table_info(outbox)')}
+        if 'sending' not in columns:
+            # Outbox tables from before writes were marked while being sent
+            self.connection.execute('ALTER TABLE outbox ADD COLUMN sending INTEGER NOT NULL DEFAULT 0')
+
+    @staticmethod
+    def get_data_dir():
+        """Get the XDG data directory for the application"""
+        data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+        data_dir = os.path.join(data_home, 'dav-todo')
+        if not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        return data_dir
+
+    @staticmethod
+    def collection_key(server_url, username, todo_list_path):
+        """Identify a collection by its URL and the user that reads it
+
+        The list path is normalized as DavClient does, so callers without a
+        client (e.g. the command-line interface) get the same key.
+        """
+        if not todo_list_path.startswith('/'):
+            todo_list_path = '/' + todo_list_path
+        if not todo_list_path.endswith('/'):
+            todo_list_path += '/'
+        return f"{username}@{server_url.rstrip('/')}{todo_list_path}"
+
+    @_locked
+    def close(self):
+        self.connection.close()
+
+    @_locked
+    def load_tasks(self, status=None):
+        """Return the cached task dicts, optionally only those with the given status"""
+        if status is None:
+            rows = self.connection.execute(
+                'SELECT data FROM tasks WHERE collection = ?', (self.collection,)
+            )
+        else:
+            rows = self.connection.execute(
+                'SELECT data FROM tasks WHERE collection = ? AND status = ?', (self.collection, status.lower())
+            )
+        return [json.loads(row['data']) for row in rows]
+
+    @_locked
+    def get_task(self, uid):
+        """Return the cached task dict with the given uid, or None"""
+        row = self.connection.execute(
+            'SELECT data FROM tasks WHERE collection = ? AND uid = ?', (self.collection, uid)
+        ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    @_locked
+    def get_task_by_href(self, href):
+        """Return the cached task dict stored at href, or None"""
+        row = self.connection.execute(
+            'SELECT data FROM tasks WHERE collection = ? AND href = ?', (self.collection, href)
+        ).fetchone()
+        return json.loads(row['data']) if row else None
+
+    @_locked
+    def set_etag(self, href, etag):
+        """Record the ETag the server gave a task after a write"""
+        row = self.get_task_by_href(href)
+        if row is None:
+            return
+        row['etag'] = etag
+        with self.connection:
+            self.connection.execute(
+                'UPDATE tasks SET etag = ?, data = ? WHERE collection = ? AND href = ?',
+                (etag, json.dumps(row), self.collection, href)
+            )
+
+    @_locked
+    def load_etags(self):
+        """Return the href -> ETag map recorded at the last sync"""
+        rows = self.connection.execute(
+            'SELECT href, etag FROM tasks WHERE collection = ?', (self.collection,)
+        )
+        return {row['href']: row['etag'] for row in rows}
+
+    @_locked
+    def load_state(self):
+        """Return the stored {'sync_token', 'ctag'} of the collection, or None"""
+        row = self.connection.execute(
+            'SELECT sync_token, ctag FROM collections WHERE collection = ?', (self.collection,)
+        ).fetchone()
+        return {'sync_token': row['sync_token'], 'ctag': row['ctag']} if row else None
+
+    @_locked
+    def restore_client(self, dav_client):
+        """Seed a DavClient with the stored sync state so its next sync is incremental
+
+        The stored ctag and sync token also let has_collection_changed() report
+        an untouched collection without fetching anything.
+        """
+        state = self.load_state()
+        if state is None:
+            return False
+        dav_client.sync_token = state['sync_token']
+        dav_client.etags = self.load_etags()
+        dav_client.collection_state = state if any(state.values()) else None
+        return True
+
+    @_locked
+    def apply_changes(self, changes, collection_state=None):
+        """Store a DavClient.sync_tasks() result in one transaction
+
+        collection_state is the DavClient's getctag/sync-token state read before
+        the sync, remembered for the next session's change check.
+        """
+        try:
+            with self.connection:
+                if changes['full']:
+                    self.connection.execute('DELETE FROM tasks WHERE collection = ?', (self.collection,))
+                else:
+                    self.connection.executemany(
+                        'DELETE FROM tasks WHERE collection = ? AND href = ?',
+                        [(self.collection, href) for href in changes['removed']]
+                    )
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO tasks (collection, href, uid, etag, status, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    [self._task_row(task) for task in changes['added'] + changes['changed']]
+                )
+                # Bodies of tasks that are gone or were replaced are of no use any more
+                self.connection.execute(
+                    'DELETE FROM bodies WHERE collection = ? AND NOT EXISTS (SELECT 1 FROM tasks '
+                    'WHERE tasks.collection = bodies.collection AND tasks.href = bodies.href '
+                    'AND tasks.etag IS bodies.etag)',
+                    (self.collection,)
+                )
+                ctag = collection_state.get('ctag') if collection_state else None
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO collections (collection, sync_token, ctag) VALUES (?, ?, ?)',
+                    (self.collection, changes['sync_token'], ctag)
+                )
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to update task cache: {e}")
+            return False
+
+    @_locked
+    def store_task(self, task):
+        """Replace a single cached task, e.g. once its complete body was fetched"""
+        try:
+            with self.connection:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO tasks (collection, href, uid, etag, status, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    self._task_row(task)
+                )
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to update task cache: {e}")
+            return False
+
+    @_locked
+    def store_bodies(self, bodies):
+        """Keep the iCalendar bodies of tasks, given as {href: (ETag, body)}
+
+        A stored body lets a later session, or another process, send an
+        update without reading the task first. Bodies without an ETag are
+        skipped, as they could never be matched to a version.
+        """
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO bodies (collection, href, etag, ical) VALUES (?, ?, ?, ?)',
+                    [(self.collection, href, etag, ical) for href, (etag, ical) in bodies.items() if etag]
+                )
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to update task cache: {e}")
+            return False
+
+    @_locked
+    def get_body(self, href):
+        """Return the stored (ETag, iCalendar body) of a task, or None"""
+        row = self.connection.execute(
+            'SELECT etag, ical FROM bodies WHERE collection = ? AND href = ?', (self.collection, href)
+        ).fetchone()
+        return (row['etag'], row['ical']) if row else None
+
+    @_locked
+    def remove_tasks(self, hrefs):
+        """Drop tasks that were deleted locally"""
+        try:
+            with self.connection:
+                for table in ('tasks', 'bodies'):
+                    self.connection.executemany(
+                        f'DELETE FROM {table} WHERE collection = ? AND href = ?',
+                        [(self.collection, href) for href in hrefs]
+                    )
+            return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to update task cache: {e}")
+            return False
+
+    @_locked
+    def clear(self):
+        """Forget everything cached for the collection, including unsent writes"""
+        with self.connection:
+            self.connection.execute('DELETE FROM tasks WHERE collection = ?', (self.collection,))
+            self.connection.execute('DELETE FROM bodies WHERE collection = ?', (self.collection,))
+            self.connection.execute('DELETE FROM collections WHERE collection = ?', (self.collection,))
+            self.connection.execute('DELETE FROM outbox WHERE collection = ?', (self.collection,))
+
+    @_locked
+    def queue_mutation(self, action, href, etag, fields, task=None):
+        """Journal a local write and apply it to the cached tasks in one transaction
+
+        action is 'add', 'update' or 'delete'; etag is the version the change
+        was made against. task is the resulting task dict, or None for a delete.
+        Writes to a task that has not been sent yet are merged into the pending
+        entry, so a task added and deleted offline never reaches the server.
+        An entry that is being sent is never merged into; the write gets an
+        entry of its own, sent after it.
+        """
+        with self.connection:
+            pending = self.connection.execute(
+                'SELECT id, action, etag, fields FROM outbox WHERE collection = ? AND href = ? AND sending = 0 '
+                'AND id = (SELECT MAX(id) FROM outbox WHERE collection = ? AND href = ?)',
+                (self.collection, href, self.collection, href)
+            ).fetchone()
+
+            if task is not None:
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO tasks (collection, href, uid, etag, status, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    self._task_row(task)
+                )
+            else:
+                self.connection.execute(
+                    'DELETE FROM tasks WHERE collection = ? AND href = ?', (self.collection, href)
+                )
+
+            # The sending = 0 conditions stop a merge into an entry another process started sending since
+            if pending is not None and action == 'update' and pending['action'] in ('add', 'update'):
+                merged = {**json.loads(pending['fields']), **fields}
+                merged_rows = self.connection.execute(
+                    'UPDATE outbox SET fields = ? WHERE id = ? AND sending = 0', (json.dumps(merged), pending['id'])
+                ).rowcount
+                if merged_rows:
+                    return
+            elif pending is not None and action == 'delete' and pending['action'] in ('add', 'update'):
+                dropped_rows = self.connection.execute(
+                    'DELETE FROM outbox WHERE id = ? AND sending = 0', (pending['id'],)
+                ).rowcount
+                if dropped_rows and pending['action'] == 'add':
+                    return
+                if dropped_rows:
+                    etag = pending['etag']
+
+            self.connection.execute(
+                'INSERT INTO outbox (collection, action, href, etag, fields) VALUES (?, ?, ?, ?, ?)',
+                (self.collection, action, href, etag, json.dumps(fields))
+            )
+
+    @_locked
+    def load_mutations(self):
+        """Return the journaled writes in the order they were made"""
+        rows = self.connection.execute(
+            'SELECT id, action, href, etag, fields, attempts FROM outbox WHERE collection = ? ORDER BY id',
+            (self.collection,)
+        )
+        return [{**dict(row), 'fields': json.loads(row['fields'])} for row in rows]
+
+    @_locked
+    def count_mutations(self):
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM outbox WHERE collection = ?', (self.collection,)
+        ).fetchone()[0]
+
+    @_locked
+    def remove_mutation(self, mutation_id):
+        with self.connection:
+            self.connection.execute('DELETE FROM outbox WHERE id = ?', (mutation_id,))
+
+    @_locked
+    def claim_mutation(self, mutation_id):
+        """Mark a journaled write as being sent and return it as it is now
+
+        Returns None when the write is gone, e.g. cancelled by a later delete.
+        Writes queued from now on no longer merge into it.
+        """
+        with self.connection:
+            self.connection.execute('UPDATE outbox SET sending = 1 WHERE id = ?', (mutation_id,))
+            row = self.connection.execute(
+                'SELECT id, action, href, etag, fields, attempts FROM outbox WHERE id = ?', (mutation_id,)
+            ).fetchone()
+        return {**dict(row), 'fields': json.loads(row['fields'])} if row else None
+
+    @_locked
+    def release_mutation(self, mutation_id):
+        """Put back a write that could not be sent, so later writes merge into it again"""
+        with self.connection:
+            self.connection.execute('UPDATE outbox SET sending = 0 WHERE id = ?', (mutation_id,))
+
+    @_locked
+    def complete_mutation(self, mutation_id, href, etag):
+        """Drop a write the server accepted and record the task's new ETag
+
+        Writes to the task queued while it was being sent were made on top of
+        it, so they are rebased onto the new ETag.
+        """
+        with self.connection:
+            self.connection.execute('DELETE FROM outbox WHERE id = ?', (mutation_id,))
+            self.connection.execute(
+                'UPDATE outbox SET etag = ? WHERE collection = ? AND href = ? AND id > ?',
+                (etag, self.collection, href, mutation_id)
+            )
+        self.set_etag(href, etag)
+
+    @_locked
+    def record_attempt(self, mutation_id):
+        """Count a failed replay of a journaled write and return the new count
+
+        Returns None when the write is gone, e.g. removed by another process
+        while it was being sent.
+        """
+        with self.connection:
+            self.connection.execute(
+                'UPDATE outbox SET attempts = attempts + 1, sending = 0 WHERE id = ?', (mutation_id,)
+            )
+        row = self.connection.execute(
+            'SELECT attempts FROM outbox WHERE id = ?', (mutation_id,)
+        ).fetchone()
+        return row['attempts'] if row else None
+
+    def _task_row(self, task):
+        status = task.get('status')
+        return (
+            self.collection,
+            task['href'],
+            task.get('uid'),
+            task.get('etag'),
+            status.lower() if status else None,
+            json.dumps(task)
+        )
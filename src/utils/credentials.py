@@ -17,7 +17,6 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import keyring
 import json
 import logging
 from configparser import ConfigParser
@@ -47,6 +46,7 @@ class CredentialsManager:
         (without the password)
         """
         try:
+            import keyring
             keyring.set_password(CredentialsManager.SERVICE_NAME, username, password)
             
             if remember:
@@ -79,10 +79,10 @@ class CredentialsManager:
             return False
     
     @staticmethod
-    def get_credentials():
+    def get_settings():
         """
-        Retrieve credentials from the system keyring and config file
-        Returns a dictionary with credentials or None if not found
+        Read the server, user and list path from the config file, without
+        touching the keyring. Returns a dictionary or None if not configured
         """
         try:
             config_path = CredentialsManager.get_config_file_path()
@@ -96,40 +96,52 @@ class CredentialsManager:
             if not config.has_section('settings'):
                 return None
             
-            if not config.has_option('settings', 'use_keyring') or config.get('settings', 'use_keyring') != 'true':
-                if not all(key in config['settings'] for key in ['dav_server_url', 'username', 'password', 'todo_list_path']):
-                    return None
-                
-                credentials = {
-                    'server_url': config['settings']['dav_server_url'].strip('"'),
-                    'username': config['settings']['username'].strip('"'),
-                    'password': config['settings']['password'].strip('"'),
-                    'todo_list_path': config['settings']['todo_list_path'].strip('"'),
-                }
-                
-                if 'auth_path' in config['settings']:
-                    credentials['auth_path'] = config['settings']['auth_path'].strip('"')
-                
-                return credentials
-            
-            username = config['settings']['username'].strip('"')
-            
-            password = keyring.get_password(CredentialsManager.SERVICE_NAME, username)
-            if password is None:
-                logging.warning(f"No password found in keyring for username: {username}")
+            if not all(key in config['settings'] for key in ['dav_server_url', 'username', 'todo_list_path']):
                 return None
             
-            credentials = {
+            settings = {
                 'server_url': config['settings']['dav_server_url'].strip('"'),
-                'username': username,
-                'password': password,
+                'username': config['settings']['username'].strip('"'),
                 'todo_list_path': config['settings']['todo_list_path'].strip('"'),
+                'use_keyring': config['settings'].get('use_keyring') == 'true',
             }
             
             if 'auth_path' in config['settings']:
-                credentials['auth_path'] = config['settings']['auth_path'].strip('"')
+                settings['auth_path'] = config['settings']['auth_path'].strip('"')
+            if 'password' in config['settings']:
+                settings['password'] = config['settings']['password'].strip('"')
+            
+            return settings
+        
+        except Exception as e:
+            logging.error(f"Failed to read settings: {e}")
+            return None
+    
+    @staticmethod
+    def get_credentials():
+        """
+        Retrieve credentials from the system keyring and config file
+        Returns a dictionary with credentials or None if not found
+        """
+        try:
+            settings = CredentialsManager.get_settings()
+            if settings is None:
+                return None
+            
+            use_keyring = settings.pop('use_keyring')
+            if not use_keyring:
+                return settings if 'password' in settings else None
+            
+            import keyring
+            username = settings['username']
+            
+            password = keyring.get_password(CredentialsManager.SERVICE_NAME, username)
+            if password is None:
+                logging.warning(f"No password found in keyring for username: {username}")
+                return None
             
-            return credentials
+            settings['password'] = password
+            return settings
         
         except Exception as e:
             logging.error(f"Failed to retrieve credentials from keyring: {e}")
@@ -148,6 +160,7 @@ class CredentialsManager:
                     username = config['settings']['username'].strip('"')
             
             if username:
+                import keyring
                 try:
                     keyring.delete_password(CredentialsManager.SERVICE_NAME, username)
                 except keyring.errors.PasswordDeleteError:
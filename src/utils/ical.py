@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""RFC 5545 content-line handling for VTODO components"""
+
+import re
+
+_FOLD = re.compile(r'\r?\n[ \t]')
+_TEXT_ESCAPE = re.compile(r'\\([\\;,nN])')
+
+# Property name -> (task key, value type)
+VTODO_PROPERTIES = {
+    'UID': ('uid', 'raw'),
+    'SUMMARY': ('title', 'text'),
+    'DESCRIPTION': ('description', 'text'),
+    'STATUS': ('status', 'status'),
+    'DUE': ('due', 'date'),
+    'DTSTART': ('dtstart', 'date'),
+    'COMPLETED': ('completed', 'date'),
+    'CREATED': ('created', 'date'),
+    'DTSTAMP': ('dtstamp', 'date'),
+    'LAST-MODIFIED': ('last_modified', 'date'),
+    'DURATION': ('duration', 'raw'),
+    'PRIORITY': ('priority', 'int'),
+    'PERCENT-COMPLETE': ('percent_complete', 'int'),
+    'SEQUENCE': ('sequence', 'int'),
+    'RRULE': ('rrule', 'raw'),
+    'RECURRENCE-ID': ('recurrence_id', 'date'),
+    'CATEGORIES': ('categories', 'list'),
+    'CLASS': ('class', 'raw'),
+    'LOCATION': ('location', 'text'),
+    'URL': ('url', 'raw'),
+    'GEO': ('geo', 'raw'),
+    'ORGANIZER': ('organizer', 'raw'),
+    'RELATED-TO': ('related_to', 'raw'),
+    'COMMENT': ('comment', 'text'),
+    'CONTACT': ('contact', 'text'),
+}
+
+# parse_vtodo() lookup tables by requested properties, see _lookup_tables()
+_TABLES = {}
+
+
+def unfold(ical_data):
+    """Join folded content lines (CRLF or LF followed by a space or tab)"""
+    if '\n ' in ical_data or '\n\t' in ical_data:
+        return _FOLD.sub('', ical_data)
+    return ical_data
+
+
+def unescape_text(value):
+    """Undo TEXT value escaping (backslash, semicolon, comma and newline)"""
+    if '\\' not in value:
+        return value
+    return _TEXT_ESCAPE.sub(lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+
+def escape_text(value):
+    """Escape a string for use as a TEXT property value"""
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def split_text_list(value):
+    """Split a comma separated TEXT list (e.g. CATEGORIES) and unescape each item"""
+    if '\\' not in value:
+        return value.split(',')
+
+    items = []
+    start = 0
+    index = 0
+    while index < len(value):
+        char = value[index]
+        if char == '\\':
+            index += 2
+            continue
+        if char == ',':
+            items.append(value[start:index])
+            start = index + 1
+        index += 1
+    items.append(value[start:])
+    return [unescape_text(item) for item in items]
+
+
+def split_content_line(line):
+    """Split a content line into (NAME, {PARAM: value}, value)
+
+    Returns None for lines without a value separator.
+    """
+    colon = line.find(':')
+    if colon == -1:
+        return None
+
+    semi = line.find(';', 0, colon)
+    if semi == -1:
+        return line[:colon].upper(), None, line[colon + 1:]
+
+    # A quoted parameter value may itself contain ':' or ';'
+    if '"' in line[semi:colon]:
+        colon = _find_value_separator(line, semi)
+        if colon == -1:
+            return None
+
+    params = {}
+    for param in _split_params(line[semi + 1:colon]):
+        name, _, value = param.partition('=')
+        params[name.upper()] = value.strip('"')
+    return line[:semi].upper(), params, line[colon + 1:]
+
+
+def _find_value_separator(line, start):
+    quoted = False
+    for index in range(start, len(line)):
+        char = line[index]
+        if char == '"':
+            quoted = not quoted
+        elif char == ':' and not quoted:
+            return index
+    return -1
+
+
+def _split_params(params):
+    if '"' not in params:
+        return params.split(';')
+
+    parts = []
+    current = []
+    quoted = False
+    for char in params:
+        if char == '"':
+            quoted = not quoted
+        elif char == ';' and not quoted:
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def parse_vtodo(ical_data, properties=None):
+    """Parse the first VTODO of an iCalendar object into a task dict
+
+    Handles line unfolding, property parameters and TEXT escapes. Properties
+    of nested components such as VALARM are skipped. Date values are kept as
+    their iCalendar strings, with any TZID stored under '<key>_tzid'.
+
+    properties, a tuple of property names such as utils.query.SUMMARY_PROPERTIES,
+    limits the result to those; the lines of the others are skipped unparsed.
+    The loop over content lines only splits off the name and stores the raw
+    value, and typed conversions run once per task afterwards.
+    """
+    start = ical_data.find('BEGIN:VTODO')
+    if start == -1:
+        return {}
+    end = ical_data.find('\nEND:VTODO', start)
+    body = ical_data[start + len('BEGIN:VTODO'):end if end != -1 else len(ical_data)]
+    wanted, raw_keys, text_keys, int_keys = _TABLES.get(properties) or _lookup_tables(properties)
+
+    todo = {}
+    lines = iter(body.splitlines())
+    for line in lines:
+        name, _, value = line.partition(':')
+        key = raw_keys.get(name)
+        if key:
+            todo[key] = value
+        elif key is not None or not name:
+            continue
+        elif name == 'STATUS':
+            todo['status'] = value.lower()
+        elif name == 'BEGIN':
+            # Skip nested components such as VALARM
+            end = f'END:{value}'
+            for line in lines:
+                if line == end:
+                    break
+        elif line[0] in ' \t':
+            # Folded lines are rare, so the data is only unfolded once one is seen
+            unfolded = unfold(ical_data)
+            if unfolded is not ical_data:
+                return parse_vtodo(unfolded, properties)
+        else:
+            # Parameters, lower-case names and list values take the careful path
+            _parse_other_line(todo, line, wanted)
+
+    if '\\' in body:
+        for key in text_keys:
+            if key in todo:
+                todo[key] = unescape_text(todo[key])
+    for key in int_keys:
+        value = todo.get(key)
+        if value is not None:
+            try:
+                todo[key] = int(value)
+            except ValueError:
+                del todo[key]
+
+    return todo
+
+
+def _lookup_tables(properties):
+    """Build and cache the VTODO_PROPERTIES tables parse_vtodo() uses, limited to properties unless None
+
+    raw_keys maps the name of a plain content line to its task key, or to
+    '' for a property that was not asked for. Names missing from it, such as
+    STATUS whose value is lower-cased, take a slower path.
+    """
+    wanted = {name: prop for name, prop in VTODO_PROPERTIES.items() if properties is None or name in properties}
+    raw_keys = {}
+    for name, (key, kind) in VTODO_PROPERTIES.items():
+        if name not in wanted:
+            key = ''
+        elif kind in ('list', 'status'):
+            continue
+        raw_keys[name] = key
+        if kind == 'date':
+            # All-day dates carry a VALUE parameter but no TZID, so they skip the parameter parsing
+            raw_keys[f'{name};VALUE=DATE'] = key
+    text_keys = tuple(key for key, kind in wanted.values() if kind == 'text')
+    int_keys = tuple(key for key, kind in wanted.values() if kind == 'int')
+    _TABLES[properties] = wanted, raw_keys, text_keys, int_keys
+    return _TABLES[properties]
+
+
+def _parse_other_line(todo, line, wanted):
+    parsed = split_content_line(line)
+    if parsed is None:
+        return
+    name, params, value = parsed
+
+    prop = wanted.get(name)
+    if prop is None:
+        return
+    key, kind = prop
+
+    if kind == 'list':
+        items = (item.strip() for item in split_text_list(value))
+        todo.setdefault(key, []).extend(item for item in items if item)
+        return
+
+    todo[key] = value.lower() if kind == 'status' else value
+    if kind == 'date' and params and 'TZID' in params:
+        todo[f'{key}_tzid'] = params['TZID']
+
+
+def fold_line(line, limit=75):
+    """Fold a content line so no part is longer than limit octets"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= limit:
+        return line
+
+    parts = []
+    start = 0
+    width = limit
+    while start < len(encoded):
+        end = min(start + width, len(encoded))
+        # Never split a UTF-8 sequence
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode('utf-8'))
+        start = end
+        width = limit - 1
+    return '\r\n '.join(parts)
+
+
+def build_vcalendar(tasks):
+    """Serialize task dicts into one VCALENDAR with a VTODO per task
+
+    Writes the properties a task dict carries (see VTODO_PROPERTIES), so a
+    partially loaded task exports only its summary fields.
+    """
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:-//Linux-DAV-Todo//EN']
+    for task in tasks:
+        lines.append('BEGIN:VTODO')
+        for name, (key, kind) in VTODO_PROPERTIES.items():
+            value = task.get(key)
+            if value is None or value == '':
+                continue
+            if kind == 'text':
+                value = escape_text(value)
+            elif kind == 'status':
+                value = value.upper()
+            elif kind == 'list':
+                value = ','.join(escape_text(item) for item in value)
+            if kind == 'date' and task.get(f'{key}_tzid'):
+                lines.append(fold_line(f"{name};TZID={task[f'{key}_tzid']}:{value}"))
+            else:
+                lines.append(fold_line(f"{name}:{value}"))
+        lines.append('END:VTODO')
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def replace_property(ical_data, property_name, new_value):
+    """Replace a task property, whatever its parameters or folding
+
+    A task without the property gets it added, and a new_value of None
+    removes it. Properties of nested components such as VALARM are left
+    alone. The lines keep the CRLF or LF endings of ical_data.
+    """
+    newline = '\r\n' if '\r\n' in ical_data else '\n'
+    lines = unfold(ical_data).splitlines()
+    result = []
+    nested = 0
+    found = False
+
+    for line in lines:
+        if line.startswith('BEGIN:'):
+            if line not in ('BEGIN:VCALENDAR', 'BEGIN:VTODO'):
+                nested += 1
+        elif line.startswith('END:'):
+            if line == 'END:VTODO' and not found and new_value is not None:
+                result.append(f"{property_name}:{new_value}")
+                found = True
+            if line not in ('END:VCALENDAR', 'END:VTODO'):
+                nested -= 1
+        elif nested == 0 and line.upper().startswith(property_name):
+            parsed = split_content_line(line)
+            if parsed is not None and parsed[0] == property_name:
+                found = True
+                if new_value is None:
+                    continue
+                line = f"{property_name}:{new_value}"
+        result.append(line)
+
+    if ical_data.endswith('\n'):
+        result.append('')
+    return newline.join(result)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""CalDAV calendar-query filters (RFC 4791 section 9.7) for VTODO fetches"""
+
+from datetime import timezone
+from xml.sax.saxutils import escape as xml_escape, quoteattr
+
+# What the task list shows; enough for a row, without long DESCRIPTIONs or attachments
+SUMMARY_PROPERTIES = ('UID', 'SUMMARY', 'STATUS', 'DUE', 'PRIORITY')
+
+# What the application reads from a complete task: the list, the edit dialog and the filters.
+# The rest stays in the iCalendar body, which is what updates and exports start from.
+TASK_PROPERTIES = ('UID', 'SUMMARY', 'DESCRIPTION', 'STATUS', 'DUE', 'DTSTART', 'COMPLETED', 'PRIORITY')
+
+
+def format_utc(value):
+    """Format a datetime as an iCalendar UTC date-time; naive values are taken as local time"""
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def calendar_data_prop(properties=None):
+    """The calendar-data element of a REPORT, limited to the given VTODO properties if any
+
+    Uses partial retrieval (RFC 4791 section 9.6): the server returns a
+    VCALENDAR holding each VTODO with only those properties.
+    """
+    if not properties:
+        return '<c:calendar-data />'
+    props = ''.join(f'<c:prop name="{name}" />' for name in properties)
+    return ('<c:calendar-data><c:comp name="VCALENDAR"><c:prop name="VERSION" />'
+            f'<c:comp name="VTODO">{props}</c:comp></c:comp></c:calendar-data>')
+
+
+def build_calendar_query(status=None, exclude_status=(), completed_since=None, time_range=None, properties=None,
+                         status_undefined=False):
+    """Build a calendar-query REPORT body asking only for the matching VTODOs
+
+    status keeps tasks with that STATUS, exclude_status drops every listed
+    one, completed_since keeps tasks with a COMPLETED date at or after the
+    given datetime and time_range is a (start, end) pair of datetimes, either
+    of which may be None, that the task must overlap. All given filters must
+    match. properties limits the returned calendar-data, see
+    calendar_data_prop().
+
+    Like any CalDAV prop-filter, the status filters only match tasks that
+    have a STATUS property at all, and a calendar-query cannot OR filters.
+    status_undefined=True replaces them with an is-not-defined filter, the
+    second query needed to also get the tasks without a STATUS that an
+    exclude_status query leaves out.
+    """
+    filters = []
+    if time_range is not None:
+        filters.append(_time_range(*time_range))
+    if status_undefined:
+        filters.append(_prop_filter('STATUS', '<c:is-not-defined />'))
+    elif status:
+        filters.append(_prop_filter('STATUS', _text_match(status)))
+    for excluded in () if status_undefined else exclude_status or ():
+        filters.append(_prop_filter('STATUS', _text_match(excluded, negate=True)))
+    if completed_since is not None:
+        filters.append(_prop_filter('COMPLETED', _time_range(completed_since, None)))
+
+    if filters:
+        vtodo_filter = '<c:comp-filter name="VTODO">\n' + ''.join(
+            f'                {item}\n' for item in filters
+        ) + '            </c:comp-filter>'
+    else:
+        vtodo_filter = '<c:comp-filter name="VTODO" />'
+
+    return f"""<?xml version="1.0" encoding="utf-8" ?>
+<c:calendar-query xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+    <d:prop>
+        <d:getetag />
+        {calendar_data_prop(properties)}
+    </d:prop>
+    <c:filter>
+        <c:comp-filter name="VCALENDAR">
+            {vtodo_filter}
+        </c:comp-filter>
+    </c:filter>
+</c:calendar-query>"""
+
+
+def _prop_filter(name, condition):
+    return f'<c:prop-filter name="{name}">{condition}</c:prop-filter>'
+
+
+def _text_match(value, negate=False):
+    negate_attr = ' negate-condition="yes"' if negate else ''
+    return (f'<c:text-match collation="i;ascii-casemap"{negate_attr}>'
+            f'{xml_escape(value.upper())}</c:text-match>')
+
+
+def _time_range(start, end):
+    attrs = ''
+    if start is not None:
+        attrs += f' start={quoteattr(format_utc(start))}'
+    if end is not None:
+        attrs += f' end={quoteattr(format_utc(end))}'
+    return f'<c:time-range{attrs} />'
+
+
+def task_matches(task, status=None, exclude_status=(), completed_since=None, time_range=None):
+    """Apply the build_calendar_query() filters to a parsed task dict
+
+    Used when the server could not run the filtered query and returned
+    everything. Dates are compared as UTC strings, so floating and TZID
+    values are only approximately right. A task without DUE or DTSTART
+    overlaps every time range, and a task without STATUS matches no status
+    but is never excluded, like the server queries of iter_tasks().
+    """
+    task_status = (task.get('status') or '').upper()
+    if status and task_status != status.upper():
+        return False
+    if exclude_status and task_status in {excluded.upper() for excluded in exclude_status}:
+        return False
+    if completed_since is not None:
+        completed = task.get('completed')
+        if not completed or _normalize(completed) < format_utc(completed_since):
+            return False
+    if time_range is not None:
+        when = task.get('due') or task.get('dtstart')
+        if when:
+            start, end = time_range
+            when = _normalize(when)
+            if start is not None and when < format_utc(start):
+                return False
+            if end is not None and when >= format_utc(end):
+                return False
+    return True
+
+
+def filter_properties(properties, status=None, exclude_status=(), completed_since=None, time_range=None):
+    """properties plus those task_matches() reads for the given filters
+
+    A partial fetch that is filtered locally needs them even when the caller
+    did not ask for them. None, for complete tasks, stays None.
+    """
+    if properties is None:
+        return None
+    needed = []
+    if status or exclude_status:
+        needed.append('STATUS')
+    if completed_since is not None:
+        needed.append('COMPLETED')
+    if time_range is not None:
+        needed += ['DUE', 'DTSTART']
+    return tuple(properties) + tuple(name for name in needed if name not in properties)
+
+
+def _normalize(value):
+    """Pad a DATE value so it compares with date-time strings"""
+    return value if 'T' in value else f'{value}T000000Z'
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""HTTP transport for DavClient: connection pooling, keep-alive, TLS, retries and compression"""
+
+import gzip
+import ssl
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.util.retry import Retry
+
+# Requests resent after a read error or retry status. Writes are only retried
+# when the connection failed, as a resent If-Match PUT or DELETE that already
+# succeeded would come back as a false 412 or 404
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PROPFIND', 'REPORT'])
+
+
+class TransportConfig:
+    """Pooling, keep-alive, TLS, retry and compression settings shared by a DavClient's requests"""
+
+    def __init__(self, pool_connections=4, pool_maxsize=None, pool_block=False, keep_alive=True,
+                 retries=3, backoff_factor=0.5, backoff_jitter=0.5, retry_statuses=(502, 503, 504),
+                 ssl_context=None, compress_responses=True, compress_requests=True, compress_min_size=1024):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.retry_statuses = tuple(retry_statuses)
+        self.ssl_context = ssl_context
+        self.compress_responses = compress_responses
+        self.compress_requests = compress_requests
+        self.compress_min_size = compress_min_size
+
+    def build_retry(self):
+        """The urllib3 Retry policy for these settings"""
+        options = dict(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.retry_statuses,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False,
+        )
+        try:
+            return Retry(backoff_jitter=self.backoff_jitter, **options)
+        except TypeError:
+            # urllib3 < 2 has no jitter
+            return Retry(**options)
+
+    def create_session(self, auth, default_pool_maxsize):
+        """Build a requests.Session using these settings"""
+        if self.ssl_context is None:
+            self.ssl_context = ssl.create_default_context(cafile=DEFAULT_CA_BUNDLE_PATH)
+
+        adapter = DavHTTPAdapter(
+            ssl_context=self.ssl_context,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize or default_pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=self.build_retry(),
+        )
+
+        session = requests.Session()
+        session.auth = auth
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Accept-Encoding'] = 'gzip, deflate' if self.compress_responses else 'identity'
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+
+class DavHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools all share one SSLContext"""
+
+    def __init__(self, ssl_context=None, **kwargs):
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.ssl_context is not None:
+            kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        # requests >= 2.32 picks the context per request; keep ours for default verification
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(request, verify, cert)
+        if self.ssl_context is not None and verify is True and 'ssl_context' in pool_kwargs:
+            pool_kwargs['ssl_context'] = self.ssl_context
+        return host_params, pool_kwargs
+
+
+def connection_stats(session):
+    """Count requests and new connections over the session's live pools
+
+    reuse_rate is the share of requests that went over an already open
+    connection. Pools evicted from the pool manager are not counted.
+    """
+    total_requests = 0
+    total_connections = 0
+    for adapter in set(session.adapters.values()):
+        manager = getattr(adapter, 'poolmanager', None)
+        if manager is None:
+            continue
+        for key in manager.pools.keys():
+            pool = manager.pools.get(key)
+            if pool is not None:
+                total_requests += pool.num_requests
+                total_connections += pool.num_connections
+
+    reuse_rate = 1 - total_connections / total_requests if total_requests else 0.0
+    return {'requests': total_requests, 'connections': total_connections, 'reuse_rate': reuse_rate}
+
+
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding header value allows gzip (q=0 rules it out)"""
+    if not accept_encoding:
+        return False
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        if name.strip().lower() not in ('gzip', 'x-gzip'):
+            continue
+        quality = params.strip().lower()
+        if quality.startswith('q='):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def gzip_body(data):
+    """gzip a request body given as str or bytes"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return gzip.compress(data, mtime=0)
+
+
+class TransferStats:
+    """Thread-safe count of body bytes sent and received
+
+    Both directions are counted as the payload size (before compression on
+    the way out, after decompression on the way in) and as the bytes that
+    actually crossed the wire, so the difference is what compression saved.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.sent_wire = 0
+        self.received = 0
+        self.received_wire = 0
+
+    def record_sent(self, size, wire_size):
+        with self.lock:
+            self.sent += size
+            self.sent_wire += wire_size
+
+    def record_received(self, size, wire_size):
+        with self.lock:
+            self.received += size
+            self.received_wire += wire_size
+
+    def as_dict(self):
+        with self.lock:
+            payload = self.sent + self.received
+            wire = self.sent_wire + self.received_wire
+            return {
+                'sent': self.sent,
+                'sent_wire': self.sent_wire,
+                'received': self.received,
+                'received_wire': self.received_wire,
+                'saved_rate': 1 - wire / payload if payload else 0.0,
+            }
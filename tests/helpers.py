@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task factory and TaskCache fixture shared by the tests"""
+
+import os
+import tempfile
+import unittest
+
+from src.utils.cache import TaskCache
+
+CACHE_KEY = 'user@https://example.com/cal/'
+
+
+def make_task(uid, title=None, status='needs-action', etag=None, **fields):
+    """A task dict as DavClient returns it, stored at /cal/<uid>.ics"""
+    return {
+        'uid': uid,
+        'title': title or f'Task {uid}',
+        'status': status,
+        'href': f'/cal/{uid}.ics',
+        'etag': etag or f'"{uid}-1"',
+        **fields,
+    }
+
+
+class CacheTestCase(unittest.TestCase):
+    """Gives each test a TaskCache on a fresh database in a temporary directory"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'tasks.db')
+        self.cache = TaskCache(CACHE_KEY, self.db_path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
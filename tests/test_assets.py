@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.utils import assets
+
+
+class TestAssets(unittest.TestCase):
+
+    def setUp(self):
+        assets._textures.clear()
+
+    def tearDown(self):
+        assets._textures.clear()
+
+    def test_get_asset_path_finds_checkout_assets(self):
+        self.assertEqual(assets.get_asset_path('style.css'), os.path.join(assets.ROOT_PATH, 'assets', 'style.css'))
+
+    def test_get_asset_path_finds_assets_installed_under_the_prefix(self):
+        with tempfile.TemporaryDirectory() as prefix:
+            asset_dir = os.path.join(prefix, 'share', 'linux-dav-todo', 'assets')
+            os.makedirs(asset_dir)
+            open(os.path.join(asset_dir, 'installed.css'), 'w').close()
+            assets.get_asset_path.cache_clear()
+            try:
+                with patch.object(assets.sys, 'prefix', prefix):
+                    self.assertEqual(assets.get_asset_path('installed.css'), os.path.join(asset_dir, 'installed.css'))
+            finally:
+                assets.get_asset_path.cache_clear()
+
+    def test_get_texture_decodes_each_asset_and_size_once(self):
+        with patch.object(assets, '_load_texture', side_effect=lambda name, size: (name, size)) as load:
+            self.assertEqual(assets.get_texture('logo.png', 100), ('logo.png', 100))
+            assets.get_texture('logo.png', 100)
+            assets.get_texture('logo.png', 96)
+            assets.get_texture('logo.png')
+
+        self.assertEqual(load.call_count, 3)
+
+    def test_missing_texture_is_not_retried(self):
+        with patch.object(assets, '_load_texture', return_value=None) as load:
+            self.assertIsNone(assets.get_texture('missing.png'))
+            self.assertIsNone(assets.get_texture('missing.png'))
+
+        load.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from src.async_dav_client import AsyncDavClient, AuthenticationError, ConflictError
+    from src.utils.transport import TransportConfig
+except ImportError:
+    web = None
+
+TASK_ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VTODO
+UID:{uid}
+SUMMARY:Task {uid}
+STATUS:NEEDS-ACTION
+END:VTODO
+END:VCALENDAR"""
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncDavClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.store = {'/cal/1.ics': TASK_ICS.format(uid='1')}
+        self.calendar_query_status = 207
+        # Statuses answered before handling a request normally, one per request
+        self.fail_statuses = []
+        self.propfind_body = None
+
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self._handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.client = AsyncDavClient(str(self.server.make_url('')), 'username', 'password', '/cal/',
+                                     transport=TransportConfig(backoff_factor=0, backoff_jitter=0))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def _handle(self, request):
+        body = await request.text()
+        self.requests.append((request.method, request.path, body))
+        if self.fail_statuses:
+            return web.Response(status=self.fail_statuses.pop(0))
+
+        if request.method == 'PROPFIND' and request.headers.get('Depth') == '0':
+            return web.Response(status=207, text='<d:multistatus xmlns:d="DAV:"/>')
+        if request.method == 'PROPFIND' and self.propfind_body is not None:
+            return web.Response(status=207, text=self.propfind_body)
+        if request.method == 'PROPFIND':
+            responses = ''.join(f'<d:response><d:href>{href}</d:href></d:response>' for href in self.store)
+            return web.Response(status=207, text=f'<d:multistatus xmlns:d="DAV:">{responses}</d:multistatus>')
+        if request.method == 'REPORT' and 'calendar-query' in body:
+            if self.calendar_query_status != 207:
+                return web.Response(status=self.calendar_query_status)
+            return web.Response(status=207, text=self._multistatus(self.store))
+        if request.method == 'REPORT':
+            return web.Response(status=207, text=self._multistatus(
+                {href: ics for href, ics in self.store.items() if f'<d:href>{href}</d:href>' in body}
+            ))
+        if request.method == 'GET':
+            return web.Response(text=self.store[request.path], headers={'ETag': '"1"'})
+        if request.method == 'PUT':
+            created = request.path not in self.store
+            if not created and request.headers.get('If-None-Match') == '*':
+                return web.Response(status=412)
+            self.store[request.path] = body
+            return web.Response(status=201 if created else 204)
+        if request.method == 'DELETE':
+            if request.path not in self.store:
+                return web.Response(status=404)
+            del self.store[request.path]
+            return web.Response(status=204)
+        return web.Response(status=405)
+
+    def _multistatus(self, resources):
+        responses = ''.join(
+            f'<d:response><d:href>{href}</d:href><d:propstat><d:prop>'
+            f'<c:calendar-data>{ics}</c:calendar-data></d:prop></d:propstat></d:response>'
+            for href, ics in resources.items()
+        )
+        return (
+            '<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">'
+            f'{responses}</d:multistatus>'
+        )
+
+    async def test_authenticate(self):
+        self.assertTrue(await self.client.authenticate())
+
+    async def test_fetch_tasks(self):
+        tasks = await self.client.fetch_tasks()
+        self.assertEqual([(task['uid'], task['href']) for task in tasks], [('1', '/cal/1.ics')])
+
+    async def test_fetch_tasks_propfind_fallback(self):
+        self.calendar_query_status = 400
+        self.store['/cal/2.ics'] = TASK_ICS.format(uid='2')
+
+        tasks = await self.client.fetch_tasks()
+
+        self.assertEqual([task['uid'] for task in tasks], ['1', '2'])
+        self.assertEqual([method for method, _, _ in self.requests], ['REPORT', 'PROPFIND', 'REPORT'])
+
+    async def test_add_update_delete(self):
+        self.assertTrue(await self.client.add_task('New', 'Details'))
+        href = next(href for href in self.store if href != '/cal/1.ics')
+        self.assertIn('SUMMARY:New', self.store[href])
+
+        self.assertTrue(await self.client.update_task(href, status='completed'))
+        self.assertIn('STATUS:COMPLETED', self.store[href])
+
+        self.assertTrue(await self.client.delete_task(href))
+        self.assertNotIn(href, self.store)
+
+
+    async def test_fetch_tasks_raises_on_401(self):
+        self.calendar_query_status = 401
+        with self.assertRaises(AuthenticationError):
+            await self.client.fetch_tasks()
+
+    async def test_fetch_tasks_fails_on_broken_propfind(self):
+        self.calendar_query_status = 404
+        self.propfind_body = '<d:multistatus xmlns:d="DAV:"><d:response>'
+        self.assertIsNone(await self.client.fetch_tasks())
+
+    async def test_reads_are_retried_and_writes_are_not(self):
+        self.fail_statuses = [503]
+        tasks = await self.client.fetch_tasks()
+        self.assertEqual([task['uid'] for task in tasks], ['1'])
+        self.assertEqual(len(self.requests), 2)
+
+        self.fail_statuses = [503]
+        self.assertFalse(await self.client.delete_task('/cal/1.ics'))
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_conditional_writes(self):
+        with self.assertRaises(ConflictError):
+            await self.client.add_task('Again', uid='1')
+
+        with self.assertRaises(ConflictError):
+            await self.client.update_task('/cal/1.ics', title='Stale', etag='"0"')
+        self.assertTrue(await self.client.update_task('/cal/1.ics', title='Fresh', etag='"1"'))
+        self.assertIn('SUMMARY:Fresh', self.store['/cal/1.ics'])
+
+        self.assertTrue(await self.client.delete_task('/cal/1.ics'))
+        self.assertTrue(await self.client.delete_task('/cal/1.ics'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from src.utils.cache import TaskCache
+from src.dav_client import DavClient
+from tests.helpers import CACHE_KEY, CacheTestCase, make_task
+
+
+class TestTaskCache(CacheTestCase):
+
+    def test_full_then_incremental_changes(self):
+        self.cache.apply_changes({
+            'added': [make_task('1'), make_task('2')], 'changed': [], 'removed': [], 'sync_token': 'tok-1', 'full': True
+        })
+        self.cache.apply_changes({
+            'added': [make_task('3')], 'changed': [make_task('1', status='completed', etag='"1-2"')],
+            'removed': ['/cal/2.ics'], 'sync_token': 'tok-2', 'full': False
+        }, {'ctag': 'ctag-2', 'sync_token': 'tok-2'})
+
+        tasks = {t['uid']: t for t in self.cache.load_tasks()}
+        self.assertEqual(sorted(tasks), ['1', '3'])
+        self.assertEqual(tasks['1']['status'], 'completed')
+        self.assertEqual([t['uid'] for t in self.cache.load_tasks(status='COMPLETED')], ['1'])
+        self.assertEqual(self.cache.get_task('3')['href'], '/cal/3.ics')
+        self.assertEqual(self.cache.load_etags(), {'/cal/1.ics': '"1-2"', '/cal/3.ics': '"3-1"'})
+        self.assertEqual(self.cache.load_state(), {'sync_token': 'tok-2', 'ctag': 'ctag-2'})
+
+    def test_persists_across_connections_and_collections(self):
+        self.cache.apply_changes({
+            'added': [make_task('1')], 'changed': [], 'removed': [], 'sync_token': 't', 'full': True
+        })
+
+        reopened = TaskCache(CACHE_KEY, self.db_path)
+        other = TaskCache('other@https://example.com/cal/', self.db_path)
+        try:
+            self.assertEqual([t['uid'] for t in reopened.load_tasks()], ['1'])
+            self.assertEqual(other.load_tasks(), [])
+            self.assertIsNone(other.load_state())
+        finally:
+            reopened.close()
+            other.close()
+
+    def test_restore_client(self):
+        client = DavClient('https://example.com', 'user', 'password', '/cal/')
+        self.assertFalse(self.cache.restore_client(client))
+
+        self.cache.apply_changes({
+            'added': [make_task('1')], 'changed': [], 'removed': [], 'sync_token': 'tok-1', 'full': True
+        }, {'ctag': 'ctag-1', 'sync_token': 'tok-1'})
+        self.assertTrue(self.cache.restore_client(client))
+
+        self.assertEqual(client.sync_token, 'tok-1')
+        self.assertEqual(client.etags, {'/cal/1.ics': '"1-1"'})
+        self.assertEqual(client.collection_state, {'sync_token': 'tok-1', 'ctag': 'ctag-1'})
+
+    def test_bodies_are_kept_until_the_task_changes(self):
+        self.cache.apply_changes({
+            'added': [make_task('1'), make_task('2')], 'changed': [], 'removed': [], 'sync_token': 't', 'full': True
+        })
+        self.cache.store_bodies({
+            '/cal/1.ics': ('"1-1"', 'BODY 1'), '/cal/2.ics': ('"2-1"', 'BODY 2'), '/cal/3.ics': (None, 'X')
+        })
+
+        self.assertEqual(self.cache.get_body('/cal/1.ics'), ('"1-1"', 'BODY 1'))
+        self.assertIsNone(self.cache.get_body('/cal/3.ics'))
+
+        self.cache.apply_changes({
+            'added': [], 'changed': [make_task('1', etag='"1-2"')], 'removed': [], 'sync_token': 't2', 'full': False
+        })
+        self.assertIsNone(self.cache.get_body('/cal/1.ics'))
+        self.assertIsNotNone(self.cache.get_body('/cal/2.ics'))
+
+        self.cache.remove_tasks(['/cal/2.ics'])
+        self.assertIsNone(self.cache.get_body('/cal/2.ics'))
+
+    def test_collection_key_normalizes_like_the_client(self):
+        client = DavClient('https://example.com/', 'user', 'password', 'cal')
+        key = TaskCache.collection_key(client.server_url, client.username, client.todo_list_path)
+
+        self.assertEqual(TaskCache.collection_key('https://example.com/', 'user', 'cal'), key)
+        self.assertEqual(key, self.cache.collection)
+
+    def test_store_task(self):
+        self.cache.apply_changes({
+            'added': [dict(make_task('1'), partial=True)], 'changed': [], 'removed': [], 'sync_token': 't', 'full': True
+        })
+        self.cache.store_task(dict(make_task('1'), description='Loaded'))
+
+        stored = self.cache.get_task('1')
+        self.assertEqual(stored['description'], 'Loaded')
+        self.assertNotIn('partial', stored)
+
+    def test_remove_and_clear(self):
+        self.cache.apply_changes({
+            'added': [make_task('1'), make_task('2')], 'changed': [], 'removed': [], 'sync_token': 't', 'full': True
+        })
+        self.cache.remove_tasks(['/cal/1.ics'])
+        self.assertEqual([t['uid'] for t in self.cache.load_tasks()], ['2'])
+
+        self.cache.clear()
+        self.assertEqual(self.cache.load_tasks(), [])
+        self.assertIsNone(self.cache.load_state())
+
+
+if __name__ == '__main__':
+    unittest.main()
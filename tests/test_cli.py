@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import unittest
+from unittest.mock import MagicMock
+
+from src.cli import Cli, CliError, build_parser
+from tests.helpers import CacheTestCase, make_task
+
+
+class TestCli(CacheTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache.apply_changes({
+            'added': [make_task('b-2', 'Buy milk'), make_task('a-1', 'Answer mail', due='20250301T090000'),
+                      make_task('c-3', 'Call bank', 'completed')],
+            'changed': [], 'removed': [], 'sync_token': 't1', 'full': True,
+        })
+        self.collection_sync = MagicMock()
+        self.collection_sync.replay_outbox.return_value = {'applied': 1, 'conflicts': [], 'failed': [], 'pending': 0}
+        self.connect = MagicMock(return_value=self.collection_sync)
+        self.out = io.StringIO()
+        self.err = io.StringIO()
+        self.cli = Cli(self.cache, self.connect, self.out, self.err)
+
+    def _run(self, *argv):
+        return self.cli.run(build_parser().parse_args(argv))
+
+    def test_list_reads_warm_cache_without_connecting(self):
+        self.assertEqual(self._run('list'), 0)
+
+        self.assertEqual(self.out.getvalue().splitlines(), [
+            'a-1       [ ] Answer mail  (due 2025-03-01)',
+            'b-2       [ ] Buy milk',
+        ])
+        self.connect.assert_not_called()
+
+    def test_list_all_puts_completed_last(self):
+        self._run('list', '--all')
+        self.assertEqual(self.out.getvalue().splitlines()[-1], 'c-3       [x] Call bank')
+
+    def test_list_syncs_a_cold_cache(self):
+        self.cache.clear()
+        self.collection_sync.refresh.return_value = {'state': 'synced', 'changes': None}
+
+        self._run('list')
+
+        self.collection_sync.refresh.assert_called_once()
+
+    def test_add_journals_then_sends(self):
+        self.collection_sync.outbox.add_task.return_value = make_task('new-uid', 'New')
+
+        self.assertEqual(self._run('add', 'New', '-d', 'Details'), 0)
+
+        self.collection_sync.outbox.add_task.assert_called_once_with('New', 'Details')
+        self.collection_sync.replay_outbox.assert_called_once()
+        self.assertEqual(self.out.getvalue(), 'new-uid\n')
+
+    def test_complete_by_uid_prefix(self):
+        self._run('complete', 'b')
+        self.collection_sync.outbox.update_task.assert_called_once_with('/cal/b-2.ics', status='COMPLETED')
+
+    def test_unknown_or_ambiguous_uid(self):
+        self.cache.store_task(make_task('b-9', 'Bake bread'))
+        with self.assertRaises(CliError):
+            self._run('delete', 'z')
+        with self.assertRaises(CliError):
+            self._run('delete', 'b-')
+        self.collection_sync.outbox.delete_task.assert_not_called()
+
+    def test_unsent_write_is_reported(self):
+        self.collection_sync.replay_outbox.return_value = {'applied': 0, 'conflicts': [], 'failed': [], 'pending': 1}
+
+        self.assertEqual(self._run('delete', 'a-1'), 0)
+
+        self.assertIn('next sync', self.err.getvalue())
+
+    def test_export_fills_in_partial_tasks(self):
+        self.cache.store_task(make_task('d-4', 'Draft', partial=True))
+        self.collection_sync.load_full_task.return_value = make_task('d-4', 'Draft', description='Full text')
+
+        self._run('export')
+
+        ical_data = self.out.getvalue()
+        self.assertEqual(ical_data.count('BEGIN:VTODO'), 4)
+        self.assertIn('DESCRIPTION:Full text', ical_data)
+        self.collection_sync.load_full_task.assert_called_once_with('/cal/d-4.ics')
+
+    def test_export_takes_other_properties_from_stored_bodies(self):
+        self.cache.store_task(make_task('d-4', 'Draft', partial=True))
+        self.cache.store_bodies({'/cal/d-4.ics': ('"d-4-1"', (
+            "BEGIN:VCALENDAR\r\nBEGIN:VTODO\r\nUID:d-4\r\nSUMMARY:Old draft\r\n"
+            "RRULE:FREQ=WEEKLY\r\nCATEGORIES:Home\r\nEND:VTODO\r\nEND:VCALENDAR\r\n"
+        ))})
+
+        self._run('export')
+
+        ical_data = self.out.getvalue()
+        self.assertIn('SUMMARY:Draft', ical_data)
+        self.assertIn('RRULE:FREQ=WEEKLY', ical_data)
+        self.assertIn('CATEGORIES:Home', ical_data)
+        self.collection_sync.load_full_task.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,9 +17,18 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import time
 import unittest
-from unittest.mock import MagicMock, patch
-from src.dav_client import DavClient
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from requests.exceptions import ChunkedEncodingError
+from src.dav_client import DavClient, ConflictError, AuthenticationError, FetchError
+from src.utils.query import SUMMARY_PROPERTIES
+
+def streamed(response):
+    """Let a mocked response be read with iter_content() like a streamed one"""
+    response.iter_content.side_effect = lambda chunk_size=1: iter([response.text.encode('utf-8')])
+    return response
 
 class TestDavClient(unittest.TestCase):
 
@@ -33,17 +42,36 @@ class TestDavClient(unittest.TestCase):
         # Mock the requests session to prevent actual network calls
         self.client.session = MagicMock()
 
-    @patch('src.dav_client.requests.Session')
-    def test_authentication(self, mock_session):
+    def test_authentication(self):
         mock_response = MagicMock()
         mock_response.status_code = 207
-        mock_session.return_value.request.return_value = mock_response
+        self.client.session.request.return_value = mock_response
         
         self.assertTrue(self.client.authenticate())
 
-    @patch('src.dav_client.requests.Session')
-    def test_fetch_tasks(self, mock_session):
-        mock_response = MagicMock()
+    def test_authenticate_is_memoized_until_ttl_or_401(self):
+        self.client.session.request.return_value = MagicMock(status_code=207, ok=True)
+        
+        self.assertTrue(self.client.authenticate())
+        self.assertTrue(self.client.authenticate())
+        self.assertEqual(self.client.session.request.call_count, 1)
+        
+        # A 401 on any request forgets the login
+        self.client.session.request.return_value = MagicMock(status_code=401, ok=False)
+        with self.assertRaises(AuthenticationError):
+            self.client.fetch_tasks()
+        self.assertFalse(self.client.is_authenticated())
+        self.assertFalse(self.client.authenticate())
+        self.assertEqual(self.client.session.request.call_count, 3)
+        
+        self.client.session.request.return_value = MagicMock(status_code=207, ok=True)
+        self.client.auth_ttl = 0
+        self.assertTrue(self.client.authenticate())
+        self.assertTrue(self.client.authenticate())
+        self.assertEqual(self.client.session.request.call_count, 5)
+
+    def test_fetch_tasks(self):
+        mock_response = streamed(MagicMock())
         mock_response.status_code = 207
         mock_response.text = """
         <multistatus xmlns="DAV:">
@@ -66,11 +94,588 @@ END:VCALENDAR</calendar-data>
           </response>
         </multistatus>
         """
-        mock_session.return_value.request.return_value = mock_response
+        self.client.session.request.return_value = mock_response
         
         tasks = self.client.fetch_tasks()
         self.assertIsInstance(tasks, list)
         self.assertTrue(len(tasks) > 0)
 
+    def test_sync_tasks_incremental(self):
+        self.client.sync_token = 'http://example.com/sync/1'
+        self.client.etags = {
+            '/calendars/user/default/task1.ics': '"1"',
+            '/calendars/user/default/task2.ics': '"1"',
+        }
+        mock_response = streamed(MagicMock())
+        mock_response.status_code = 207
+        mock_response.text = """<?xml version="1.0" encoding="utf-8" ?>
+        <d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+          <d:response>
+            <d:href>/calendars/user/default/task1.ics</d:href>
+            <d:propstat>
+              <d:prop>
+                <d:getetag>"2"</d:getetag>
+                <c:calendar-data>BEGIN:VCALENDAR
+BEGIN:VTODO
+UID:1
+SUMMARY:Changed Task
+END:VTODO
+END:VCALENDAR</c:calendar-data>
+              </d:prop>
+              <d:status>HTTP/1.1 200 OK</d:status>
+            </d:propstat>
+          </d:response>
+          <d:response>
+            <d:href>/calendars/user/default/task3.ics</d:href>
+            <d:propstat>
+              <d:prop>
+                <d:getetag>"1"</d:getetag>
+                <c:calendar-data>BEGIN:VCALENDAR
+BEGIN:VTODO
+UID:3
+SUMMARY:New Task
+END:VTODO
+END:VCALENDAR</c:calendar-data>
+              </d:prop>
+              <d:status>HTTP/1.1 200 OK</d:status>
+            </d:propstat>
+          </d:response>
+          <d:response>
+            <d:href>/calendars/user/default/task2.ics</d:href>
+            <d:status>HTTP/1.1 404 Not Found</d:status>
+          </d:response>
+          <d:sync-token>http://example.com/sync/2</d:sync-token>
+        </d:multistatus>
+        """
+        self.client.session.request.return_value = mock_response
+        
+        result = self.client.sync_tasks()
+        
+        body = self.client.session.request.call_args.kwargs['data']
+        self.assertIn('<d:sync-token>http://example.com/sync/1</d:sync-token>', body)
+        self.assertFalse(result['full'])
+        self.assertEqual([task['uid'] for task in result['changed']], ['1'])
+        self.assertEqual([task['uid'] for task in result['added']], ['3'])
+        self.assertEqual(result['removed'], ['/calendars/user/default/task2.ics'])
+        self.assertEqual(result['sync_token'], 'http://example.com/sync/2')
+        self.assertEqual(self.client.sync_token, 'http://example.com/sync/2')
+        self.assertEqual(self.client.etags, {
+            '/calendars/user/default/task1.ics': '"2"',
+            '/calendars/user/default/task3.ics': '"1"',
+        })
+
+    def _sync_page(self, uids, token, truncated=False):
+        response = streamed(MagicMock())
+        response.status_code = 207
+        response.text = (
+            '<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">' + ''.join(
+                f'<d:response><d:href>/calendars/username/default/{uid}.ics</d:href><d:propstat><d:prop>'
+                f'<d:getetag>"{uid}"</d:getetag><c:calendar-data>BEGIN:VCALENDAR\nBEGIN:VTODO\nUID:{uid}\n'
+                f'END:VTODO\nEND:VCALENDAR</c:calendar-data></d:prop></d:propstat></d:response>' for uid in uids
+            ) + (
+                '<d:response><d:href>/calendars/username/default/</d:href>'
+                '<d:status>HTTP/1.1 507 Insufficient Storage</d:status></d:response>' if truncated else ''
+            ) + f'<d:sync-token>{token}</d:sync-token></d:multistatus>'
+        )
+        return response
+
+    def test_sync_tasks_completes_a_truncated_result(self):
+        self.client.etags = {'/calendars/username/default/b.ics': '"b"'}
+        self.client.session.request.side_effect = [
+            self._sync_page(['a'], 'sync/1', truncated=True),
+            self._sync_page(['b'], 'sync/2'),
+        ]
+
+        result = self.client.sync_tasks()
+
+        second_body = self.client.session.request.call_args_list[1].kwargs['data']
+        self.assertIn('<d:sync-token>sync/1</d:sync-token>', second_body)
+        self.assertTrue(result['full'])
+        self.assertEqual(result['removed'], [])
+        self.assertEqual(sorted(self.client.etags), ['/calendars/username/default/a.ics',
+                                                     '/calendars/username/default/b.ics'])
+        self.assertEqual(self.client.sync_token, 'sync/2')
+
+        # Without the rest of the result nothing is applied
+        self.client.sync_token = None
+        failed = streamed(MagicMock())
+        failed.status_code = 500
+        self.client.session.request.side_effect = [self._sync_page(['a'], 'sync/3', truncated=True), failed]
+        self.assertIsNone(self.client.sync_tasks())
+        self.assertIsNone(self.client.sync_token)
+
+    def test_sync_tasks_falls_back_to_calendar_query(self):
+        unsupported = MagicMock()
+        unsupported.status_code = 403
+        unsupported.text = ''
+        full = streamed(MagicMock())
+        full.status_code = 207
+        full.text = """<multistatus xmlns="DAV:">
+          <response>
+            <href>/calendars/user/default/task1.ics</href>
+            <propstat>
+              <prop>
+                <calendar-data xmlns="urn:ietf:params:xml:ns:caldav">BEGIN:VCALENDAR
+BEGIN:VTODO
+UID:1
+SUMMARY:Task
+END:VTODO
+END:VCALENDAR</calendar-data>
+              </prop>
+            </propstat>
+          </response>
+        </multistatus>"""
+        self.client.session.request.side_effect = [unsupported, full]
+        
+        result = self.client.sync_tasks()
+        
+        self.assertTrue(result['full'])
+        self.assertIsNone(result['sync_token'])
+        self.assertEqual([task['uid'] for task in result['added']], ['1'])
+
+    def test_sync_tasks_fallback_fails_on_a_broken_listing(self):
+        unsupported = MagicMock(status_code=403, text='')
+        broken = MagicMock(status_code=207)
+        body = self._multiget_response([1, 2]).text.encode('utf-8')
+        
+        def iter_content(chunk_size=1):
+            yield body[:body.index(b'</d:response>') + len(b'</d:response>')]
+            raise ChunkedEncodingError('connection dropped')
+        
+        broken.iter_content.side_effect = iter_content
+        self.client.session.request.side_effect = [unsupported, broken]
+        
+        # A full result listing only task 1 would have the cache drop every other task
+        self.assertIsNone(self.client.sync_tasks())
+        self.assertEqual(self.client.etags, {})
+
+    def test_iter_tasks_raises_on_failure(self):
+        self.client.session.request.return_value = MagicMock(status_code=500)
+        
+        with self.assertRaises(FetchError):
+            list(self.client.iter_tasks())
+        self.assertIsNone(self.client.fetch_tasks())
+
+    def test_has_collection_changed(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 207
+        mock_response.text = """<d:multistatus xmlns:d="DAV:" xmlns:cs="http://calendarserver.org/ns/">
+          <d:response>
+            <d:href>/calendars/username/default/</d:href>
+            <d:propstat>
+              <d:prop>
+                <cs:getctag>ctag-1</cs:getctag>
+                <d:sync-token>http://example.com/sync/1</d:sync-token>
+              </d:prop>
+            </d:propstat>
+          </d:response>
+        </d:multistatus>"""
+        self.client.session.request.return_value = mock_response
+        
+        self.assertTrue(self.client.has_collection_changed())
+        self.assertFalse(self.client.has_collection_changed())
+        self.assertEqual(self.client.session.request.call_args.kwargs['headers']['Depth'], '0')
+        
+        mock_response.text = mock_response.text.replace('ctag-1', 'ctag-2')
+        self.assertTrue(self.client.has_collection_changed())
+
+    def test_sync_by_etags_refetches_only_changed(self):
+        self.client.etags = {
+            '/cal/a.ics': '"1"',
+            '/cal/b.ics': '"1"',
+            '/cal/gone.ics': '"1"',
+        }
+        unsupported = MagicMock()
+        unsupported.status_code = 501
+        unsupported.text = ''
+        listing = MagicMock()
+        listing.status_code = 207
+        listing.text = """<d:multistatus xmlns:d="DAV:">
+          <d:response>
+            <d:href>/cal/</d:href>
+            <d:propstat><d:prop><d:resourcetype><d:collection /></d:resourcetype></d:prop></d:propstat>
+          </d:response>
+          <d:response>
+            <d:href>/cal/a.ics</d:href>
+            <d:propstat><d:prop><d:resourcetype /><d:getetag>"1"</d:getetag></d:prop></d:propstat>
+          </d:response>
+          <d:response>
+            <d:href>/cal/b.ics</d:href>
+            <d:propstat><d:prop><d:resourcetype /><d:getetag>"2"</d:getetag></d:prop></d:propstat>
+          </d:response>
+        </d:multistatus>"""
+        changed = streamed(MagicMock())
+        changed.status_code = 207
+        changed.text = """<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+          <d:response>
+            <d:href>/cal/b.ics</d:href>
+            <d:propstat><d:prop><d:getetag>"2"</d:getetag><c:calendar-data>BEGIN:VCALENDAR
+BEGIN:VTODO
+UID:b
+SUMMARY:B
+END:VTODO
+END:VCALENDAR</c:calendar-data></d:prop></d:propstat>
+          </d:response>
+        </d:multistatus>"""
+        self.client.session.request.side_effect = [unsupported, listing, changed]
+        
+        result = self.client.sync_tasks()
+        
+        self.assertEqual(self.client.session.request.call_count, 3)
+        body = self.client.session.request.call_args.kwargs['data']
+        self.assertIn('<d:href>/cal/b.ics</d:href>', body)
+        self.assertNotIn('/cal/a.ics', body)
+        self.assertEqual([task['uid'] for task in result['changed']], ['b'])
+        self.assertEqual(result['removed'], ['/cal/gone.ics'])
+        self.assertEqual(self.client.etags, {'/cal/a.ics': '"1"', '/cal/b.ics': '"2"'})
+
+    def test_iter_tasks_streams_responses(self):
+        body = self._multiget_response(range(50)).text.encode('utf-8')
+        chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+        consumed = []
+        
+        def iter_content(chunk_size=1):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 207
+        mock_response.iter_content.side_effect = iter_content
+        self.client.session.request.return_value = mock_response
+        
+        tasks = self.client.iter_tasks()
+        first = next(tasks)
+        
+        self.assertEqual(first['uid'], '0')
+        self.assertLess(len(consumed), len(chunks))
+        self.assertEqual([task['uid'] for task in tasks], [str(uid) for uid in range(1, 50)])
+        self.assertTrue(self.client.session.request.call_args.kwargs['stream'])
+        self.assertEqual(len(self.client.etags), 50)
+        mock_response.close.assert_called()
+
+    def test_fetch_tasks_filters_on_server(self):
+        self.client.etags = {'/cal/old.ics': '"1"'}
+        self.client.session.request.side_effect = [self._multiget_response([1]), self._multiget_response(['none'])]
+        
+        tasks = self.client.fetch_tasks(exclude_status=('completed',),
+                                        completed_since=datetime(2026, 1, 1, tzinfo=timezone.utc))
+        
+        self.assertEqual([task['uid'] for task in tasks], ['1', 'none'])
+        body, undefined = (call.kwargs['data'] for call in self.client.session.request.call_args_list)
+        self.assertIn('<c:text-match collation="i;ascii-casemap" negate-condition="yes">COMPLETED</c:text-match>', body)
+        self.assertIn('<c:prop-filter name="COMPLETED"><c:time-range start="20260101T000000Z" /></c:prop-filter>', body)
+        # Tasks without a STATUS fail the negated match and come from a second query
+        self.assertIn('<c:prop-filter name="STATUS"><c:is-not-defined /></c:prop-filter>', undefined)
+        self.assertNotIn('negate-condition', undefined)
+        self.assertIn('<c:prop-filter name="COMPLETED"><c:time-range start="20260101T000000Z" /></c:prop-filter>', undefined)
+        # A partial listing must not replace the ETags used by incremental sync
+        self.assertEqual(self.client.etags, {'/cal/old.ics': '"1"'})
+
+    def test_rejected_filter_is_applied_locally(self):
+        rejected = MagicMock(status_code=403)
+        full = streamed(MagicMock())
+        full.status_code = 207
+        full.text = '<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">' + ''.join(
+            f'<d:response><d:href>/cal/{uid}.ics</d:href><d:propstat><d:prop><c:calendar-data>'
+            f'BEGIN:VCALENDAR\nBEGIN:VTODO\nUID:{uid}\nSTATUS:{status}\nEND:VTODO\nEND:VCALENDAR'
+            f'</c:calendar-data></d:prop></d:propstat></d:response>'
+            for uid, status in (('open', 'NEEDS-ACTION'), ('done', 'COMPLETED'))
+        ) + '</d:multistatus>'
+        self.client.session.request.side_effect = [rejected, full]
+        
+        tasks = self.client.fetch_tasks(exclude_status=('COMPLETED', 'CANCELLED'))
+        
+        self.assertEqual([task['uid'] for task in tasks], ['open'])
+        self.assertNotIn('prop-filter', self.client.session.request.call_args.kwargs['data'])
+        self.assertEqual(set(self.client.etags), {'/cal/open.ics', '/cal/done.ics'})
+
+    def _vtodo_response(self, *vtodos):
+        response = streamed(MagicMock())
+        response.status_code = 207
+        response.text = '<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">' + ''.join(
+            f'<d:response><d:href>/cal/{uid}.ics</d:href><d:propstat><d:prop><c:calendar-data>'
+            f'BEGIN:VCALENDAR\nBEGIN:VTODO\nUID:{uid}\n{lines}END:VTODO\nEND:VCALENDAR'
+            f'</c:calendar-data></d:prop></d:propstat></d:response>'
+            for uid, lines in vtodos
+        ) + '</d:multistatus>'
+        return response
+
+    def test_rejected_partial_filter_fetches_what_it_filters_on(self):
+        self.client.session.request.side_effect = [MagicMock(status_code=403), self._vtodo_response(
+            ('recent', 'STATUS:COMPLETED\nCOMPLETED:20260105T000000Z\n'),
+            ('old', 'STATUS:COMPLETED\nCOMPLETED:20250105T000000Z\n'),
+        )]
+
+        tasks = self.client.fetch_tasks(completed_since=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                                        properties=SUMMARY_PROPERTIES)
+
+        self.assertEqual([task['uid'] for task in tasks], ['recent'])
+        self.assertIn('<c:prop name="COMPLETED" />', self.client.session.request.call_args.kwargs['data'])
+
+    def test_rejected_is_not_defined_is_applied_locally(self):
+        self.client.session.request.side_effect = [
+            self._vtodo_response(('open', 'STATUS:NEEDS-ACTION\n')),
+            MagicMock(status_code=400),
+            self._vtodo_response(('open', 'STATUS:NEEDS-ACTION\n'), ('done', 'STATUS:COMPLETED\n'), ('none', '')),
+        ]
+
+        tasks = self.client.fetch_tasks(exclude_status=('COMPLETED',), properties=('UID', 'SUMMARY'))
+
+        self.assertEqual([task['uid'] for task in tasks], ['open', 'none'])
+        self.assertIn('<c:prop name="STATUS" />', self.client.session.request.call_args.kwargs['data'])
+
+    def test_partial_fetch_is_not_an_update_base(self):
+        self.client.ical_cache['/cal/1.ics'] = ('"old"', 'BEGIN:VCALENDAR\nEND:VCALENDAR')
+        self.client.session.request.return_value = self._multiget_response([1])
+        
+        tasks = self.client.fetch_tasks(properties=SUMMARY_PROPERTIES)
+        
+        self.assertTrue(tasks[0]['partial'])
+        self.assertNotIn('/cal/1.ics', self.client.ical_cache)
+        body = self.client.session.request.call_args.kwargs['data']
+        self.assertIn('<c:comp name="VTODO"><c:prop name="UID" /><c:prop name="SUMMARY" />', body)
+        
+        full = MagicMock(status_code=200, text='BEGIN:VCALENDAR\nBEGIN:VTODO\nUID:1\nDESCRIPTION:Long\nEND:VTODO\nEND:VCALENDAR',
+                         headers={'ETag': '"2"'})
+        self.client.session.request.return_value = full
+        task = self.client.fetch_task('/cal/1.ics')
+        self.assertEqual(task['description'], 'Long')
+        self.assertNotIn('partial', task)
+        self.assertEqual(self.client.ical_cache['/cal/1.ics'][0], '"2"')
+
+    def _propfind_listing(self, count):
+        listing = MagicMock()
+        listing.status_code = 207
+        listing.text = '<d:multistatus xmlns:d="DAV:">' + ''.join(
+            f'<d:response><d:href>/cal/{i}.ics</d:href></d:response>' for i in range(count)
+        ) + '</d:multistatus>'
+        return listing
+
+    def _multiget_response(self, uids):
+        response = streamed(MagicMock())
+        response.status_code = 207
+        response.text = '<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">' + ''.join(
+            f'<d:response><d:href>/cal/{uid}.ics</d:href><d:propstat><d:prop>'
+            f'<c:calendar-data>BEGIN:VCALENDAR\nBEGIN:VTODO\nUID:{uid}\nEND:VTODO\nEND:VCALENDAR</c:calendar-data>'
+            f'</d:prop></d:propstat></d:response>' for uid in uids
+        ) + '</d:multistatus>'
+        return response
+
+    def test_propfind_fallback_uses_chunked_multiget(self):
+        self.client.multiget_chunk_size = 2
+        rejected = MagicMock()
+        rejected.status_code = 400
+        rejected.text = ''
+        self.client.session.request.side_effect = [
+            rejected,
+            self._propfind_listing(5),
+            self._multiget_response([0, 1]),
+            self._multiget_response([2, 3]),
+            self._multiget_response([4]),
+        ]
+        
+        tasks = self.client.fetch_tasks()
+        
+        self.assertEqual([task['uid'] for task in tasks], ['0', '1', '2', '3', '4'])
+        methods = [call.args[0] for call in self.client.session.request.call_args_list]
+        self.assertEqual(methods, ['REPORT', 'PROPFIND', 'REPORT', 'REPORT', 'REPORT'])
+        self.assertTrue(self.client.multiget_supported)
+
+    def test_propfind_fallback_fails_when_a_multiget_chunk_fails(self):
+        self.client.multiget_chunk_size = 1
+        self.client.etags = {'/cal/0.ics': '"0"', '/cal/1.ics': '"1"'}
+        rejected = MagicMock()
+        rejected.status_code = 400
+        rejected.text = ''
+        failed = streamed(MagicMock())
+        failed.status_code = 500
+        self.client.session.request.side_effect = [
+            rejected,
+            self._propfind_listing(2),
+            self._multiget_response([0]),
+            failed,
+        ]
+        
+        self.assertIsNone(self.client.fetch_tasks())
+        self.assertEqual(self.client.etags, {'/cal/0.ics': '"0"', '/cal/1.ics': '"1"'})
+
+    def test_propfind_fallback_without_multiget_uses_get(self):
+        rejected = MagicMock()
+        rejected.status_code = 400
+        rejected.text = ''
+        responses = [rejected, self._propfind_listing(2), rejected]
+        
+        def request(method, url, **kwargs):
+            if method != 'GET':
+                return responses.pop(0)
+            uid = url.rsplit('/', 1)[1].split('.')[0]
+            get_response = MagicMock()
+            get_response.status_code = 200
+            get_response.headers = {}
+            get_response.text = f"BEGIN:VCALENDAR\nBEGIN:VTODO\nUID:{uid}\nEND:VTODO\nEND:VCALENDAR"
+            return get_response
+        self.client.session.request.side_effect = request
+        
+        tasks = self.client.fetch_tasks()
+        
+        self.assertEqual([task['uid'] for task in tasks], ['0', '1'])
+        methods = [call.args[0] for call in self.client.session.request.call_args_list]
+        self.assertEqual(methods, ['REPORT', 'PROPFIND', 'REPORT', 'GET', 'GET'])
+        self.assertFalse(self.client.multiget_supported)
+
+    def test_map_concurrent_preserves_order(self):
+        self.client.max_workers = 4
+        
+        def slow_square(value):
+            time.sleep(0.01 * (5 - value))
+            return value * value
+        
+        self.assertEqual(self.client._map_concurrent(slow_square, range(5)), [0, 1, 4, 9, 16])
+
+    def test_bulk_writes_report_per_item_results(self):
+        self.client.max_workers = 4
+        
+        def request(method, url, **kwargs):
+            if url.endswith('/taken.ics'):
+                return self._response(412)
+            if method == 'DELETE':
+                return self._response({'gone': 404, 'keep': 412}.get(url.rsplit('/', 1)[-1][:-4], 204))
+            return self._response(201, headers={'ETag': f'"{url.rsplit("/", 1)[-1]}"'})
+        self.client.session.request.side_effect = request
+        
+        progress = []
+        results = self.client.add_tasks(
+            [{'title': f'Task {uid}', 'uid': uid} for uid in ('a', 'b', 'taken', 'c')],
+            progress=lambda done, total, result: progress.append((done, total))
+        )
+        
+        self.assertEqual([result['ok'] for result in results], [True, True, False, True])
+        self.assertEqual(results[0]['etag'], '"a.ics"')
+        self.assertEqual(results[2]['status'], 412)
+        self.assertTrue(results[2]['conflict'])
+        self.assertEqual(progress, [(1, 4), (2, 4), (3, 4), (4, 4)])
+        self.assertIn('/calendars/username/default/b.ics', self.client.ical_cache)
+        
+        # A task that is already gone counts as deleted
+        results = self.client.delete_tasks(['/cal/a.ics', '/cal/gone.ics', {'href': '/cal/keep.ics', 'etag': '"1"'}])
+        self.assertEqual([(result['ok'], result['status']) for result in results],
+                         [(True, 204), (True, 404), (False, 412)])
+        self.assertTrue(results[2]['conflict'])
+        keep = next(call for call in self.client.session.request.call_args_list if call.args[1].endswith('keep.ics'))
+        self.assertEqual(keep.kwargs['headers']['If-Match'], '"1"')
+
+    def test_update_tasks_flags_conflicts(self):
+        self.client.ical_cache['/cal/1.ics'] = ('"1"', 'BEGIN:VCALENDAR\nBEGIN:VTODO\nUID:1\nEND:VTODO\nEND:VCALENDAR')
+        self.client.ical_cache['/cal/2.ics'] = ('"1"', 'BEGIN:VCALENDAR\nBEGIN:VTODO\nUID:2\nEND:VTODO\nEND:VCALENDAR')
+        self.client.session.request.side_effect = lambda method, url, **kwargs: (
+            self._response(412) if url.endswith('2.ics') else self._response(204, headers={'ETag': '"2"'})
+        )
+        
+        results = self.client.update_tasks([
+            {'href': '/cal/1.ics', 'status': 'COMPLETED', 'etag': '"1"'},
+            {'href': '/cal/2.ics', 'status': 'COMPLETED', 'etag': '"1"'},
+        ])
+        
+        self.assertEqual([(result['ok'], result['etag'], result['conflict']) for result in results],
+                         [(True, '"2"', False), (False, None, True)])
+        self.assertEqual(self.client.ical_cache['/cal/1.ics'][0], '"2"')
+
+    def _response(self, status_code, text='', headers=None):
+        response = MagicMock()
+        response.status_code = status_code
+        response.text = text
+        response.headers = headers or {}
+        return response
+
+    def test_update_task_uses_if_match_without_get(self):
+        href = '/calendars/username/default/1.ics'
+        self.client.ical_cache[href] = ('"1"', "BEGIN:VTODO\nUID:1\nSTATUS:NEEDS-ACTION\nEND:VTODO")
+        self.client.session.request.return_value = self._response(204, headers={'ETag': '"2"'})
+        
+        self.assertTrue(self.client.update_task(href, status='completed'))
+        
+        self.assertEqual(self.client.session.request.call_count, 1)
+        call = self.client.session.request.call_args
+        self.assertEqual(call.args[0], 'PUT')
+        self.assertEqual(call.kwargs['headers']['If-Match'], '"1"')
+        self.assertIn('STATUS:COMPLETED', call.kwargs['data'])
+        self.assertEqual(self.client.ical_cache[href][0], '"2"')
+
+    def test_unparsed_properties_and_line_endings_survive_an_update(self):
+        href = '/calendars/username/default/1.ics'
+        ical_data = "BEGIN:VCALENDAR\r\nBEGIN:VTODO\r\nUID:1\r\nSUMMARY:Old\r\nRRULE:FREQ=DAILY\r\nEND:VTODO\r\nEND:VCALENDAR\r\n"
+        self.client.session.request.return_value = self._response(200, ical_data, {'ETag': '"1"'})
+        task = self.client.fetch_task(href)
+        self.assertEqual(task['title'], 'Old')
+        self.assertNotIn('rrule', task)
+        self.client.session.request.return_value = self._response(204, headers={'ETag': '"2"'})
+
+        self.assertTrue(self.client.update_task(href, title='New'))
+
+        body = self.client.session.request.call_args.kwargs['data']
+        self.assertIn('\r\nSUMMARY:New\r\nRRULE:FREQ=DAILY\r\n', body)
+        self.assertNotIn('\n', body.replace('\r\n', ''))
+
+    def test_status_changes_stamp_and_clear_completed(self):
+        done = self.client._apply_task_changes("BEGIN:VTODO\nUID:1\nSTATUS:NEEDS-ACTION\nEND:VTODO", status='completed')
+        self.assertRegex(done, r'\nCOMPLETED:\d{8}T\d{6}Z\n')
+        self.assertTrue(done.endswith('\nEND:VTODO'))
+        
+        reopened = self.client._apply_task_changes(done, status='needs-action', description='')
+        self.assertIn('STATUS:NEEDS-ACTION', reopened)
+        self.assertNotIn('COMPLETED:', reopened)
+        self.assertNotIn('DESCRIPTION', reopened)
+
+    def test_update_task_rereads_on_precondition_failed(self):
+        href = '/calendars/username/default/1.ics'
+        self.client.ical_cache[href] = ('"1"', "BEGIN:VTODO\nUID:1\nSUMMARY:Old\nEND:VTODO")
+        self.client.session.request.side_effect = [
+            self._response(412),
+            self._response(200, "BEGIN:VTODO\nUID:1\nSUMMARY:Theirs\nSTATUS:IN-PROCESS\nEND:VTODO", {'ETag': '"5"'}),
+            self._response(204, headers={'ETag': '"6"'}),
+        ]
+        
+        self.assertTrue(self.client.update_task(href, title='Mine'))
+        
+        methods = [call.args[0] for call in self.client.session.request.call_args_list]
+        self.assertEqual(methods, ['PUT', 'GET', 'PUT'])
+        retry = self.client.session.request.call_args
+        self.assertEqual(retry.kwargs['headers']['If-Match'], '"5"')
+        self.assertIn('SUMMARY:Mine', retry.kwargs['data'])
+        self.assertIn('STATUS:IN-PROCESS', retry.kwargs['data'])
+
+    def test_update_task_reads_unknown_task_first(self):
+        self.client.session.request.side_effect = [
+            self._response(200, "BEGIN:VTODO\nUID:1\nSUMMARY:Old\nEND:VTODO", {'ETag': '"1"'}),
+            self._response(204),
+        ]
+        
+        self.assertTrue(self.client.update_task('/cal/1.ics', title='New'))
+        
+        methods = [call.args[0] for call in self.client.session.request.call_args_list]
+        self.assertEqual(methods, ['GET', 'PUT'])
+        self.assertEqual(self.client.session.request.call_args.kwargs['headers']['If-Match'], '"1"')
+        self.assertNotIn('/cal/1.ics', self.client.ical_cache)
+
+    def test_conditional_writes_raise_conflict(self):
+        href = '/calendars/username/default/1.ics'
+        
+        # The server copy moved on from the version the change was made against
+        self.client.session.request.return_value = self._response(
+            200, "BEGIN:VTODO\nUID:1\nSUMMARY:Theirs\nEND:VTODO", {'ETag': '"2"'}
+        )
+        with self.assertRaises(ConflictError):
+            self.client.update_task(href, title='Mine', etag='"1"')
+        self.assertEqual([call.args[0] for call in self.client.session.request.call_args_list], ['GET'])
+        
+        self.client.session.request.return_value = self._response(412)
+        with self.assertRaises(ConflictError):
+            self.client.delete_task(href, etag='"1"')
+        self.assertEqual(self.client.session.request.call_args.kwargs['headers']['If-Match'], '"1"')
+        with self.assertRaises(ConflictError):
+            self.client.add_task('Title', uid='1')
+        self.assertFalse(self.client.add_task('Title'))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+
+from src.utils.ical import parse_vtodo, replace_property, escape_text, split_content_line, build_vcalendar
+
+VTODO = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "BEGIN:VTODO\r\n"
+    "UID:abc-123\r\n"
+    "SUMMARY;LANGUAGE=en:Buy milk\\, eggs\r\n"
+    "DESCRIPTION:First line\\nsecond line that is long enough to be fol\r\n"
+    " ded by the server\r\n"
+    "STATUS:IN-PROCESS\r\n"
+    "DUE;TZID=Europe/Berlin:20250301T090000\r\n"
+    "PRIORITY:1\r\n"
+    "PERCENT-COMPLETE:40\r\n"
+    "RRULE:FREQ=WEEKLY;BYDAY=MO\r\n"
+    "CATEGORIES:Home,Errands\r\n"
+    "CATEGORIES:Semi\\;colon\r\n"
+    "ORGANIZER;CN=\"Doe: John\":mailto:john@example.com\r\n"
+    "BEGIN:VALARM\r\n"
+    "ACTION:DISPLAY\r\n"
+    "DESCRIPTION:Reminder\r\n"
+    "END:VALARM\r\n"
+    "END:VTODO\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+class TestIcal(unittest.TestCase):
+
+    def test_parse_vtodo(self):
+        todo = parse_vtodo(VTODO)
+        self.assertEqual(todo['uid'], 'abc-123')
+        self.assertEqual(todo['title'], 'Buy milk, eggs')
+        self.assertEqual(todo['description'], 'First line\nsecond line that is long enough to be folded by the server')
+        self.assertEqual(todo['status'], 'in-process')
+        self.assertEqual(todo['due'], '20250301T090000')
+        self.assertEqual(todo['due_tzid'], 'Europe/Berlin')
+        self.assertEqual(todo['priority'], 1)
+        self.assertEqual(todo['percent_complete'], 40)
+        self.assertEqual(todo['rrule'], 'FREQ=WEEKLY;BYDAY=MO')
+        self.assertEqual(todo['categories'], ['Home', 'Errands', 'Semi;colon'])
+        self.assertEqual(todo['organizer'], 'mailto:john@example.com')
+
+    def test_parse_vtodo_with_properties(self):
+        todo = parse_vtodo(VTODO, ('UID', 'SUMMARY', 'DESCRIPTION', 'STATUS', 'DUE', 'PRIORITY'))
+        full = parse_vtodo(VTODO)
+        self.assertEqual(set(todo), {'uid', 'title', 'description', 'status', 'due', 'due_tzid', 'priority'})
+        self.assertEqual(todo, {key: full[key] for key in todo})
+        self.assertEqual(parse_vtodo(VTODO, ('CATEGORIES',)), {'categories': full['categories']})
+
+    def test_parse_vtodo_stops_once_properties_are_found(self):
+        # The last requested property is folded and followed by one with a TZID that was not asked for
+        todo = parse_vtodo(VTODO, ('UID', 'DESCRIPTION'))
+        self.assertEqual(todo, {'uid': 'abc-123', 'description': parse_vtodo(VTODO)['description']})
+        todo = parse_vtodo(VTODO, ('UID', 'DUE', 'STATUS'))
+        self.assertEqual(todo, {'uid': 'abc-123', 'status': 'in-process',
+                                'due': '20250301T090000', 'due_tzid': 'Europe/Berlin'})
+
+    def test_parse_vtodo_without_vtodo(self):
+        self.assertEqual(parse_vtodo("BEGIN:VCALENDAR\nBEGIN:VEVENT\nUID:1\nEND:VEVENT\nEND:VCALENDAR"), {})
+
+    def test_split_content_line_with_quoted_params(self):
+        name, params, value = split_content_line('ATTENDEE;CN="Doe; Jane: PhD";ROLE=CHAIR:mailto:jane@example.com')
+        self.assertEqual(name, 'ATTENDEE')
+        self.assertEqual(params, {'CN': 'Doe; Jane: PhD', 'ROLE': 'CHAIR'})
+        self.assertEqual(value, 'mailto:jane@example.com')
+
+    def test_escape_round_trip(self):
+        text = 'a, b; c\\d\nnext'
+        todo = parse_vtodo(f"BEGIN:VTODO\nSUMMARY:{escape_text(text)}\nEND:VTODO")
+        self.assertEqual(todo['title'], text)
+
+    def test_replace_property_with_params_and_folding(self):
+        updated = replace_property(VTODO, 'DESCRIPTION', 'New')
+        todo = parse_vtodo(updated)
+        self.assertEqual(todo['description'], 'New')
+        self.assertNotIn('ded by the server', updated)
+        self.assertIn('DESCRIPTION:Reminder', updated)
+        self.assertIn('DESCRIPTION:New', replace_property("SUMMARY;LANGUAGE=en:Old\nDESCRIPTION;ALTREP=x:Old", 'DESCRIPTION', 'New'))
+        self.assertIn('SUMMARY:New', replace_property("SUMMARY;LANGUAGE=en:Old", 'SUMMARY', 'New'))
+
+    def test_replace_property_keeps_line_endings(self):
+        updated = replace_property(VTODO, 'SUMMARY', 'New')
+        self.assertTrue(updated.endswith('END:VCALENDAR\r\n'))
+        self.assertNotIn('\n', updated.replace('\r\n', ''))
+        self.assertEqual(replace_property("BEGIN:VTODO\nSUMMARY:Old\nEND:VTODO", 'SUMMARY', 'New'),
+                         "BEGIN:VTODO\nSUMMARY:New\nEND:VTODO")
+
+    def test_replace_property_adds_and_removes(self):
+        added = replace_property(VTODO, 'COMPLETED', '20260101T000000Z')
+        self.assertEqual(parse_vtodo(added)['completed'], '20260101T000000Z')
+        removed = replace_property(added, 'COMPLETED', None)
+        self.assertNotIn('COMPLETED', removed)
+        self.assertEqual(parse_vtodo(removed), parse_vtodo(VTODO))
+
+    def test_build_vcalendar_round_trip(self):
+        task = parse_vtodo(VTODO)
+        task['title'] = 'Ünïcödé ' * 20
+
+        ical_data = build_vcalendar([task])
+
+        self.assertTrue(all(len(line.encode('utf-8')) <= 75 for line in ical_data.split('\r\n')))
+        self.assertEqual(parse_vtodo(ical_data), task)
+
+if __name__ == '__main__':
+    unittest.main()
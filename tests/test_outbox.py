@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+from unittest.mock import MagicMock
+
+from src.utils.cache import TaskCache
+from src.outbox import Outbox, ConflictError
+
+
+class TestOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = TaskCache('user@https://example.com/cal/', ':memory:')
+        self.cache.apply_changes({
+            'added': [{'uid': '1', 'title': 'Old', 'status': 'needs-action', 'href': '/cal/1.ics', 'etag': '"1"'}],
+            'changed': [], 'removed': [], 'sync_token': 'tok', 'full': True
+        })
+        self.client = MagicMock()
+        self.client.todo_list_path = '/cal/'
+        self.client.ical_cache = {}
+        self.outbox = Outbox(self.cache, self.client)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_writes_apply_locally_without_network(self):
+        added = self.outbox.add_task('New')
+        self.outbox.update_task('/cal/1.ics', status='COMPLETED')
+
+        self.client.assert_not_called()
+        self.assertEqual(self.cache.get_task(added['uid'])['href'], added['href'])
+        self.assertEqual(self.cache.get_task('1')['status'], 'completed')
+        self.assertEqual(self.outbox.pending_count(), 2)
+
+    def test_pending_writes_to_one_task_are_merged(self):
+        added = self.outbox.add_task('New')
+        self.outbox.update_task(added['href'], title='Renamed')
+        self.outbox.update_task('/cal/1.ics', title='Mine')
+        self.outbox.update_task('/cal/1.ics', status='COMPLETED')
+        self.outbox.delete_task(added['href'])
+
+        mutations = self.cache.load_mutations()
+        self.assertEqual([(m['action'], m['href'], m['etag']) for m in mutations], [('update', '/cal/1.ics', '"1"')])
+        self.assertEqual(mutations[0]['fields'], {'title': 'Mine', 'status': 'COMPLETED'})
+        self.assertIsNone(self.cache.get_task(added['uid']))
+
+    def test_replay_in_order_with_etags(self):
+        added = self.outbox.add_task('New')
+        self.outbox.update_task('/cal/1.ics', title='Mine')
+        self.client.authenticate.return_value = True
+        self.client.add_task.return_value = True
+        self.client.update_task.return_value = True
+        self.client.ical_cache = {'/cal/1.ics': ('"2"', 'BEGIN:VTODO...')}
+
+        result = self.outbox.replay()
+
+        self.assertEqual(result, {'applied': 2, 'conflicts': [], 'failed': [], 'pending': 0})
+        self.client.add_task.assert_called_once_with('New', '', 'NEEDS-ACTION', uid=added['uid'])
+        self.client.update_task.assert_called_once_with('/cal/1.ics', 'Mine', None, None, etag='"1"')
+        self.assertEqual(self.cache.get_task('1')['etag'], '"2"')
+        self.assertEqual(self.outbox.pending_count(), 0)
+
+    def test_replay_keeps_writes_while_offline_or_failing(self):
+        self.outbox.update_task('/cal/1.ics', title='Mine')
+        self.outbox.add_task('New')
+
+        self.client.authenticate.return_value = False
+        self.assertEqual(self.outbox.replay()['pending'], 2)
+        self.client.update_task.assert_not_called()
+
+        self.client.authenticate.return_value = True
+        self.client.update_task.return_value = False
+        self.assertEqual(self.outbox.replay()['pending'], 2)
+        self.client.add_task.assert_not_called()
+        self.assertEqual(self.cache.load_mutations()[0]['attempts'], 1)
+
+        # A write that fails because the connection dropped is not counted against it
+        self.client.authenticate.side_effect = [True, False]
+        self.assertEqual(self.outbox.replay()['pending'], 2)
+        self.assertEqual(self.cache.load_mutations()[0]['attempts'], 1)
+
+    def test_failed_write_removed_while_sending_is_skipped(self):
+        self.outbox.update_task('/cal/1.ics', title='Mine')
+        self.outbox.add_task('New')
+        self.client.authenticate.return_value = True
+        self.client.add_task.return_value = True
+
+        def removed_meanwhile(*args, **kwargs):
+            self.cache.remove_mutation(self.cache.load_mutations()[0]['id'])
+            return False
+        self.client.update_task.side_effect = removed_meanwhile
+
+        self.assertEqual(self.outbox.replay(), {'applied': 1, 'conflicts': [], 'failed': [], 'pending': 0})
+        self.assertIsNone(self.cache.record_attempt(12345))
+
+    def test_writes_made_while_sending_are_not_lost(self):
+        self.outbox.update_task('/cal/1.ics', status='COMPLETED')
+        self.client.authenticate.return_value = True
+        self.client.update_task.return_value = True
+        self.client.delete_task.return_value = True
+        self.client.ical_cache = {'/cal/1.ics': ('"2"', 'BEGIN:VTODO...')}
+
+        def reopen_while_sending(*args, **kwargs):
+            self.outbox.update_task('/cal/1.ics', status='NEEDS-ACTION')
+            return True
+        self.client.update_task.side_effect = reopen_while_sending
+
+        self.assertEqual(self.outbox.replay()['applied'], 1)
+
+        # The reopen gets its own entry, based on the version the first PUT created
+        mutations = self.cache.load_mutations()
+        self.assertEqual([(m['action'], m['etag'], m['fields']) for m in mutations],
+                         [('update', '"2"', {'status': 'NEEDS-ACTION'})])
+
+        def delete_while_sending(*args, **kwargs):
+            self.outbox.delete_task('/cal/1.ics')
+            return True
+        self.client.update_task.side_effect = delete_while_sending
+        self.client.ical_cache = {'/cal/1.ics': ('"3"', 'BEGIN:VTODO...')}
+
+        self.assertEqual(self.outbox.replay()['applied'], 1)
+        self.assertEqual([(m['action'], m['etag']) for m in self.cache.load_mutations()], [('delete', '"3"')])
+        self.outbox.replay()
+        self.client.delete_task.assert_called_once_with('/cal/1.ics', etag='"3"')
+        self.assertEqual(self.outbox.pending_count(), 0)
+
+    def test_replay_updates_from_a_stored_body(self):
+        self.cache.store_bodies({'/cal/1.ics': ('"1"', 'BEGIN:VTODO...')})
+        self.outbox.update_task('/cal/1.ics', title='Mine')
+        self.client.authenticate.return_value = True
+
+        def update_task(*args, **kwargs):
+            self.assertEqual(self.client.ical_cache['/cal/1.ics'], ('"1"', 'BEGIN:VTODO...'))
+            self.client.ical_cache['/cal/1.ics'] = ('"2"', 'BEGIN:VTODO...Mine')
+            return True
+        self.client.update_task.side_effect = update_task
+
+        self.assertEqual(self.outbox.replay()['applied'], 1)
+        self.assertEqual(self.cache.get_body('/cal/1.ics'), ('"2"', 'BEGIN:VTODO...Mine'))
+
+    def test_replay_drops_conflicts(self):
+        self.outbox.delete_task('/cal/1.ics')
+        self.client.authenticate.return_value = True
+        self.client.delete_task.side_effect = ConflictError('/cal/1.ics')
+
+        result = self.outbox.replay()
+
+        self.assertEqual(result['conflicts'], ['/cal/1.ics'])
+        self.client.delete_task.assert_called_once_with('/cal/1.ics', etag='"1"')
+        self.assertEqual(self.outbox.pending_count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import unittest
+from datetime import datetime, timezone
+
+from src.utils.query import SUMMARY_PROPERTIES, build_calendar_query, calendar_data_prop, filter_properties, task_matches
+
+
+class TestQuery(unittest.TestCase):
+
+    def test_unfiltered_query_asks_for_every_vtodo(self):
+        query = build_calendar_query()
+        self.assertIn('<c:comp-filter name="VTODO" />', query)
+        self.assertNotIn('prop-filter', query)
+
+    def test_time_range_filter(self):
+        query = build_calendar_query(time_range=(None, datetime(2026, 2, 1, tzinfo=timezone.utc)))
+        self.assertIn('<c:time-range end="20260201T000000Z" />', query)
+        self.assertNotIn('start=', query)
+
+    def test_status_filter(self):
+        query = build_calendar_query(status='needs-action')
+        self.assertIn('<c:prop-filter name="STATUS"><c:text-match collation="i;ascii-casemap">'
+                      'NEEDS-ACTION</c:text-match></c:prop-filter>', query)
+
+    def test_partial_calendar_data(self):
+        self.assertEqual(calendar_data_prop(), '<c:calendar-data />')
+        self.assertEqual(
+            calendar_data_prop(['UID', 'SUMMARY']),
+            '<c:calendar-data><c:comp name="VCALENDAR"><c:prop name="VERSION" /><c:comp name="VTODO">'
+            '<c:prop name="UID" /><c:prop name="SUMMARY" /></c:comp></c:comp></c:calendar-data>'
+        )
+        self.assertIn('<c:prop name="STATUS" />', build_calendar_query(properties=['STATUS']))
+
+    def test_task_matches(self):
+        since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        done = {'status': 'completed', 'completed': '20260105T120000Z', 'due': '20260110'}
+        old = {'status': 'completed', 'completed': '20251201T120000Z'}
+        open_task = {'status': 'needs-action'}
+
+        self.assertTrue(task_matches(done, completed_since=since))
+        self.assertFalse(task_matches(old, completed_since=since))
+        self.assertFalse(task_matches(open_task, completed_since=since))
+        self.assertTrue(task_matches(open_task, exclude_status=('COMPLETED', 'CANCELLED')))
+        self.assertFalse(task_matches(done, exclude_status=('COMPLETED',)))
+        self.assertFalse(task_matches({}, status='NEEDS-ACTION'))
+        self.assertTrue(task_matches({}, exclude_status=('COMPLETED',)))
+        self.assertTrue(task_matches(done, time_range=(since, datetime(2026, 1, 11, tzinfo=timezone.utc))))
+        self.assertFalse(task_matches(done, time_range=(None, since)))
+        self.assertTrue(task_matches(open_task, time_range=(None, since)))
+
+    def test_filter_properties(self):
+        since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+        self.assertEqual(filter_properties(SUMMARY_PROPERTIES, completed_since=since), SUMMARY_PROPERTIES + ('COMPLETED',))
+        self.assertEqual(filter_properties(('UID',), exclude_status=('COMPLETED',), time_range=(since, None)),
+                         ('UID', 'STATUS', 'DUE', 'DTSTART'))
+        self.assertEqual(filter_properties(SUMMARY_PROPERTIES), SUMMARY_PROPERTIES)
+        self.assertIsNone(filter_properties(None, completed_since=since))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.sync import AuthenticationError, CollectionSync, SyncLock
+from src.sync_daemon import SyncDaemon, wait_for_credentials
+from src.dav_client import DavClient
+from src.todo import Todo
+from tests.helpers import CacheTestCase, make_task
+
+
+def changes(*tasks, token='t1'):
+    return {'added': list(tasks), 'changed': [], 'removed': [], 'sync_token': token, 'full': False}
+
+
+def fake_client():
+    client = MagicMock()
+    client.sync_token = None
+    client.collection_state = None
+    client.has_collection_changed.return_value = True
+    return client
+
+
+class TestCollectionSync(CacheTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.lock_path = os.path.join(self.tmpdir.name, 'sync.lock')
+        self.outbox = MagicMock()
+        self.outbox.pending_count.return_value = 0
+
+    def _sync(self, client):
+        return CollectionSync(client, self.cache, self.outbox, lock=SyncLock(self.lock_path))
+
+    def test_sync_lock_is_exclusive(self):
+        first = SyncLock(self.lock_path)
+        second = SyncLock(self.lock_path)
+
+        self.assertTrue(first.acquire(blocking=False))
+        self.assertFalse(second.acquire(blocking=False))
+        first.release()
+        self.assertTrue(second.acquire(blocking=False))
+        second.release()
+
+    def test_refresh_applies_changes_to_cache(self):
+        client = fake_client()
+        client.sync_tasks.return_value = changes(make_task('a'))
+
+        result = self._sync(client).refresh()
+
+        self.assertEqual(result['state'], 'synced')
+        self.assertEqual([t['uid'] for t in result['changes']['added']], ['a'])
+        self.assertEqual(self.cache.load_state()['sync_token'], 't1')
+
+    def test_cancel_after_change_check_keeps_changes_pending(self):
+        client = fake_client()
+        client.collection_state = {'ctag': 'old'}
+
+        def has_collection_changed():
+            client.collection_state = {'ctag': 'new'}
+            return True
+        client.has_collection_changed.side_effect = has_collection_changed
+        checks = iter([False, False, True])
+
+        result = self._sync(client).refresh(cancelled=lambda: next(checks))
+
+        self.assertEqual(result['state'], 'cancelled')
+        client.sync_tasks.assert_not_called()
+        self.assertEqual(client.collection_state, {'ctag': 'old'})
+
+    def test_refresh_catches_up_with_another_process(self):
+        gui_client, daemon_client = fake_client(), fake_client()
+        gui = self._sync(gui_client)
+        daemon = self._sync(daemon_client)
+
+        daemon_client.sync_tasks.return_value = changes(make_task('a'), make_task('b'))
+        daemon.refresh()
+
+        # The GUI restores the daemon's state, finds the server unchanged and reloads the cache
+        gui_client.has_collection_changed.return_value = False
+        result = gui.refresh()
+
+        self.assertEqual(result['state'], 'synced')
+        self.assertTrue(result['changes']['full'])
+        self.assertEqual(sorted(t['uid'] for t in result['changes']['added']), ['a', 'b'])
+        self.assertEqual(gui_client.sync_token, 't1')
+        gui_client.sync_tasks.assert_not_called()
+        self.assertEqual(gui.refresh()['state'], 'unchanged')
+
+    def test_concurrent_refresh_waits_instead_of_syncing(self):
+        client = fake_client()
+        other = SyncLock(self.lock_path)
+        other.acquire()
+
+        def finish_other_refresh():
+            time.sleep(0.1)
+            self.cache.apply_changes(changes(make_task('a'), token='t2'))
+            other.release()
+        threading.Thread(target=finish_other_refresh).start()
+
+        result = self._sync(client).refresh()
+
+        self.assertEqual([t['uid'] for t in result['changes']['added']], ['a'])
+        client.has_collection_changed.assert_not_called()
+        client.sync_tasks.assert_not_called()
+
+    def test_refresh_reports_rejected_credentials(self):
+        client = fake_client()
+        client.sync_tasks.side_effect = AuthenticationError()
+
+        self.assertEqual(self._sync(client).refresh()['state'], 'auth_failed')
+
+    def test_refresh_keeps_bodies_for_later_updates(self):
+        client = fake_client()
+        client.sync_tasks.return_value = changes(make_task('a'), make_task('b'))
+        client.ical_cache = {'/cal/a.ics': ('"a-1"', 'BODY A')}
+
+        self._sync(client).refresh()
+
+        self.assertEqual(self.cache.get_body('/cal/a.ics'), ('"a-1"', 'BODY A'))
+        self.assertIsNone(self.cache.get_body('/cal/b.ics'))
+
+    def test_load_full_task_keeps_local_fields(self):
+        self.cache.apply_changes(changes(dict(make_task('a'), partial=True, title='Renamed offline')))
+        client = fake_client()
+        client.fetch_task.return_value = dict(make_task('a'), description='Full text')
+
+        loaded = self._sync(client).load_full_task('/cal/a.ics')
+
+        self.assertEqual((loaded['title'], loaded['description']), ('Renamed offline', 'Full text'))
+        self.assertNotIn('partial', self.cache.get_task('a'))
+
+        client.fetch_task.return_value = None
+        self.assertIsNone(self._sync(client).load_full_task('/cal/a.ics'))
+
+    def test_edit_after_failed_load_keeps_description(self):
+        self.cache.apply_changes(changes(dict(make_task('a'), partial=True)))
+        client = fake_client()
+        client.fetch_task.return_value = None
+        self.assertIsNone(self._sync(client).load_full_task('/cal/a.ics'))
+
+        todo = Todo.from_dav_task(self.cache.get_task('a'))
+        title, description, status = todo.edit_changes('Renamed', todo.description, 'COMPLETED')
+        ical_data = DavClient('https://example.com', 'user', 'pass', '/cal/')._apply_task_changes(
+            "BEGIN:VCALENDAR\r\nBEGIN:VTODO\r\nUID:a\r\nSUMMARY:Task a\r\nDESCRIPTION:Keep me\r\n"
+            "END:VTODO\r\nEND:VCALENDAR\r\n", title, description, status
+        )
+
+        self.assertIsNone(description)
+        self.assertIn('DESCRIPTION:Keep me', ical_data)
+        self.assertIn('SUMMARY:Renamed', ical_data)
+
+
+class TestSyncDaemon(unittest.TestCase):
+
+    def test_interval_backs_off_while_idle(self):
+        daemon = SyncDaemon(MagicMock(), min_interval=10, max_interval=35)
+
+        intervals = []
+        for result in ({'state': 'unchanged'}, {'state': 'failed'}, {'state': 'unchanged'},
+                       {'state': 'synced', 'changes': changes(make_task('a'))}, {'state': 'unchanged'}):
+            daemon.interval = daemon.next_interval(result)
+            intervals.append(daemon.interval)
+
+        self.assertEqual(intervals, [20, 35, 35, 10, 20])
+
+    def test_waits_for_credentials(self):
+        get_credentials = MagicMock(side_effect=[None, {'username': 'me'}])
+        wakeup = MagicMock()
+
+        self.assertEqual(wait_for_credentials(get_credentials, 60, wakeup), {'username': 'me'})
+        self.assertEqual(wakeup.wait.call_count, 2)
+        wakeup.wait.assert_called_with(60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,7 +18,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import unittest
-from src.todo import Todo
+from src.todo import Todo, diff_todos
 
 class TestTodo(unittest.TestCase):
 
@@ -64,5 +64,37 @@ class TestTodo(unittest.TestCase):
         }
         self.assertEqual(self.todo.to_dict(), expected)
 
+    def test_from_dav_tasks(self):
+        tasks = [
+            {'uid': '1', 'title': 'One', 'status': 'completed', 'href': '/cal/1.ics', 'etag': '"1"'},
+            {'uid': '2', 'title': 'Two', 'partial': True},
+        ]
+        todos = Todo.from_dav_tasks(tasks)
+
+        self.assertEqual([todo.to_dict() for todo in todos], [Todo.from_dav_task(task).to_dict() for task in tasks])
+        self.assertTrue(todos[0].is_completed)
+        self.assertEqual(todos[0].etag, '"1"')
+        self.assertEqual(todos[1].status, 'NEEDS-ACTION')
+        self.assertTrue(todos[1].partial)
+        # Status strings are shared rather than copied per task
+        self.assertIs(todos[0].status, Todo(status='COMPLETED').status)
+        with self.assertRaises(AttributeError):
+            todos[0].extra = True
+
+    def test_diff_todos(self):
+        current = {
+            'a': Todo(uid='a', title='Same', etag='"1"'),
+            'b': Todo(uid='b', title='Old', etag='"1"'),
+            'c': Todo(uid='c', title='Gone', etag='"1"'),
+            'd': Todo(uid='d', title='Offline'),
+        }
+        updated = {
+            'a': Todo(uid='a', title='Same', etag='"1"'),
+            'b': Todo(uid='b', title='New', etag='"2"'),
+            'd': Todo(uid='d', title='Offline, edited'),
+            'e': Todo(uid='e', title='Added', etag='"1"'),
+        }
+        self.assertEqual(diff_todos(current, updated), (['e'], ['b', 'd'], ['c']))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Linux DAV Todo - A simple TODO application with DAV support
+# Copyright (C) 2025 Spidy
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import gzip
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.dav_client import DavClient
+from src.utils.transport import TransportConfig, accepts_gzip, connection_stats
+
+TASK_RESPONSE = """<d:response><d:href>/cal/{uid}.ics</d:href><d:propstat><d:prop>
+<d:getetag>"{uid}"</d:getetag><c:calendar-data>BEGIN:VCALENDAR
+BEGIN:VTODO
+UID:{uid}
+SUMMARY:Task {uid}
+STATUS:NEEDS-ACTION
+END:VTODO
+END:VCALENDAR</c:calendar-data></d:prop></d:propstat></d:response>"""
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers 503 to the first `failures` requests, then 200"""
+    protocol_version = 'HTTP/1.1'
+    failures = 0
+
+    def do_GET(self):
+        if FlakyHandler.failures > 0:
+            FlakyHandler.failures -= 1
+            status = 503
+        else:
+            status = 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    do_PUT = do_GET
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        FlakyHandler.failures = 0
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive_reuses_connection(self):
+        session = TransportConfig().create_session(('user', 'password'), 4)
+        for _ in range(5):
+            self.assertEqual(session.get(self.url).status_code, 200)
+
+        self.assertEqual(connection_stats(session), {'requests': 5, 'connections': 1, 'reuse_rate': 0.8})
+
+    def test_retries_unavailable_with_backoff(self):
+        FlakyHandler.failures = 2
+        config = TransportConfig(retries=3, backoff_factor=0, backoff_jitter=0)
+        session = config.create_session(('user', 'password'), 4)
+
+        self.assertEqual(session.get(self.url).status_code, 200)
+        self.assertEqual(connection_stats(session)['requests'], 3)
+
+        FlakyHandler.failures = 5
+        config = TransportConfig(retries=1, backoff_factor=0, backoff_jitter=0)
+        session = config.create_session(('user', 'password'), 4)
+        self.assertEqual(session.get(self.url).status_code, 503)
+
+    def test_writes_are_not_resent_on_retry_status(self):
+        FlakyHandler.failures = 1
+        session = TransportConfig(retries=3, backoff_factor=0, backoff_jitter=0).create_session(('user', 'password'), 4)
+
+        self.assertEqual(session.put(self.url, data='x').status_code, 503)
+        self.assertEqual(connection_stats(session)['requests'], 1)
+
+    def test_keep_alive_off_closes_connections(self):
+        session = TransportConfig(keep_alive=False).create_session(('user', 'password'), 4)
+        self.assertEqual(session.headers['Connection'], 'close')
+
+
+class CompressingHandler(BaseHTTPRequestHandler):
+    """A CalDAV stand-in that gzips its responses and advertises gzip request bodies"""
+    protocol_version = 'HTTP/1.1'
+    accept_gzip_bodies = True
+    received = []
+
+    def do_PROPFIND(self):
+        self._read_body()
+        self._reply(207, '<d:multistatus xmlns:d="DAV:"/>')
+
+    def do_REPORT(self):
+        self._read_body()
+        responses = ''.join(TASK_RESPONSE.format(uid=uid) for uid in range(50))
+        self._reply(207, '<d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">'
+                         f'{responses}</d:multistatus>')
+
+    def _read_body(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        encoding = self.headers.get('Content-Encoding')
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        CompressingHandler.received.append((self.command, encoding, body))
+
+    def _reply(self, status, text):
+        if self.received[-1][1] == 'gzip' and not self.accept_gzip_bodies:
+            status, text = 415, ''
+        body = text.encode('utf-8')
+        self.send_response(status)
+        if self.accept_gzip_bodies:
+            self.send_header('Accept-Encoding', 'gzip')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        CompressingHandler.accept_gzip_bodies = True
+        CompressingHandler.received = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), CompressingHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.client = DavClient(url, 'user', 'password', '/cal/', transport=TransportConfig(compress_min_size=0))
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_accepts_gzip(self):
+        self.assertTrue(accepts_gzip('deflate, gzip'))
+        self.assertTrue(accepts_gzip('GZIP;q=0.5'))
+        self.assertFalse(accepts_gzip('gzip;q=0'))
+        self.assertFalse(accepts_gzip('identity'))
+        self.assertFalse(accepts_gzip(None))
+
+    def test_gzip_request_and_streamed_response(self):
+        self.assertTrue(self.client.authenticate())
+        tasks = self.client.fetch_tasks()
+
+        self.assertEqual(len(tasks), 50)
+        self.assertEqual([(method, encoding) for method, encoding, _ in CompressingHandler.received],
+                         [('PROPFIND', None), ('REPORT', 'gzip')])
+        self.assertIn(b'calendar-query', CompressingHandler.received[-1][2])
+
+        stats = self.client.transfer_stats()
+        self.assertLess(stats['sent_wire'], stats['sent'])
+        self.assertLess(stats['received_wire'], stats['received'])
+        self.assertGreater(stats['saved_rate'], 0.5)
+
+    def test_rejected_gzip_request_is_resent_plain(self):
+        self.assertTrue(self.client.authenticate())
+        CompressingHandler.accept_gzip_bodies = False
+
+        self.assertEqual(len(self.client.fetch_tasks()), 50)
+        self.assertEqual([encoding for _, encoding, _ in CompressingHandler.received], [None, 'gzip', None])
+        self.assertIs(self.client.request_encoding, False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -66,20 +66,20 @@ get_install_paths() {
             echo "BIN_DIR=/usr/local/bin"
             echo "ICON_DIR=/usr/share/icons/hicolor/scalable/apps"
             echo "DESKTOP_DIR=/usr/share/applications"
-            echo "SYSTEMD_DIR=/etc/systemd/system"
+            echo "SYSTEMD_DIR=/etc/systemd/user"
             ;;
         "arch"|"manjaro"|"endeavouros")
             echo "BIN_DIR=/usr/bin"
             echo "ICON_DIR=/usr/share/icons/hicolor/scalable/apps"
             echo "DESKTOP_DIR=/usr/share/applications"
-            echo "SYSTEMD_DIR=/usr/lib/systemd/system"
+            echo "SYSTEMD_DIR=/usr/lib/systemd/user"
             ;;
         *)
             # Default paths
             echo "BIN_DIR=/usr/local/bin"
             echo "ICON_DIR=/usr/local/share/icons/linux-dav-todo"
             echo "DESKTOP_DIR=/usr/local/share/applications"
-            echo "SYSTEMD_DIR=/etc/systemd/system"
+            echo "SYSTEMD_DIR=/etc/systemd/user"
             ;;
     esac
 }
@@ -124,16 +124,15 @@ fi
 # Stop and disable systemd service if it exists
 if [ -f "$SYSTEMD_DIR/linux-dav-todo.service" ]; then
     echo "  • Stopping and disabling systemd service..."
-    systemctl stop linux-dav-todo@* 2>/dev/null || true
-    systemctl disable linux-dav-todo@* 2>/dev/null || true
+    systemctl --global disable linux-dav-todo 2>/dev/null || true
     rm -f "$SYSTEMD_DIR/linux-dav-todo.service"
-    systemctl daemon-reload
+    echo "    Users who enabled it can stop it with: systemctl --user disable --now linux-dav-todo"
     echo "  ✓ Systemd service removed"
 fi
 
 # Remove binary
 if [ -f "$BIN_DIR/linux-dav-todo" ]; then
-    rm -f "$BIN_DIR/linux-dav-todo"
+    rm -f "$BIN_DIR/linux-dav-todo" "$BIN_DIR/linux-dav-todo-cli"
     echo "  ✓ Binary removed from $BIN_DIR"
 fi
 